@@ -0,0 +1,100 @@
+import shutil
+import tempfile
+import zipfile
+from typing import IO, Iterator
+
+from objects.custom_path import CPath
+
+# Members with these suffixes are opened as archives themselves
+ARCHIVE_SUFFIXES: tuple[str, ...] = (".zip", ".jar")
+
+# Nested archives up to this size are held in memory, larger ones
+# are spilled to a temporary file
+SPILL_THRESHOLD: int = 64 * 1024 * 1024
+
+# How deep archives may nest before the rest is left unopened
+MAX_DEPTH: int = 8
+
+COPY_BUFFER: int = 1024 * 1024
+
+
+def find_sounds_jsons(names: list[str]) -> list[str]:
+    """
+    Find the sounds.json files in an archive listing: those at
+    assets/<namespace>/sounds.json, at any depth, or at
+    <namespace>/sounds.json for archives of an assets folder
+    """
+    found: list[str] = []
+
+    for name in names:
+        parts: list[str] = name.split("/")
+        if parts[-1] != "sounds.json" or len(parts) < 2:
+            continue
+
+        if len(parts) == 2 or parts[-3] == "assets":
+            found.append(name)
+
+    return sorted(found)
+
+
+def open_member(archive: zipfile.ZipFile, name: str,
+                spill_threshold: int = SPILL_THRESHOLD) -> IO[bytes]:
+    """
+    Copy an archive member into a seekable stream, which is what
+    zipfile needs to open it in turn. The copy stays in memory unless
+    it grows past spill_threshold bytes.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=spill_threshold)
+
+    try:
+        with archive.open(name) as member:
+            shutil.copyfileobj(member, spool, COPY_BUFFER)
+    except BaseException:
+        spool.close()
+        raise
+
+    spool.seek(0)
+    return spool
+
+
+def iter_archives(path: CPath, spill_threshold: int = SPILL_THRESHOLD,
+                  max_depth: int = MAX_DEPTH
+                  ) -> Iterator[tuple[CPath, zipfile.ZipFile, list[str]]]:
+    """
+    Walk an archive and every archive nested in it, depth first.
+    Nothing is extracted: nested archives are opened from memory, or
+    from a temporary file above spill_threshold.
+
+    Each archive is only open until the next one is asked for.
+    :return: For each archive: where it is (nested archives continue
+    the outer path with the member name), the open archive, and the
+    names of its files
+    """
+    with zipfile.ZipFile(path) as archive:
+        yield from _walk(archive, CPath(path), spill_threshold, max_depth)
+
+
+def _walk(archive: zipfile.ZipFile, location: CPath, spill_threshold: int,
+          depth: int):
+
+    names: list[str] = [n for n in archive.namelist() if not n.endswith("/")]
+
+    yield location, archive, names
+
+    if depth == 0:
+        return
+
+    for name in names:
+        if not name.lower().endswith(ARCHIVE_SUFFIXES):
+            continue
+
+        with open_member(archive, name, spill_threshold) as stream:
+            try:
+                nested = zipfile.ZipFile(stream)
+            except zipfile.BadZipFile:
+                # Named like an archive, but it isn't one
+                continue
+
+            with nested:
+                yield from _walk(nested, CPath(location, name),
+                                 spill_threshold, depth - 1)
@@ -0,0 +1,160 @@
+import os
+import struct
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypedDict
+
+from objects.custom_path import CPath
+
+# How much of a member each worker holds at a time, compressed and
+# decompressed alike
+CHUNK_SIZE: int = 1024 * 1024
+
+# A zip local file header, as laid out by zipfile
+LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+LOCAL_HEADER_SIGNATURE: bytes = b"PK\003\004"
+
+
+class CorruptMember(TypedDict):
+    name: str
+    problem: str
+
+
+def verify_archive(path: CPath, max_workers: int = None,
+                   chunk_size: int = CHUNK_SIZE) -> list[CorruptMember]:
+    """
+    Check the CRC of every member of a zip archive
+    :return: The members that are corrupt or truncated
+    """
+    try:
+        with zipfile.ZipFile(path) as archive:
+            infos: list[zipfile.ZipInfo] = [
+                i for i in archive.infolist() if not i.is_dir()]
+    except zipfile.BadZipFile as e:
+        # Usually the end of the file, and the directory with it, is gone
+        raise ValueError(f"{path} is not a readable archive: {e}")
+
+    return verify_members(path, infos, max_workers, chunk_size)
+
+
+def verify_members(path: CPath, infos: list[zipfile.ZipInfo],
+                   max_workers: int = None,
+                   chunk_size: int = CHUNK_SIZE) -> list[CorruptMember]:
+    """
+    Check the CRC of the given members of a zip archive.
+
+    Members are read straight from the file with pread() and fed
+    through zlib in chunks, by a pool of threads sharing one file
+    descriptor. Reading, inflating and zlib.crc32 all release the GIL,
+    so the threads run in parallel, each holding at most a chunk of
+    compressed and a chunk of decompressed data.
+    :return: The members that are corrupt or truncated, in archive order
+    """
+    # Largest first, so one big member doesn't finish alone at the end
+    order: list[int] = sorted(
+        range(len(infos)), key=lambda n: infos[n].compress_size, reverse=True)
+
+    descriptor: int = os.open(path, os.O_RDONLY)
+    try:
+        with ThreadPoolExecutor(max_workers) as pool:
+            problems: list[str | None] = list(pool.map(
+                lambda n: _verify_member(
+                    path, descriptor, infos[n], chunk_size),
+                order))
+    finally:
+        os.close(descriptor)
+
+    found: dict[int, str] = {
+        n: p for n, p in zip(order, problems) if p is not None}
+
+    return [CorruptMember(name=infos[n].filename, problem=found[n])
+            for n in sorted(found)]
+
+
+def _verify_member(path: CPath, descriptor: int, info: zipfile.ZipInfo,
+                   chunk_size: int) -> str | None:
+    """:return: What's wrong with the member, or None"""
+
+    header: bytes = os.pread(
+        descriptor, LOCAL_HEADER.size, info.header_offset)
+    if len(header) < LOCAL_HEADER.size:
+        return "truncated: the archive ends before it"
+
+    fields = LOCAL_HEADER.unpack(header)
+    if fields[0] != LOCAL_HEADER_SIGNATURE:
+        return "corrupt: bad local header"
+
+    # Encrypted members can't be checked without the password
+    if info.flag_bits & 0x1:
+        return None
+
+    if info.compress_type not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+        return _verify_with_zipfile(path, info, chunk_size)
+
+    inflater = (zlib.decompressobj(-zlib.MAX_WBITS)
+                if info.compress_type == zipfile.ZIP_DEFLATED else None)
+
+    # The data follows the header, the file name and the extra field
+    position: int = (
+        info.header_offset + LOCAL_HEADER.size + fields[10] + fields[11])
+    remaining: int = info.compress_size
+    crc: int = 0
+    size: int = 0
+
+    try:
+        while remaining > 0:
+            data: bytes = os.pread(
+                descriptor, min(chunk_size, remaining), position)
+            if len(data) == 0:
+                return (f"truncated: {info.compress_size - remaining} "
+                        f"of {info.compress_size} bytes")
+
+            position += len(data)
+            remaining -= len(data)
+
+            if inflater is None:
+                crc = zlib.crc32(data, crc)
+                size += len(data)
+                continue
+
+            # Inflate at most a chunk at a time, so memory stays bounded
+            while len(data) > 0:
+                output: bytes = inflater.decompress(data, chunk_size)
+                crc = zlib.crc32(output, crc)
+                size += len(output)
+                data = inflater.unconsumed_tail
+
+        if inflater is not None:
+            output = inflater.flush()
+            crc = zlib.crc32(output, crc)
+            size += len(output)
+            if not inflater.eof:
+                return "truncated: the compressed data ends early"
+
+    except zlib.error as e:
+        return f"corrupt: {e}"
+
+    if size != info.file_size:
+        return f"corrupt: {size} bytes instead of {info.file_size}"
+
+    if crc != info.CRC:
+        return f"corrupt: CRC {crc:08x} instead of {info.CRC:08x}"
+
+    return None
+
+
+def _verify_with_zipfile(path: CPath, info: zipfile.ZipInfo,
+                         chunk_size: int) -> str | None:
+    """Let zipfile check compression methods zlib doesn't handle"""
+
+    try:
+        with zipfile.ZipFile(path) as archive, archive.open(info) as member:
+            while len(member.read(chunk_size)) > 0:
+                pass
+    except (zipfile.BadZipFile, EOFError, OSError) as e:
+        return f"corrupt: {e}"
+    except NotImplementedError:
+        return None
+
+    return None
@@ -0,0 +1,208 @@
+import asyncio
+import os
+import stat
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, TypedDict
+
+from objects.archive_reader import ARCHIVE_SUFFIXES
+from objects.custom_path import CPath
+from objects.ignore_rules import IgnoreRules
+from objects.pack_checker import (
+    CheckResult, PackChecker, get_irrelevant_files, get_linked,
+    find_sounds_json, load_events)
+from objects.scan_index import list_directory
+from objects.sound_event_handler import SoundEventHandler
+
+
+class Finding(TypedDict):
+    category: str
+    path: str
+
+
+class AsyncPackChecker:
+    """
+    Check packs from asyncio code without blocking the event loop.
+
+    Parsing sounds.json, listing directories and reading archives all
+    run in one bounded thread pool, so any number of packs can be checked
+    concurrently while the process never uses more than max_workers
+    threads for it. Cancelling a check stops it from queuing more work;
+    listings already running in the pool finish, and are discarded.
+
+        async for finding in checker.iter_findings(path):
+            ...
+
+    Files that don't belong in the pack are reported as soon as their
+    directory is listed. Everything else depends on the whole tree, so it
+    arrives once the scan is complete. Archives (.zip, .jar) are checked
+    whole in the pool, along with the archives nested in them.
+    """
+
+    def __init__(self, checker: PackChecker = None, max_workers: int = 4):
+        self.checker: PackChecker = (
+            checker if checker is not None else PackChecker())
+        self.max_workers: int = max_workers
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="spcheck")
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+    async def _run(self, function, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, function, *args)
+
+    async def check(self, path: CPath) -> CheckResult:
+        """
+        Check a pack and return the complete result. An archive must
+        hold exactly one pack; see check_archive() for the others.
+        """
+        results: list[CheckResult] = await self.check_archive(path) if (
+            path.suffix in ARCHIVE_SUFFIXES) else [
+            item async for item in self._stream(path)
+            if isinstance(item, CheckResult)]
+
+        if len(results) != 1:
+            raise ValueError(
+                f"Expected exactly one pack in {path}, "
+                f"found {len(results)}")
+
+        return results[0]
+
+    async def check_archive(self, path: CPath) -> list[CheckResult]:
+        """Check every pack in an archive, and in archives nested in it"""
+        return await self._run(self.checker.check_archive, path)
+
+    async def iter_findings(self, path: CPath) -> AsyncIterator[Finding]:
+        """Yield findings as soon as each one is confirmed"""
+
+        async for item in self._stream(path):
+            if not isinstance(item, CheckResult):
+                yield item
+
+    async def _stream(self, path: CPath):
+        """
+        Yield findings as they are confirmed, then the CheckResult (one
+        for each pack of an archive)
+        """
+        if path.suffix in ARCHIVE_SUFFIXES:
+            for result in await self.check_archive(path):
+                for finding in _findings_of(result, CheckResult.CATEGORIES):
+                    yield finding
+                yield result
+            return
+
+        if await self._run(path.is_dir):
+            path = await self._run(
+                find_sounds_json, path, self.checker.get_ignore_rules)
+
+        timings: dict[str, float] = {}
+        start: float = time.perf_counter()
+
+        assets_folder: CPath = path.parent.parent
+
+        # Reads the .spcheckignore files
+        ignore: IgnoreRules = await self._run(
+            self.checker.get_ignore_rules, assets_folder)
+
+        events: SoundEventHandler = await self._run(load_events, path, ignore)
+
+        timings["parse"] = time.perf_counter() - start
+        start = time.perf_counter()
+
+        all_files: list[CPath] = []
+        sizes: dict[str, int] = {}
+        async for files, listed_sizes in self._scan(assets_folder, ignore):
+            all_files.extend(files)
+            sizes.update(listed_sizes)
+            for f in get_irrelevant_files(files):
+                yield Finding(
+                    category="irrelevant_files",
+                    path=str(f.relative_to(assets_folder)))
+
+        # Links in the middle of a chain keep their file alive too
+        linked: set[str] = await self._run(
+            get_linked, assets_folder, all_files)
+
+        timings["scan"] = time.perf_counter() - start
+
+        result = await self._run(
+            self.checker.check, path, events, all_files, timings, None,
+            linked)
+        result.file_sizes = sizes
+
+        categories = [c for c in CheckResult.CATEGORIES
+                      if c != "irrelevant_files"]
+        for finding in _findings_of(result, categories):
+            yield finding
+
+        yield result
+
+    async def _scan(self, assets_folder: CPath, ignore: IgnoreRules = None
+                    ) -> AsyncIterator[tuple[list[CPath], dict[str, int]]]:
+        """
+        Walk the tree with up to max_workers directory listings in
+        flight, yielding each directory's files, and their sizes, as
+        its listing arrives
+        :param ignore: Rules for what to leave out of the walk
+        """
+        pending: list[str] = [str(assets_folder)]
+        in_flight: set[asyncio.Future] = set()
+
+        try:
+            while len(pending) > 0 or len(in_flight) > 0:
+
+                while len(pending) > 0 and len(in_flight) < self.max_workers:
+                    in_flight.add(asyncio.ensure_future(
+                        self._run(_list_files, pending.pop(), ignore)))
+
+                done, in_flight = await asyncio.wait(
+                    in_flight, return_when=asyncio.FIRST_COMPLETED)
+
+                for future in done:
+                    files, sizes, subdirectories = future.result()
+                    pending.extend(subdirectories)
+                    yield files, sizes
+
+        finally:
+            # Cancelled or abandoned: don't leave listings behind
+            for future in in_flight:
+                future.cancel()
+
+
+def _list_files(directory: str, ignore: IgnoreRules = None
+                ) -> tuple[list[CPath], dict[str, int], list[str]]:
+    """
+    List a directory the way get_all_files() sees it, sizes included
+    :return: The files, their sizes by path, and the subdirectories
+    """
+    found, symlinks, subdirectories = list_directory(directory, ignore)
+
+    files: list[CPath] = []
+    sizes: dict[str, int] = {}
+
+    # Symlinks count when they lead to a file
+    for name in found + symlinks:
+        try:
+            info: os.stat_result = os.stat(name)
+        except OSError:
+            continue
+
+        if stat.S_ISREG(info.st_mode):
+            files.append(CPath(name))
+            sizes[name] = info.st_size
+
+    return files, sizes, subdirectories
+
+
+def _findings_of(result: CheckResult, categories: list[str]):
+    for category in categories:
+        for path in result.get_relative(category):
+            yield Finding(category=category, path=path)
@@ -0,0 +1,223 @@
+import json
+import os
+import subprocess
+import time
+
+from objects.archive_reader import ARCHIVE_SUFFIXES
+from objects.custom_path import CPath
+from objects.incremental_checker import IncrementalState
+from objects.pack_checker import (
+    CheckResult, PackChecker, find_sounds_json, get_missing_subtitles,
+    read_sounds_jsons)
+from objects.scan_index import list_directory
+from objects.sound_event_handler import SoundEventHandler
+from objects.symlink_graph import SymlinkGraph
+
+
+def git(repository: str, *args: str) -> str:
+    """Run a git command and return its output"""
+
+    try:
+        completed = subprocess.run(
+            ["git", "-C", repository, *args],
+            capture_output=True, text=True, check=True)
+    except FileNotFoundError:
+        raise ValueError("git is not installed")
+    except subprocess.CalledProcessError as e:
+        raise ValueError(f"git {args[0]} failed: {e.stderr.strip()}")
+
+    return completed.stdout
+
+
+def get_changed_paths(folder: CPath, revision: str) -> tuple[str, list[str]]:
+    """
+    Ask git which files differ from a revision, committed or not,
+    including untracked files that aren't ignored
+    :return: The repository root, and the changed paths, made absolute
+    """
+    top: str = git(str(folder), "rev-parse", "--show-toplevel").strip()
+
+    changed: str = git(top, "diff", "--name-only", "--no-renames", "-z",
+                       revision, "--")
+    untracked: str = git(top, "ls-files", "--others", "--exclude-standard",
+                         "-z")
+
+    names: set[str] = set(changed.split("\0") + untracked.split("\0"))
+    names.discard("")
+
+    return top, sorted(os.path.join(top, n) for n in names)
+
+
+class ChangedFilesChecker:
+    """
+    Check only what changed since a git revision.
+
+    Just the directories holding changed paths are listed, but every
+    event in sounds.json is still consulted, so a change can't hide
+    an orphan, a broken link or an invalid name it introduced. When
+    sounds.json itself changed, it is compared event by event with its
+    version at the revision, and the files those events referred to
+    before and after the change are checked too.
+
+    Symlinks outside the listed directories aren't seen, so a changed
+    file kept alive only by such a link is reported as an orphan.
+    Sound counts only cover the events that changed.
+    """
+
+    def __init__(self, checker: PackChecker = None):
+        self.checker: PackChecker = (
+            checker if checker is not None else PackChecker())
+
+    def check_path(self, path: CPath, revision: str) -> CheckResult:
+
+        if path.suffix in ARCHIVE_SUFFIXES:
+            raise ValueError("Only folders can be checked against git")
+
+        if path.is_dir():
+            path = find_sounds_json(path, self.checker.get_ignore_rules)
+
+        timings: dict[str, float] = {}
+        start: float = time.perf_counter()
+
+        # git reports real paths, so compare against real paths
+        assets_folder = CPath(os.path.realpath(path.parent.parent))
+        path = CPath(assets_folder, path.parent.name, path.name)
+        prefix: str = str(assets_folder) + "/"
+        ignore = self.checker.get_ignore_rules(assets_folder)
+
+        namespaced_json: dict[str, dict] = read_sounds_jsons(path, ignore)
+        events = SoundEventHandler.combine(assets_folder, namespaced_json)
+
+        timings["parse"] = time.perf_counter() - start
+        start = time.perf_counter()
+
+        top, changed_paths = get_changed_paths(assets_folder, revision)
+        changed_paths = [p for p in changed_paths
+                         if p.startswith(prefix) and not ignore.excludes(p)]
+
+        # Any namespace's sounds.json, including ones deleted since
+        depth: int = prefix.count("/") + 1
+        changed_jsons: set[str] = set(
+            p for p in changed_paths
+            if p.endswith("/sounds.json") and p.count("/") == depth)
+
+        changed_events: list[str] = []
+        old_files: dict[str, list[str]] = {}
+        if len(changed_jsons) > 0:
+            changed_events, old_files = self._get_changed_events(
+                top, assets_folder, changed_jsons, namespaced_json, revision,
+                events)
+
+        timings["git"] = time.perf_counter() - start
+        start = time.perf_counter()
+
+        state = IncrementalState(assets_folder, ignore)
+        state.event_files = {
+            key: [str(p) for p in events.get_sound_files(key)]
+            for key in events.get_event_names()}
+        for files in state.event_files.values():
+            for f in files:
+                state.ref_counts[f] = state.ref_counts.get(f, 0) + 1
+
+        state.vanilla_files = set(
+            str(p) for p in
+            self.checker.vanilla.get_events(assets_folder).get_sound_files())
+
+        # The paths whose status this change could have altered
+        candidates: set[str] = set(changed_paths)
+        for key in changed_events:
+            candidates.update(state.event_files.get(key, []))
+            candidates.update(old_files.get(key, []))
+
+        self._scan(state, candidates)
+
+        timings["scan"] = time.perf_counter() - start
+        start = time.perf_counter()
+
+        state.irrelevant_files = [
+            f for f in changed_paths if os.path.isfile(f) and
+            not f.endswith(".ogg") and not f.endswith(".json")]
+        state.classify(candidates)
+        state.count(changed_events)
+
+        result: CheckResult = state.to_result(path, events)
+        result.missing_subtitles = get_missing_subtitles(
+            events, self.checker.get_lang_index(assets_folder),
+            path.parent.name)
+
+        timings["checks"] = time.perf_counter() - start
+        result.timings.update(timings)
+
+        return result
+
+    def _get_changed_events(self, top: str, assets_folder: CPath,
+                            changed_jsons: set[str],
+                            namespaced_json: dict[str, dict], revision: str,
+                            events: SoundEventHandler
+                            ) -> tuple[list[str], dict[str, list[str]]]:
+        """
+        Compare the sounds.json files that changed with their versions
+        at the revision
+        :return: The names of the events that changed, and the files
+        every event referred to at the revision
+        """
+        old_namespaced_json: dict[str, dict] = {}
+
+        namespaces: set[str] = set(namespaced_json) | set(
+            os.path.basename(os.path.dirname(p)) for p in changed_jsons)
+
+        for namespace in sorted(namespaces):
+            path: str = os.path.join(assets_folder, namespace, "sounds.json")
+
+            # Unchanged ones can share the events already parsed, since
+            # parsing them again leaves them as they are
+            if path not in changed_jsons:
+                old_namespaced_json[namespace] = namespaced_json[namespace]
+                continue
+
+            relative: str = os.path.relpath(path, top)
+            try:
+                old_namespaced_json[namespace] = json.loads(
+                    git(top, "show", f"{revision}:{relative}"))
+            except ValueError:
+                # This sounds.json didn't exist yet
+                continue
+
+        old_events = SoundEventHandler.combine(
+            events.root_folder, old_namespaced_json)
+        old_files: dict[str, list[str]] = {
+            key: [str(p) for p in old_events.get_sound_files(key)]
+            for key in old_events.get_event_names()}
+
+        new: dict = events.get_event_dictionary()
+        old: dict = old_events.get_event_dictionary()
+
+        changed: list[str] = sorted(
+            key for key in new.keys() | old.keys()
+            if new.get(key, {}).get('sounds') != old.get(key, {}).get('sounds'))
+
+        return changed, old_files
+
+    @staticmethod
+    def _scan(state: IncrementalState, candidates: set[str]):
+        """List only the directories holding candidate paths"""
+
+        directories: set[str] = set(os.path.dirname(c) for c in candidates)
+        graph = SymlinkGraph(state.assets_folder)
+
+        for directory in directories:
+            if not os.path.isdir(directory):
+                continue
+
+            files, symlinks, _ = list_directory(
+                directory, state.scan.ignore)
+            symlinks = [s for s in symlinks if os.path.isfile(s)]
+
+            state.ogg_files.update(
+                f for f in files + symlinks if f.endswith(".ogg"))
+
+            for s in symlinks:
+                if s.endswith(".ogg"):
+                    state.link_targets[s] = graph.resolve(s)["target"]
+
+        state.targeted = graph.get_reachable(state.link_targets)
@@ -0,0 +1,110 @@
+import hashlib
+import os
+import pickle
+import tempfile
+
+from objects.custom_path import CPath
+
+# Bump whenever the layout of anything stored in the cache changes
+CACHE_VERSION: int = 6
+
+
+def default_cache_dir() -> CPath:
+    """$XDG_CACHE_HOME/spcheck, or ~/.cache/spcheck"""
+
+    cache_home: str = os.environ.get(
+        "XDG_CACHE_HOME", os.path.expanduser("~/.cache"))
+    return CPath(cache_home, "spcheck")
+
+
+class CheckCache:
+    """
+    A local directory of pickled objects, filed by kind and key.
+
+    Entries written by another version of the cache, or that can't be
+    read for any reason, are treated as missing: the cache can always
+    be deleted, and never turns a run into a failure.
+
+    The directory is kept under max_bytes by evicting the least recently
+    used entries whenever something is stored. Reading an entry bumps
+    its mtime, which is what "recently used" goes by (atime is too often
+    disabled to rely on).
+    """
+
+    def __init__(self, cache_dir: CPath = None,
+                 max_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir: CPath = (
+            cache_dir if cache_dir is not None else default_cache_dir())
+        self.max_bytes: int = max_bytes
+
+    def _path(self, kind: str, key: str) -> CPath:
+        digest: str = hashlib.sha1(key.encode()).hexdigest()
+        return CPath(self.cache_dir, kind, digest + ".pickle")
+
+    def load(self, kind: str, key: str):
+        """Return the stored object, or None if there isn't a usable one"""
+
+        path: CPath = self._path(kind, key)
+        try:
+            with open(path, "rb") as file:
+                version, value = pickle.load(file)
+            os.utime(path)
+        except (OSError, pickle.UnpicklingError, EOFError,
+                AttributeError, ImportError, ValueError, TypeError):
+            return None
+
+        return value if version == CACHE_VERSION else None
+
+    def store(self, kind: str, key: str, value):
+        """
+        Store an object, replacing any previous entry atomically. If the
+        directory can't be written, the object just isn't cached.
+        """
+        path: CPath = self._path(kind, key)
+        try:
+            os.makedirs(path.parent, exist_ok=True)
+            descriptor, temporary = tempfile.mkstemp(dir=path.parent)
+        except OSError:
+            return
+
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                pickle.dump((CACHE_VERSION, value), file,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary, path)
+        except BaseException as e:
+            try:
+                os.unlink(temporary)
+            except OSError:
+                pass
+            if isinstance(e, OSError):
+                return
+            raise
+
+        self.evict()
+
+    def evict(self):
+        """Delete the least recently used entries until under max_bytes"""
+
+        entries: list[tuple[int, int, str]] = []
+        for directory, _, files in os.walk(self.cache_dir):
+            for name in files:
+                path: str = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, path))
+
+        total: int = sum(e[1] for e in entries)
+
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            except OSError:
+                continue
+            total -= size
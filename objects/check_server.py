@@ -0,0 +1,239 @@
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Callable
+
+from objects.custom_path import CPath
+from objects.ignore_rules import IgnoreRules
+from objects.lang_index import LangIndex
+from objects.pack_checker import (
+    CheckResult, PackChecker, find_sounds_json, get_linked,
+    list_sounds_jsons, load_events)
+from objects.scan_index import ScanIndex
+from objects.sound_event_handler import SoundEventHandler
+
+# How many packs the server keeps warm; the least recently checked
+# ones are forgotten beyond that
+MAX_PACKS: int = 64
+
+
+class PackState:
+    """Everything the server keeps warm for one sounds.json"""
+
+    def __init__(self, sounds_json: CPath, ignore: IgnoreRules = None):
+        self.sounds_json: CPath = sounds_json
+        self.assets_folder: CPath = sounds_json.parent.parent
+        self.ignore: IgnoreRules | None = ignore
+        self.scan: ScanIndex = ScanIndex(self.assets_folder, ignore)
+        self.events: SoundEventHandler | None = None
+        self.events_mtimes: dict[str, int] | None = None
+        self.lang_index: LangIndex | None = None
+        self.lang_mtimes: dict[str, int] | None = None
+        self.lock: asyncio.Lock = asyncio.Lock()
+
+        # The last result, and the symlink targets it was checked with
+        self.result: CheckResult | None = None
+        self.links: dict[str, str] | None = None
+
+    def refresh(self) -> dict:
+        """
+        Re-read the sounds.json files only if one of them changed (or
+        a namespace gained or lost one), re-list only the directories
+        that changed since the previous request, and forget the lang
+        index if a lang file changed. Any of these, or a symlink that
+        now leads elsewhere, forgets the last result.
+        """
+        mtimes: dict[str, int] = {
+            p: os.stat(p).st_mtime_ns
+            for p in list_sounds_jsons(self.assets_folder, self.ignore)
+            + [str(self.sounds_json)]}
+        reloaded: bool = mtimes != self.events_mtimes
+
+        if reloaded:
+            self.events = load_events(self.sounds_json, self.ignore)
+            self.events_mtimes = mtimes
+
+        relisted: int = self.scan.refresh()
+
+        regular, symlinks = self.scan.get_file_names()
+
+        # A lang file can be edited without its folder changing
+        lang_mtimes: dict[str, int] = {
+            f: os.stat(f).st_mtime_ns for f in regular + symlinks
+            if f.endswith(".json") and _is_lang_file(self.assets_folder, f)}
+        lang_reloaded: bool = lang_mtimes != self.lang_mtimes
+
+        if lang_reloaded:
+            self.lang_index = None
+            self.lang_mtimes = lang_mtimes
+
+        # So can the target of a link
+        links: dict[str, str] = {s: os.path.realpath(s) for s in symlinks}
+
+        if reloaded or relisted > 0 or lang_reloaded or links != self.links:
+            self.result = None
+        self.links = links
+
+        return {"sounds_json_reloaded": reloaded,
+                "directories_relisted": relisted,
+                "lang_reloaded": lang_reloaded}
+
+
+class CheckServer:
+    """
+    Answer check requests over a Unix domain socket, keeping the
+    checker's vanilla index and each pack's scan index warm between
+    requests.
+
+    The protocol is one JSON object per line in each direction:
+
+        {"command": "check", "path": "/path/to/sounds.json"}
+        {"command": "ping"}
+
+    Every response carries "ok"; failures carry "error" instead of
+    results. Checks run in worker threads, so clients are served
+    concurrently, while requests for the same pack are serialized.
+    At most max_packs packs are kept warm, and a pack's result is
+    reused until something it was checked from changes.
+    """
+
+    def __init__(self, socket_path: str, checker: PackChecker,
+                 max_packs: int = MAX_PACKS):
+        self.socket_path: str = socket_path
+        self.checker: PackChecker = checker
+        self.max_packs: int = max_packs
+        self.packs: OrderedDict[CPath, PackState] = OrderedDict()
+
+    async def serve(self):
+        """Listen on the socket until cancelled"""
+
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+        server = await asyncio.start_unix_server(
+            self.handle_client, path=self.socket_path)
+
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+    async def handle_client(self, reader: asyncio.StreamReader,
+                            writer: asyncio.StreamWriter):
+
+        try:
+            while line := await reader.readline():
+                response: dict = await self.handle_request(line)
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def handle_request(self, line: bytes) -> dict:
+
+        try:
+            request: dict = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("Requests must be JSON objects")
+
+            command: str = request.get("command", "check")
+
+            if command == "ping":
+                return {"ok": True}
+
+            if command == "check":
+                if not isinstance(request.get("path"), str):
+                    raise ValueError("check needs a path")
+                return await self.check_pack(request["path"])
+
+            raise ValueError(f"Unknown command: {command}")
+
+        except (ValueError, KeyError, TypeError, OSError) as e:
+            return {"ok": False, "error": f"{type(e).__name__}: {e}"}
+
+    async def check_pack(self, path: str) -> dict:
+
+        sounds_json: CPath = await asyncio.to_thread(
+            _locate, path, self.checker.get_ignore_rules)
+
+        state: PackState | None = self.packs.get(sounds_json)
+        if state is None:
+            state = self.packs[sounds_json] = PackState(
+                sounds_json, self.checker.get_ignore_rules(
+                    sounds_json.parent.parent))
+            self._evict()
+        self.packs.move_to_end(sounds_json)
+
+        async with state.lock:
+            return await asyncio.to_thread(self._check_pack, state)
+
+    def _evict(self):
+        """Forget the least recently checked packs beyond max_packs"""
+
+        for sounds_json in list(self.packs):
+            if len(self.packs) <= self.max_packs:
+                break
+
+            # A pack being checked stays, or its lock would be doubled
+            if not self.packs[sounds_json].lock.locked():
+                del self.packs[sounds_json]
+
+    def _check_pack(self, state: PackState) -> dict:
+
+        start: float = time.perf_counter()
+        refreshed: dict = state.refresh()
+        rechecked: bool = state.result is None
+
+        if rechecked:
+            if state.lang_index is None:
+                state.lang_index = self.checker.get_lang_index(
+                    state.assets_folder)
+
+            all_files: list[CPath] = state.scan.get_all_files()
+            state.result = self.checker.check(
+                state.sounds_json, state.events, all_files,
+                lang_index=state.lang_index,
+                linked=get_linked(state.assets_folder, all_files))
+
+        response: dict = {"ok": True}
+        response.update(refreshed)
+        response["rechecked"] = rechecked
+        response.update(state.result.to_dict())
+
+        response["elapsed_ms"] = round(
+            (time.perf_counter() - start) * 1000, 3)
+
+        return response
+
+
+def _is_lang_file(assets_folder: CPath, path: str) -> bool:
+    """Whether a path is assets/<namespace>/lang/<locale>.json"""
+
+    parts: list[str] = os.path.relpath(path, assets_folder).split(os.sep)
+    return len(parts) == 3 and parts[1] == "lang"
+
+
+def _locate(path: str,
+            ignore: Callable[[CPath], IgnoreRules] = None) -> CPath:
+    """
+    Find the sounds.json a request's path stands for, as the command
+    line does
+    :param ignore: Gives the ignore rules of an assets folder
+    """
+    sounds_json: CPath = CPath(path)
+    if sounds_json.is_dir():
+        sounds_json = find_sounds_json(sounds_json, ignore)
+
+    if sounds_json.suffix != ".json":
+        raise ValueError(
+            f"{sounds_json} is not supported in serve mode, "
+            f"only folders and sounds.json files are")
+
+    if not sounds_json.is_file():
+        raise FileNotFoundError(f"No sounds.json found at {path}")
+
+    return CPath(sounds_json.resolve())
@@ -5,17 +5,47 @@ class CPath(pathlib.Path):
     def __init__(self, *args):
         super().__init__(*args)
 
-        self.is_symbolic_link = False
-        self.target_path = None
+        # Whether the path is a symlink, and its target (None if it
+        # cannot be resolved), are only looked up when first asked for,
+        # so paths whose link status a scan already knows (and sets)
+        # cost no stat
+        self._is_symbolic_link: bool | None = None
+        self._target_path = None
+
+    @property
+    def is_symbolic_link(self) -> bool:
+        if getattr(self, "_is_symbolic_link", None) is None:
+            self._look_up_link()
+        return self._is_symbolic_link
+
+    @is_symbolic_link.setter
+    def is_symbolic_link(self, value: bool):
+        self._is_symbolic_link = value
+
+    @property
+    def target_path(self):
+        if getattr(self, "_is_symbolic_link", None) is None:
+            self._look_up_link()
+        return self._target_path
+
+    @target_path.setter
+    def target_path(self, value):
+        if getattr(self, "_is_symbolic_link", None) is None:
+            self._look_up_link()
+        self._target_path = value
+
+    def _look_up_link(self):
+        self._is_symbolic_link = False
+        self._target_path = None
 
         # If the path is a symlink, store its target
         # If it cannot be resolved, target is none
         if self.is_symlink():
-            self.is_symbolic_link = True
+            self._is_symbolic_link = True
             try:
-                self.target_path = self.resolve()
+                self._target_path = self.resolve()
             except FileNotFoundError:
-                self.target_path = None
+                self._target_path = None
 
     # def __new__(cls, *args, **kwargs):
     #     self = super().__new__(cls, *args, **kwargs)
@@ -0,0 +1,153 @@
+import os
+import time
+
+from objects.archive_reader import ARCHIVE_SUFFIXES
+from objects.custom_path import CPath
+from objects.pack_checker import (
+    CheckResult, PackChecker, VALID_NAME, find_sounds_json,
+    get_missing_subtitles, load_events)
+from objects.scan_index import list_directory
+from objects.sound_event_handler import SoundEventHandler
+from objects.symlink_graph import SymlinkGraph
+
+# Exit codes by category, most serious first. When several categories
+# fail, the first of them decides the exit code. 1 and 2 are left to
+# Python and argparse. Codes never change once scripts can depend on
+# them, so a category added later takes the next free code wherever it
+# ranks: corrupt_sounds (10) decides before invalid_sounds (4).
+FAIL_CODES: dict[str, int] = {
+    "corrupt_members": 3,
+    "corrupt_sounds": 10,
+    "invalid_sounds": 4,
+    "broken_links": 5,
+    "orphaned_files": 6,
+    "invalid_file_names": 7,
+    "irrelevant_files": 8,
+    "missing_subtitles": 9,
+}
+
+
+def get_exit_code(found: set[str], fail_on: list[str]) -> int:
+    """
+    :param found: The categories that have findings
+    :param fail_on: The categories that should fail the run
+    :return: The exit code of the most serious failing category, or 0
+    """
+    for category, code in FAIL_CODES.items():
+        if category in found and category in fail_on:
+            return code
+
+    return 0
+
+
+class FailFastChecker:
+    """
+    Find out whether a pack has any finding in the given categories,
+    as cheaply as possible.
+
+    The checks run from cheapest to dearest, and stop at the first
+    finding confirmed: invalid sound entries are known once sounds.json
+    is parsed, files that don't belong and referenced files with invalid
+    names as soon as their directory is listed, orphans once the scan is
+    complete. Vanilla is only loaded to confirm broken links and missing
+    subtitles, and sound counts are never computed.
+
+    The result carries just what was found before stopping.
+    """
+
+    def __init__(self, checker: PackChecker = None):
+        self.checker: PackChecker = (
+            checker if checker is not None else PackChecker())
+
+    def check_path(self, path: CPath, fail_on: list[str]) -> CheckResult:
+
+        if path.suffix in ARCHIVE_SUFFIXES:
+            raise ValueError("Only folders can be checked fail-fast")
+
+        if path.is_dir():
+            path = find_sounds_json(path, self.checker.get_ignore_rules)
+
+        start: float = time.perf_counter()
+
+        assets_folder: CPath = path.parent.parent
+        events: SoundEventHandler = load_events(
+            path, self.checker.get_ignore_rules(assets_folder))
+
+        result = CheckResult(path, assets_folder, events)
+        result.findings = {c: [] for c in CheckResult.CATEGORIES}
+        result.timings["parse"] = time.perf_counter() - start
+
+        self._check(result, events, fail_on)
+
+        result.timings["checks"] = time.perf_counter() - start
+
+        return result
+
+    def _check(self, result: CheckResult, events: SoundEventHandler,
+               fail_on: list[str]):
+        """Run the checks in order, returning at the first finding"""
+
+        if "invalid_sounds" in fail_on and len(events.invalid_sounds) > 0:
+            result.invalid_sounds = events.invalid_sounds
+            return
+
+        referenced: set[str] = set(str(p) for p in events.get_sound_files())
+
+        def found(category: str, path: str):
+            result.findings[category].append(CPath(path))
+
+        # Stream the scan, stopping at the first file that settles it
+        ogg_files: set[str] = set()
+        targeted: set[str] = set()
+        graph = SymlinkGraph(result.assets_folder)
+        ignore = self.checker.get_ignore_rules(result.assets_folder)
+        pending: list[str] = [str(result.assets_folder)]
+
+        while len(pending) > 0:
+            files, symlinks, subdirectories = list_directory(
+                pending.pop(), ignore)
+            pending.extend(subdirectories)
+
+            for f in files + [s for s in symlinks if os.path.isfile(s)]:
+                if not f.endswith(".ogg"):
+                    if (not f.endswith(".json")
+                            and "irrelevant_files" in fail_on):
+                        return found("irrelevant_files", f)
+                    continue
+
+                ogg_files.add(f)
+
+                # Referenced and present: neither orphaned nor broken
+                if ("invalid_file_names" in fail_on and f in referenced
+                        and not VALID_NAME.match(f)):
+                    return found("invalid_file_names", f)
+
+            targeted.update(graph.get_reachable(
+                s for s in symlinks if s.endswith(".ogg")))
+
+        if "orphaned_files" in fail_on:
+            orphans: set[str] = ogg_files - referenced - targeted
+            if len(orphans) > 0:
+                return found("orphaned_files", min(orphans))
+
+        # Files kept alive only by a symlink, with invalid names
+        if "invalid_file_names" in fail_on:
+            for f in sorted((ogg_files & targeted) - referenced):
+                if not VALID_NAME.match(f):
+                    return found("invalid_file_names", f)
+
+        # Only now is vanilla worth loading
+        if "broken_links" in fail_on:
+            candidates: set[str] = referenced - ogg_files
+            if len(candidates) > 0:
+                vanilla_files: set[str] = set(
+                    str(p) for p in self.checker.vanilla.get_events(
+                        result.assets_folder).get_sound_files())
+                broken: set[str] = candidates - vanilla_files
+                if len(broken) > 0:
+                    return found("broken_links", min(broken))
+
+        if "missing_subtitles" in fail_on:
+            result.missing_subtitles = get_missing_subtitles(
+                events, self.checker.get_lang_index(result.assets_folder),
+                result.sounds_json.parent.name)
@@ -0,0 +1,209 @@
+import os
+import re
+
+from objects.custom_path import CPath
+
+# The file holding a pack's ignore rules, one gitignore pattern a line
+IGNORE_FILE: str = ".spcheckignore"
+
+
+def translate(pattern: str) -> str:
+    """
+    Turn a gitignore glob into a regular expression matching paths
+    relative to the rules' folder. Without a slash (other than at the
+    end) the pattern matches a name at any depth.
+    """
+    anchored: bool = "/" in pattern
+    pattern = pattern.removeprefix("/")
+
+    regex: str = "" if anchored else "(?:.*/)?"
+    n: int = 0
+
+    while n < len(pattern):
+        c: str = pattern[n]
+
+        if pattern.startswith("**/", n) and (n == 0 or pattern[n - 1] == "/"):
+            # Any number of folders, none included
+            regex += "(?:.*/)?"
+            n += 3
+        elif pattern.startswith("**", n) and n + 2 == len(pattern) and (
+                n > 0 and pattern[n - 1] == "/"):
+            # Everything inside
+            regex += ".*"
+            n += 2
+        elif c == "*":
+            regex += "[^/]*"
+            n += 1
+            while n < len(pattern) and pattern[n] == "*":
+                n += 1
+        elif c == "?":
+            regex += "[^/]"
+            n += 1
+        elif c == "[" and "]" in pattern[n + 2:]:
+            end: int = pattern.index("]", n + 2)
+            members: str = pattern[n + 1:end]
+            if members.startswith("!"):
+                members = "^" + members[1:]
+            regex += "[" + members.replace("\\", "\\\\") + "]"
+            n = end + 1
+        elif c == "\\" and n + 1 < len(pattern):
+            regex += re.escape(pattern[n + 1])
+            n += 2
+        else:
+            regex += re.escape(c)
+            n += 1
+
+    return regex
+
+
+class IgnoreRules:
+    """
+    Gitignore-style rules for what a check should never see, compiled
+    into a single matcher.
+
+    Each rule becomes one alternative of a regular expression, last
+    rule first, so the alternative that matches is the rule that
+    decides, as the last matching line does in a .gitignore. Rules
+    ending in "/" only match folders, so folders and files get an
+    expression each. A "!" rule keeps what an earlier rule ignored,
+    but nothing inside an ignored folder: walks prune ignored folders
+    without listing them.
+    """
+
+    def __init__(self, root: str, patterns: list[str]):
+        """
+        :param root: The folder the rules are relative to
+        :param patterns: Lines of an ignore file, in order
+        """
+        self.root: str = str(root)
+        self.patterns: list[str] = list(patterns)
+
+        files: list[str] = []
+        folders: list[str] = []
+
+        for n, line in enumerate(self.patterns):
+            line = _strip(line)
+            if line == "" or line.startswith("#"):
+                continue
+
+            name: str = f"k{n}" if line.startswith("!") else f"i{n}"
+            # "\!" and "\#" are left to translate() as literals
+            line = line.removeprefix("!")
+
+            folder_only: bool = line.endswith("/")
+            alternative: str = f"(?P<{name}>{translate(line.rstrip('/'))})"
+
+            folders.append(alternative)
+            if not folder_only:
+                files.append(alternative)
+
+        # The rules' own file is never part of the pack, whatever the
+        # rules say, so it comes last to win
+        own: str = translate("/" + IGNORE_FILE)
+        files.append(f"(?P<i{len(self.patterns)}>{own})")
+
+        self._files = _compile(files)
+        self._folders = _compile(folders)
+        self._cut: int = len(self.root) + 1
+
+    def __eq__(self, other) -> bool:
+        return (isinstance(other, IgnoreRules) and self.root == other.root
+                and self.patterns == other.patterns)
+
+    @classmethod
+    def from_folder(cls, assets_folder: CPath, patterns: list[str] = ()):
+        """
+        The rules for a pack: those of the IGNORE_FILE next to the
+        assets folder (where pack.mcmeta is) that reach into it, then
+        the one inside it, then patterns. Later rules win.
+        :param patterns: More rules, relative to the assets folder
+        """
+        folder: str = os.path.abspath(assets_folder)
+
+        lines: list[str] = []
+        for line in _read(os.path.join(os.path.dirname(folder), IGNORE_FILE)):
+            rebased: str | None = _rebase(line, os.path.basename(folder))
+            if rebased is not None:
+                lines.append(rebased)
+
+        lines.extend(_read(os.path.join(folder, IGNORE_FILE)))
+        lines.extend(patterns)
+
+        return cls(str(assets_folder), lines)
+
+    def is_ignored(self, path: str, is_folder: bool = False) -> bool:
+        """
+        Whether a file or folder is ignored by its own name, not
+        counting the folders above it
+        :param path: A path under root, as a walk of root lists it
+        """
+        regex = self._folders if is_folder else self._files
+        if regex is None:
+            return False
+
+        match = regex.fullmatch(path[self._cut:])
+        return match is not None and match.lastgroup[0] == "i"
+
+    def excludes(self, path: str) -> bool:
+        """
+        Whether a walk would leave a file out, because it or one of the
+        folders above it is ignored. For paths that weren't walked to.
+        """
+        parts: list[str] = path[self._cut:].split("/")
+        for n in range(1, len(parts)):
+            if self.is_ignored(
+                    self.root + "/" + "/".join(parts[:n]), True):
+                return True
+
+        return self.is_ignored(path)
+
+
+def _compile(alternatives: list[str]):
+    if len(alternatives) == 0:
+        return None
+
+    return re.compile("|".join(reversed(alternatives)), re.DOTALL)
+
+
+def _strip(line: str) -> str:
+    """Drop the line break and unescaped trailing spaces"""
+
+    line = line.rstrip("\r\n")
+    while line.endswith(" ") and not line.endswith("\\ "):
+        line = line[:-1]
+
+    return line
+
+
+def _rebase(line: str, folder: str) -> str | None:
+    """
+    A rule of the folder above the assets folder, as a rule of the
+    assets folder
+    :param folder: The name of the assets folder
+    :return: None for rules that can't match inside it
+    """
+    rule: str = _strip(line)
+    negation: str = "!" if rule.startswith("!") else ""
+    rule = rule.removeprefix("!")
+
+    # Rules without a slash match at any depth anyway
+    if rule == "" or rule.startswith("#") or "/" not in rule.rstrip("/"):
+        return line
+
+    first, _, rest = rule.removeprefix("/").partition("/")
+    if first == "**":
+        return line
+    if rest.rstrip("/") == "" or not re.fullmatch(translate("/" + first),
+                                                  folder):
+        return None
+
+    # Still anchored, now to the assets folder
+    return f"{negation}/{rest}"
+
+
+def _read(path: str) -> list[str]:
+    try:
+        with open(path, encoding="utf-8") as file:
+            return file.read().splitlines()
+    except FileNotFoundError:
+        return []
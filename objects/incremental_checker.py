@@ -0,0 +1,277 @@
+import time
+from typing import Iterable
+
+from objects.archive_reader import ARCHIVE_SUFFIXES
+from objects.check_cache import CheckCache
+from objects.custom_path import CPath
+from objects.ignore_rules import IgnoreRules
+from objects.pack_checker import (
+    CheckResult, PackChecker, VALID_NAME, find_sounds_json, get_missing_subtitles,
+    load_events)
+from objects.scan_index import ScanIndex
+from objects.sound_event_handler import SoundEventHandler
+from objects.symlink_graph import SymlinkGraph
+
+
+class IncrementalState:
+    """
+    A snapshot of one pack that can be brought up to date cheaply.
+
+    Every check outcome is a property of a single file path: whether it
+    is referenced (and how often), whether it exists, whether a symlink
+    targets it, and whether vanilla has it. So when only sounds.json
+    changed, only the paths referenced by the events that changed can
+    change status, and only those events' counts need recounting.
+    Likewise, files that appeared or disappeared, and files whose
+    symlinks now lead elsewhere, are the only ones reclassified when
+    the tree changed. Saving sounds.json through a temporary file
+    relists its folder, but changes no path's status by itself.
+
+    Paths are kept as plain strings, so a snapshot is cheap to store.
+    """
+
+    def __init__(self, assets_folder: CPath, ignore: IgnoreRules = None):
+        self.assets_folder: CPath = assets_folder
+        self.scan: ScanIndex = ScanIndex(assets_folder, ignore)
+
+        # From sounds.json and vanilla
+        self.event_sounds: dict[str, list[str]] = {}
+        self.event_files: dict[str, list[str]] = {}
+        self.ref_counts: dict[str, int] = {}
+        self.vanilla_files: set[str] = set()
+
+        # From the file system
+        self.irrelevant_files: list[str] = []
+        self.ogg_files: set[str] = set()
+        self.link_targets: dict[str, str] = {}
+        self.targeted: set[str] = set()
+
+        # Results: path -> "orphan", "broken", "invalid" or "ok"
+        self.status: dict[str, str] = {}
+        self.sound_counts: dict[str, int] = {}
+        self.updated: bool = False
+
+    def update(self, events: SoundEventHandler,
+               vanilla_events: SoundEventHandler) -> dict:
+        """
+        Bring the snapshot up to date
+        :return: How much had to be recomputed
+        """
+        full: bool = not self.updated
+        self.updated = True
+
+        self.scan.refresh()
+        moved: set[str] = self._read_scan()
+        affected: set[str] = set(moved)
+
+        vanilla_files: set[str] = set(
+            str(p) for p in vanilla_events.get_sound_files())
+        if vanilla_files != self.vanilla_files:
+            self.vanilla_files = vanilla_files
+            full = True
+
+        # Compare the raw sound names first, so paths are only built
+        # for the events that changed
+        event_sounds: dict[str, list[str]] = {
+            key: [s['name'] for s in event['sounds']]
+            for key, event in events.get_event_dictionary().items()}
+
+        changed: list[str] = [
+            key for key in event_sounds.keys() | self.event_sounds.keys()
+            if event_sounds.get(key) != self.event_sounds.get(key)]
+
+        event_files: dict[str, list[str]] = dict(self.event_files)
+        for key in changed:
+            event_files.pop(key, None)
+            if key in event_sounds:
+                event_files[key] = [str(p) for p in events.get_sound_files(key)]
+
+        for key in changed:
+            for f in self.event_files.get(key, []):
+                self.ref_counts[f] -= 1
+                if self.ref_counts[f] == 0:
+                    del self.ref_counts[f]
+            for f in event_files.get(key, []):
+                self.ref_counts[f] = self.ref_counts.get(f, 0) + 1
+
+            affected.update(self.event_files.get(key, []))
+            affected.update(event_files.get(key, []))
+
+        self.event_sounds = event_sounds
+        self.event_files = event_files
+
+        # Events playing a file that came, went or got linked to are
+        # recounted too
+        recount: set[str] = set(changed)
+        if len(moved) > 0:
+            recount.update(
+                key for key, files in event_files.items()
+                if not moved.isdisjoint(files))
+
+        if full:
+            self.status = {}
+            affected = self.ogg_files | self.ref_counts.keys()
+            changed = list(event_files)
+            recount = set(changed)
+            self.sound_counts = {}
+
+        self.classify(affected)
+        self.count(recount)
+
+        return {"full": full, "events_changed": len(changed),
+                "paths_reclassified": len(affected)}
+
+    def _read_scan(self) -> set[str]:
+        """
+        Take the files from the scan, resolving every symlink again,
+        since a link can be retargeted without its folder changing
+        :return: The paths whose presence or targeting changed
+        """
+        regular, symlinks = self.scan.get_file_names()
+
+        self.irrelevant_files = [
+            f for f in regular + symlinks
+            if not f.endswith(".ogg") and not f.endswith(".json")]
+
+        ogg_files: set[str] = set(
+            f for f in regular + symlinks if f.endswith(".ogg"))
+
+        graph = SymlinkGraph(self.assets_folder)
+        self.link_targets = {
+            s: graph.resolve(s)["target"]
+            for s in symlinks if s.endswith(".ogg")}
+
+        # Links in the middle of a chain are targeted too
+        targeted: set[str] = graph.get_reachable(self.link_targets)
+
+        affected: set[str] = (
+            (ogg_files ^ self.ogg_files) | (targeted ^ self.targeted))
+        self.ogg_files = ogg_files
+        self.targeted = targeted
+
+        return affected
+
+    def classify(self, paths: set[str]):
+        """Decide each path's status the same way check_pack() would"""
+
+        for f in paths:
+            self.status.pop(f, None)
+
+            referenced: bool = f in self.ref_counts
+            present: bool = f in self.ogg_files
+
+            if present and not referenced and f not in self.targeted:
+                self.status[f] = "orphan"
+            elif referenced and not present and f not in self.vanilla_files:
+                self.status[f] = "broken"
+            elif present and not VALID_NAME.match(f):
+                self.status[f] = "invalid"
+            elif present:
+                self.status[f] = "ok"
+
+    def count(self, event_names: Iterable[str]):
+        """Recount the files the given events play"""
+
+        for key in event_names:
+            self.sound_counts.pop(key, None)
+            if key in self.event_files:
+                c = sum(1 for f in set(self.event_files[key])
+                        if self.status.get(f) == "ok")
+                if c > 0:
+                    self.sound_counts[key] = c
+
+    def to_result(self, sounds_json: CPath,
+                  events: SoundEventHandler) -> CheckResult:
+
+        result = CheckResult(sounds_json, self.assets_folder, events)
+        result.invalid_sounds = events.invalid_sounds
+
+        by_status: dict[str, list[str]] = {}
+        for f, status in self.status.items():
+            by_status.setdefault(status, []).append(f)
+
+        broken: list[str] = []
+        for f in by_status.get("broken", []):
+            broken.extend([f] * self.ref_counts[f])
+
+        result.findings = {
+            "irrelevant_files": sorted(
+                CPath(f) for f in self.irrelevant_files),
+            "broken_links": sorted(CPath(f) for f in broken),
+            "orphaned_files": sorted(
+                CPath(f) for f in by_status.get("orphan", [])),
+            "invalid_file_names": sorted(
+                CPath(f) for f in by_status.get("invalid", []))}
+
+        result.set_sound_file_names(by_status.get("ok", []))
+        result.sound_counts = dict(sorted(self.sound_counts.items()))
+
+        return result
+
+
+class IncrementalChecker:
+    """
+    Check a pack against the snapshot left in the cache by the previous
+    run, recomputing only what changed since. The result is the same
+    as PackChecker.check_path() would return.
+    """
+
+    def __init__(self, checker: PackChecker = None, cache: CheckCache = None):
+        self.checker: PackChecker = (
+            checker if checker is not None else PackChecker())
+        self.cache: CheckCache = cache if cache is not None else CheckCache()
+
+        # What the last check_path() had to recompute
+        self.last_update: dict = {}
+
+    def check_path(self, path: CPath) -> CheckResult:
+
+        # Archives have no file system to keep an index of
+        if path.suffix in ARCHIVE_SUFFIXES:
+            return self.checker.check_path(path)
+
+        if path.is_dir():
+            path = find_sounds_json(path, self.checker.get_ignore_rules)
+
+        timings: dict[str, float] = {}
+        start: float = time.perf_counter()
+
+        assets_folder: CPath = path.parent.parent
+        ignore: IgnoreRules = self.checker.get_ignore_rules(assets_folder)
+        events: SoundEventHandler = load_events(path, ignore)
+
+        timings["parse"] = time.perf_counter() - start
+        start = time.perf_counter()
+
+        key: str = str(CPath(path).absolute())
+
+        # New ignore rules change what the snapshot should have seen
+        state: IncrementalState = self.cache.load("snapshots", key)
+        if (state is None or state.assets_folder != assets_folder
+                or state.scan.ignore != ignore):
+            state = IncrementalState(assets_folder, ignore)
+
+        timings["cache"] = time.perf_counter() - start
+        start = time.perf_counter()
+
+        vanilla_events = self.checker.vanilla.get_events(assets_folder)
+        self.last_update = state.update(events, vanilla_events)
+
+        timings["checks"] = time.perf_counter() - start
+        start = time.perf_counter()
+
+        result: CheckResult = state.to_result(path, events)
+        self.cache.store("snapshots", key, state)
+
+        timings["store"] = time.perf_counter() - start
+        start = time.perf_counter()
+
+        # Lang files aren't part of the snapshot; they're read again
+        result.missing_subtitles = get_missing_subtitles(
+            events, self.checker.get_lang_index(assets_folder),
+            path.parent.name)
+
+        timings["subtitles"] = time.perf_counter() - start
+        result.timings.update(timings)
+
+        return result
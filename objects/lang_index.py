@@ -0,0 +1,119 @@
+import json
+import os
+from typing import Callable
+
+from objects.custom_path import CPath
+from objects.sound_event_handler import SoundEventHandler
+
+# The locale the game falls back to when a translation is missing
+DEFAULT_LOCALE: str = "en_us"
+
+
+def read_lang_folder(assets_folder: CPath,
+                     namespace: str) -> dict[str, bytes]:
+    """
+    Read assets/<namespace>/lang/*.json
+    :return: Locale names mapped to the raw contents of their files
+    """
+    lang_folder: str = os.path.join(str(assets_folder), namespace, "lang")
+
+    try:
+        names: list[str] = os.listdir(lang_folder)
+    except (FileNotFoundError, NotADirectoryError):
+        return {}
+
+    files: dict[str, bytes] = {}
+    for name in names:
+        if not name.endswith(".json"):
+            continue
+
+        path: str = os.path.join(lang_folder, name)
+        try:
+            with open(path, "rb") as file:
+                files[name[:-len(".json")].lower()] = file.read()
+        except (IsADirectoryError, FileNotFoundError):
+            continue
+
+    return files
+
+
+class LangIndex:
+    """
+    The translation keys of a pack's lang files, by namespace and locale.
+
+    Nothing is read until a namespace is asked for, so packs without
+    subtitles never touch their lang folders. Each locale only keeps
+    its set of keys, not the translations.
+
+    Keys the game already knows are given as vanilla_keys. They count
+    as translated in every locale.
+    """
+
+    def __init__(self, assets_folder: CPath,
+                 vanilla_keys: frozenset[str] = frozenset(),
+                 read: Callable[[str], dict[str, bytes]] = None):
+        """
+        :param read: Returns a namespace's lang files as locale names
+        mapped to raw contents, read_lang_folder() by default
+        """
+        self.assets_folder: CPath = assets_folder
+        self.vanilla_keys: frozenset[str] = vanilla_keys
+        self._read: Callable[[str], dict[str, bytes]] = (
+            read if read is not None
+            else lambda n: read_lang_folder(assets_folder, n))
+        self._locales: dict[str, dict[str, frozenset[str]]] = {}
+
+    def get_locales(self, namespace: str) -> dict[str, frozenset[str]]:
+        """Return a namespace's locales mapped to their keys"""
+
+        locales = self._locales.get(namespace)
+        if locales is None:
+            locales = {}
+            for locale, data in self._read(namespace).items():
+                try:
+                    keys = json.loads(data)
+                except ValueError:
+                    keys = {}
+                locales[locale] = frozenset(
+                    keys if isinstance(keys, dict) else ())
+
+            self._locales[namespace] = locales
+
+        return locales
+
+    def get_missing_keys(self, namespaces: list[str],
+                         keys: set[str]) -> dict[str, list[str]]:
+        """
+        Find the keys that some locale doesn't translate. The game
+        merges the lang files of every namespace, so a locale's keys
+        are those of all the given namespaces together. en_us is always
+        checked, since the game falls back to it.
+        :return: Locales mapped to their sorted missing keys, locales
+        missing nothing are left out
+        """
+        needed: set[str] = set(keys) - self.vanilla_keys
+        if len(needed) == 0:
+            return {}
+
+        locales: dict[str, frozenset[str]] = {DEFAULT_LOCALE: frozenset()}
+        for namespace in namespaces:
+            for locale, locale_keys in self.get_locales(namespace).items():
+                # Only copy key sets when namespaces share a locale
+                known = locales.get(locale)
+                locales[locale] = known | locale_keys if known else locale_keys
+
+        missing: dict[str, list[str]] = {}
+        for locale in sorted(locales):
+            absent: set[str] = needed - locales[locale]
+            if len(absent) > 0:
+                missing[locale] = sorted(absent)
+
+        return missing
+
+
+def get_subtitle_keys(events: SoundEventHandler) -> set[str]:
+    """Return every subtitle key the events use"""
+
+    return set(
+        event['subtitle'] for event in events.get_event_dictionary().values()
+        if isinstance(event, dict) and 'subtitle' in event)
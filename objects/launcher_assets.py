@@ -0,0 +1,97 @@
+import glob
+import hashlib
+import json
+import os
+import sys
+
+from objects.check_cache import CheckCache
+from objects.custom_path import CPath
+
+# Where sounds.json is filed in an asset index
+SOUNDS_JSON: str = "minecraft/sounds.json"
+SOUNDS_FOLDER: str = "minecraft/sounds/"
+
+
+def default_minecraft_dir() -> CPath:
+    """Where the official launcher keeps its files on this platform"""
+
+    if sys.platform == "win32":
+        return CPath(os.environ.get("APPDATA", ""), ".minecraft")
+    if sys.platform == "darwin":
+        return CPath(os.path.expanduser(
+            "~/Library/Application Support/minecraft"))
+
+    return CPath(os.path.expanduser("~/.minecraft"))
+
+
+def get_index_path(minecraft_dir: CPath, version: str) -> CPath:
+    """
+    Find the asset index of a version, "latest" being the one the
+    launcher wrote last
+    """
+    indexes: str = os.path.join(str(minecraft_dir), "assets", "indexes")
+
+    if version != "latest":
+        return CPath(indexes, f"{version}.json")
+
+    found: list[str] = glob.glob(os.path.join(glob.escape(indexes), "*.json"))
+    if len(found) == 0:
+        raise FileNotFoundError(f"No asset indexes found in {indexes}")
+
+    return CPath(max(found, key=os.path.getmtime))
+
+
+def read_launcher_assets(index_path: CPath
+                         ) -> tuple[str, bytes, frozenset[str]]:
+    """
+    Look sounds.json up in an asset index and read it from the hashed
+    object store next to it (assets/objects/<ab>/<abcdef...>)
+    :return: The object's hash, its contents, and the paths of the sound
+    files the version ships ("minecraft/sounds/x.ogg")
+    """
+    with open(index_path, "rb") as file:
+        objects: dict = json.load(file).get("objects", {})
+
+    entry = objects.get(SOUNDS_JSON)
+    if entry is None:
+        raise ValueError(f"{index_path} has no {SOUNDS_JSON}")
+
+    digest: str = entry["hash"]
+    object_path: str = os.path.join(
+        str(index_path.parent.parent), "objects", digest[:2], digest)
+
+    with open(object_path, "rb") as file:
+        data: bytes = file.read()
+
+    # The object is named after the SHA-1 of its contents
+    if hashlib.sha1(data).hexdigest() != digest:
+        raise ValueError(f"{object_path} is damaged, its hash doesn't match")
+
+    sound_files: frozenset[str] = frozenset(
+        name for name in objects
+        if name.startswith(SOUNDS_FOLDER) and name.endswith(".ogg"))
+
+    return digest, data, sound_files
+
+
+def load_launcher_assets(index_path: CPath, cache: CheckCache = None
+                         ) -> tuple[str, bytes, frozenset[str]]:
+    """
+    read_launcher_assets(), through the cache: an index is only read
+    again when its mtime or size changes
+    """
+    stat = os.stat(index_path)
+    key: str = (f"{os.path.abspath(index_path)}\0"
+                f"{stat.st_mtime_ns}\0{stat.st_size}")
+
+    if cache is not None:
+        cached = cache.load("vanilla", key)
+        if cached is not None:
+            return cached
+
+    assets = read_launcher_assets(index_path)
+
+    if cache is not None:
+        cache.store("vanilla", key, assets)
+
+    return assets
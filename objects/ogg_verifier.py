@@ -0,0 +1,178 @@
+import mmap
+import os
+import zlib
+from typing import TypedDict
+
+from objects.check_cache import CheckCache
+from objects.custom_path import CPath
+from objects.stream_advisor import CAPTURE_PATTERN, PAGE_HEADER
+
+# Where the CRC sits in a page header; it is computed with these bytes
+# set to zero
+CRC_OFFSET: int = 22
+
+# Header type flags
+BEGINNING_OF_STREAM: int = 0x02
+END_OF_STREAM: int = 0x04
+
+# Every byte with its bits in reverse order
+_REVERSED_BITS: bytes = bytes(
+    int(f"{b:08b}"[::-1], 2) for b in range(256))
+
+
+class CorruptSound(TypedDict):
+    name: str
+    problem: str
+
+
+def ogg_crc(*parts: bytes) -> int:
+    """
+    The CRC32 of an Ogg page, given in parts.
+
+    Ogg uses the same polynomial as zlib, but feeds bits in the other
+    order, starts from zero and doesn't invert the result. Reversing
+    the bits of every byte, and of the result, turns one into the
+    other, so the work is done by zlib.crc32 and bytes.translate
+    rather than a loop in Python.
+    """
+    # zlib inverts the CRC going in and coming out; starting from
+    # all ones makes that a start from zero
+    crc: int = 0xFFFFFFFF
+    for part in parts:
+        crc = zlib.crc32(part.translate(_REVERSED_BITS), crc)
+
+    return int(f"{crc ^ 0xFFFFFFFF:032b}"[::-1], 2)
+
+
+def verify_ogg(path: str) -> str | None:
+    """
+    Walk every page of an Ogg file without decoding any audio: each
+    must start with the capture pattern, fit in the file, match its
+    CRC and follow the previous page of its stream, and every stream
+    must end with a last page. This catches files cut short by a
+    failed upload, which the header checks of --stream-advice don't.
+    :return: What's wrong with the file, or None
+    """
+    try:
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return "truncated: the file is empty"
+
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                if hasattr(data, "madvise"):
+                    data.madvise(mmap.MADV_SEQUENTIAL)
+                return _verify_pages(data)
+    except OSError as e:
+        return f"unreadable: {e.strerror}"
+
+
+def _verify_pages(data: mmap.mmap) -> str | None:
+
+    size: int = len(data)
+    position: int = 0
+    page: int = 0
+
+    # The sequence number expected next from each open stream
+    expected: dict[int, int] = {}
+
+    while position < size:
+        if size - position < PAGE_HEADER.size:
+            return f"truncated: page {page} has no complete header"
+
+        (capture, version, flags, _, serial, sequence, crc,
+         segments) = PAGE_HEADER.unpack_from(data, position)
+
+        if capture != CAPTURE_PATTERN:
+            return f"corrupt: no page where page {page} should start"
+        if version != 0:
+            return f"corrupt: page {page} has unknown version {version}"
+
+        body: int = position + PAGE_HEADER.size + segments
+        if body > size:
+            return f"truncated: page {page} has no complete header"
+
+        end: int = body + sum(data[position + PAGE_HEADER.size:body])
+        if end > size:
+            return (f"truncated: {size - body} of {end - body} bytes "
+                    f"of page {page}")
+
+        actual: int = ogg_crc(
+            data[position:position + CRC_OFFSET], bytes(4),
+            data[position + CRC_OFFSET + 4:end])
+        if actual != crc:
+            return (f"corrupt: page {page} has CRC {actual:08x} "
+                    f"instead of {crc:08x}")
+
+        if flags & BEGINNING_OF_STREAM:
+            if serial in expected:
+                return f"corrupt: page {page} restarts an open stream"
+        elif serial not in expected:
+            return f"corrupt: page {page} belongs to no open stream"
+        elif sequence != expected[serial]:
+            return (f"corrupt: page {page} is number {sequence} of its "
+                    f"stream instead of {expected[serial]}")
+
+        if flags & END_OF_STREAM:
+            expected.pop(serial, None)
+        else:
+            expected[serial] = sequence + 1
+
+        position = end
+        page += 1
+
+    if len(expected) > 0:
+        return f"truncated: {page} pages, then the file ends mid-stream"
+
+    return None
+
+
+def verify_sounds(assets_folder: CPath, paths: list[str],
+                  cache: CheckCache = None) -> list[CorruptSound]:
+    """
+    Walk the pages of Ogg files (see verify_ogg), skipping those whose
+    size and mtime haven't changed since the cache last saw them.
+
+    Files are mapped rather than read, and scanned one after another:
+    slicing the map and bytes.translate hold the GIL, so a pool of
+    threads only adds its own overhead. The verdicts on every file of
+    the pack are kept as one cache entry, so a rerun costs a stat a
+    file.
+    :param paths: The files to scan, under assets_folder
+    :return: The files that are corrupt or truncated, by path relative
+    to assets_folder
+    """
+    key: str = os.path.abspath(assets_folder)
+    known: dict[str, tuple[int, int, str | None]] = (
+        cache.load("ogg-pages", key) or {}) if cache is not None else {}
+
+    verdicts: dict[str, tuple[int, int, str | None]] = {}
+    pending: list[tuple[str, int, int]] = []
+
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+
+        entry = known.get(path)
+        if entry is not None and entry[:2] == (
+                stat.st_size, stat.st_mtime_ns):
+            verdicts[path] = entry
+        else:
+            pending.append((path, stat.st_size, stat.st_mtime_ns))
+
+    for path, size, mtime in pending:
+        verdicts[path] = (size, mtime, verify_ogg(path))
+
+    if cache is not None and (len(pending) > 0 or len(verdicts) < len(known)):
+        # Files this scan wasn't given keep their verdicts while they last
+        stored: dict[str, tuple[int, int, str | None]] = {
+            p: e for p, e in known.items()
+            if p not in verdicts and os.path.exists(p)}
+        stored.update(verdicts)
+        cache.store("ogg-pages", key, stored)
+
+    prefix: str = str(assets_folder) + "/"
+    return [CorruptSound(name=path.removeprefix(prefix), problem=problem)
+            for path, (_, _, problem) in sorted(verdicts.items())
+            if problem is not None]
@@ -0,0 +1,914 @@
+import glob
+import hashlib
+import json
+import os
+import posixpath
+import re
+import stat
+import threading
+import time
+import zipfile
+from collections import OrderedDict
+from typing import Callable, Iterable
+
+from objects.archive_reader import (
+    ARCHIVE_SUFFIXES, SPILL_THRESHOLD, find_sounds_jsons, iter_archives)
+from objects.check_cache import CheckCache
+from objects.custom_path import CPath
+from objects.ignore_rules import IgnoreRules
+from objects.lang_index import LangIndex, get_subtitle_keys
+from objects.launcher_assets import get_index_path, load_launcher_assets
+from objects.scan_index import list_directory
+from objects.sound_event_handler import InvalidSound, SoundEventHandler
+from objects.symlink_graph import SymlinkGraph
+from objects.vanilla_overrides import VanillaKeys
+from objects.vfs import VFS, RealFS, ZipFS, walk
+
+
+# ------------------------------------------------------
+# Checks
+# ------------------------------------------------------
+
+# Mojang's naming rules for resource paths
+VALID_NAME = re.compile("^[a-z0-9/._-]+$")
+
+
+def list_sounds_jsons(assets_folder: CPath,
+                      ignore: IgnoreRules = None) -> list[str]:
+    """
+    Find the sounds.json of every namespace in an assets folder
+    :param ignore: Rules for what to leave out, as a walk would
+    :return: Their paths, sorted
+    """
+    pattern: str = os.path.join(
+        glob.escape(str(assets_folder)), "*", "sounds.json")
+
+    return sorted(p for p in glob.glob(pattern)
+                  if not (ignore and ignore.excludes(p)))
+
+
+def read_sounds_jsons(sounds_json: CPath,
+                      ignore: IgnoreRules = None) -> dict[str, dict]:
+    """
+    Read a sounds.json, along with the sounds.json of every other
+    namespace in the same assets folder
+    :param ignore: Rules for what to leave out; namespaces they ignore
+    aren't read, unless sounds_json is theirs
+    :return: Namespaces mapped to the contents of their sounds.json
+    """
+    namespace: str = sounds_json.parent.name
+
+    paths: dict[str, str] = {
+        os.path.basename(os.path.dirname(p)): p
+        for p in list_sounds_jsons(sounds_json.parent.parent, ignore)}
+    paths[namespace] = str(sounds_json)
+
+    namespaced_json: dict[str, dict] = {}
+    for n in sorted(paths):
+        with open(paths[n], "r") as file:
+            namespaced_json[n] = json.load(file)
+
+    return namespaced_json
+
+
+def find_sounds_json(folder: CPath,
+                     ignore: Callable[[CPath], IgnoreRules] = None) -> CPath:
+    """
+    Find the sounds.json a folder stands for: its own, or for an
+    assets folder or the pack folder holding it, a namespace's
+    (minecraft's if it has one). The rest are found from there.
+    :param ignore: Gives the ignore rules of an assets folder (see
+    PackChecker.get_ignore_rules()); ignored namespaces are passed over
+    """
+    if (folder / "sounds.json").exists():
+        return folder / "sounds.json"
+
+    for assets_folder in [folder, folder / "assets"]:
+        names: list[str] = list_sounds_jsons(assets_folder)
+        if ignore is not None and len(names) > 0:
+            rules: IgnoreRules = ignore(assets_folder)
+            names = [n for n in names if not rules.excludes(n)]
+
+        found: list[CPath] = [CPath(n) for n in names]
+        for sounds_json in found:
+            if sounds_json.parent.name == "minecraft":
+                return sounds_json
+        if len(found) > 0:
+            return found[0]
+
+    return folder / "sounds.json"
+
+
+def load_events(sounds_json: CPath,
+                ignore: IgnoreRules = None) -> SoundEventHandler:
+    """
+    Parse the sounds.json of every namespace into one handler
+    :param ignore: Rules for what to leave out (see read_sounds_jsons())
+    """
+    return SoundEventHandler.combine(
+        sounds_json.parent.parent, read_sounds_jsons(sounds_json, ignore))
+
+
+def prefix_path(prefix: str, path: str) -> str:
+    """Join a path relative to an assets folder to the folder's prefix"""
+    return f"{prefix}/{path}" if prefix else path
+
+
+def group_by_pack(sounds_jsons: list[str]) -> dict[str, list[str]]:
+    """
+    Group the sounds.json files of an archive by the assets folder
+    holding them
+    :return: Assets folder prefixes ("" or ending in "/") mapped to
+    the sounds.json files beneath them
+    """
+    packs: dict[str, list[str]] = {}
+    for name in sounds_jsons:
+        prefix: str = "".join(p + "/" for p in name.split("/")[:-2])
+        packs.setdefault(prefix, []).append(name)
+
+    return packs
+
+
+def get_all_files(assets_folder: CPath, sizes: dict[str, int] = None,
+                  ignore: IgnoreRules = None):
+    """
+    :param sizes: If given, filled with the size of each file found,
+    by path, from the same stat that tells files from folders
+    :param ignore: Rules for files and folders to leave out; ignored
+    folders aren't walked at all
+    """
+    files: list[CPath] = []
+    pending: list[str] = [str(assets_folder)]
+
+    while len(pending) > 0:
+        found, symlinks, subdirectories = list_directory(pending.pop(), ignore)
+        pending.extend(subdirectories)
+
+        # Symlinks count when they lead to a file
+        for name in found + symlinks:
+            try:
+                info: os.stat_result = os.stat(name)
+            except OSError:
+                continue
+
+            if stat.S_ISREG(info.st_mode):
+                f = CPath(name)
+                files.append(f)
+                if sizes is not None:
+                    sizes[str(f)] = info.st_size
+
+    return files
+
+
+def get_linked(assets_folder: CPath, all_files: Iterable[CPath]) -> set[str]:
+    """
+    Follow the .ogg symlinks among the files of a scan
+    :return: Every path their chains reach, links in the middle of a
+    chain included (see SymlinkGraph.get_reachable())
+    """
+    return SymlinkGraph(assets_folder).get_reachable(
+        str(f) for f in all_files
+        if f.is_symbolic_link and f.suffix == ".ogg")
+
+
+def get_irrelevant_files(all_files: list[CPath]) -> list[CPath]:
+    """
+    Given the list of all files in the target path,
+    generate a list of all files that are not relevant
+    to the sound pack.
+    :param all_files: The list of files to search
+    :return: A list of paths to files that shouldn't be
+    in this folder structure
+    """
+
+    irrelevant_files: list[CPath] = [
+        f for f in all_files if f.suffix != ".ogg" and f.suffix != ".json"]
+
+    return sorted(irrelevant_files)  # noqa
+
+
+def get_orphaned_files(events: SoundEventHandler,
+                       ogg_files: list[CPath],
+                       linked: set[str] = None) -> list[CPath]:
+    """
+    Given a list of sound events and a list of ogg files,
+    generate a list of files that don't have a matching record
+    in the JSON file.
+    :param events: A dictionary of sound events
+    :param ogg_files: A list of ogg paths
+    :param linked: Paths reached through symlink chains, links in
+    the middle of a chain included (see SymlinkGraph.get_reachable())
+    :return: A list of files that don't have matching JSON
+    """
+    sounds: list[CPath] = events.get_sound_files()
+
+    links: list[CPath] = list(
+        set([k.target_path for k in ogg_files if k.is_symbolic_link]))
+
+    linked = linked or set()
+
+    orphans: list[CPath] = [
+        o for o in ogg_files
+        if o not in sounds and o not in links and str(o) not in linked]
+
+    orphaned_files: list[CPath] = orphans if len(orphans) > 0 else []
+
+    return sorted(orphaned_files)  # noqa
+
+
+def get_broken_links(
+        events: SoundEventHandler,
+        vanilla_events: SoundEventHandler,
+        ogg_files: list[CPath]) -> list[CPath]:
+    """
+    Given a list of JSON sound references and a list of the ogg files in
+    the folder structure, generate a list of the JSON references that
+    have no corresponding ogg file.
+    :param events: A dictionary of sound events
+    :param vanilla_events: A list of vanilla sound events
+    :param ogg_files: A list of ogg paths
+    :return: A list of JSON references that have no matching files
+    """
+
+    # Normal files
+    file_paths = [p for p in ogg_files if p.is_symbolic_link is False]
+
+    # Symlinks that can be resolved
+    file_paths.extend([
+        p for p in ogg_files if
+        p.is_symbolic_link is True and p.target_path is not None])
+
+    # JSON records that point to vanilla sounds
+    file_paths.extend(events.get_sound_files_in(vanilla_events))
+
+    # Based on the 3 categories, above, the following are bad
+    events_sounds = events.get_sound_files()
+    broken_links = [p for p in events_sounds if p not in file_paths]
+
+    return sorted(broken_links)  # noqa
+
+
+def get_invalid_file_names(ogg_files: list[CPath]) -> list[CPath]:
+    """
+    Given a list of paths, generate a list of paths that
+    violate Mojang's naming rules.
+    :param: ogg_files: A list of paths
+    :return: A list of the paths that fail Mojang's naming test
+    """
+
+    bad_names = [n for n in ogg_files if not VALID_NAME.match(str(n))]
+    return sorted(bad_names)  # noqa
+
+
+def check_pack(events: SoundEventHandler,
+               vanilla_events: SoundEventHandler,
+               all_files: list[CPath],
+               linked: set[str] = None) -> dict[str, list[CPath]]:
+    """
+    Run every check against the files of a pack. Each check only
+    sees the files that passed the checks before it.
+    :param events: The pack's sound events
+    :param vanilla_events: The vanilla sound events
+    :param all_files: All files in the pack's folder structure
+    :param linked: Paths reached through symlink chains
+    :return: A dictionary of findings by category, plus "sound_files",
+    the .ogg files that passed every check
+    """
+
+    # Collect all the files that don't belong in the pack
+    irrelevant_files: list[CPath] = get_irrelevant_files(all_files)
+
+    # Remove the irrelevant files from our list
+    ogg_files = [
+        f for f in all_files if f.suffix == ".ogg" and f not in irrelevant_files]
+
+    # Collect all the ogg files that have no JSON reference
+    orphaned_files: list[CPath] = get_orphaned_files(
+        events, ogg_files, linked)
+
+    # Remove the orphans from our list
+    ogg_files = [f for f in ogg_files if f not in orphaned_files]
+
+    # Collect all the JSON references that have no corresponding ogg file
+    broken_links: list[CPath] = (
+        get_broken_links(events, vanilla_events, ogg_files))
+
+    # Remove the orphans from our list
+    ogg_files = [f for f in ogg_files if f not in broken_links]
+
+    invalid_file_names: list = get_invalid_file_names(ogg_files)
+
+    # Remove the orphans from our list
+    ogg_files = [f for f in ogg_files if f not in invalid_file_names]
+
+    return {
+        "irrelevant_files": irrelevant_files,
+        "broken_links": broken_links,
+        "orphaned_files": orphaned_files,
+        "invalid_file_names": invalid_file_names,
+        "sound_files": ogg_files}
+
+
+def get_sound_counts(events: SoundEventHandler,
+                     ogg_files: list[CPath]) -> dict[str, int]:
+    """
+    Count the files each sound event plays
+    :return: Event names mapped to their file counts, events that
+    play no files are left out
+    """
+    counts: dict[str, int] = {}
+
+    for key in events.get_event_names():
+
+        paths = set(ogg_files).intersection(events.get_sound_files(key))
+
+        if len(paths) > 0:
+            counts[key] = len(paths)
+
+    return counts
+
+
+def get_missing_subtitles(events: SoundEventHandler, lang_index: LangIndex,
+                          namespace: str) -> dict[str, list[str]]:
+    """
+    Given sound events and an index of the pack's lang files, find
+    the subtitle keys each locale doesn't translate. Translations are
+    shared by every namespace whose events have subtitles.
+    :param events: The pack's sound events
+    :param lang_index: The pack's translation keys
+    :param namespace: The namespace holding sounds.json, for events
+    that weren't combined from several
+    :return: Locales mapped to their missing subtitle keys
+    """
+    dictionary: dict = events.get_event_dictionary()
+
+    namespaces: set[str] = set(
+        events.get_namespace(key) or namespace
+        for key, event in dictionary.items() if 'subtitle' in event)
+
+    return lang_index.get_missing_keys(
+        sorted(namespaces), get_subtitle_keys(events))
+
+
+# ------------------------------------------------------
+# Library API
+# ------------------------------------------------------
+
+# How many assets folders a VanillaIndex keeps vanilla events rooted at
+MAX_VANILLA_HANDLERS: int = 16
+
+
+class VanillaIndex:
+    """
+    The vanilla sound events, parsed once. A single instance can be
+    shared by any number of checkers (and threads), so repeated checks
+    in one process don't parse vanilla sounds.json again.
+
+    version identifies the content (a hash of it), so cached results
+    can tell which vanilla they were computed against. Indexes loaded
+    from a file only parse it the first time the events are needed.
+    Lazy parsing and the handlers kept for the last few assets folders
+    asked about are behind a lock, since checks in other threads ask
+    too.
+    """
+
+    def __init__(self, json_events: dict | None, version: str = None,
+                 data: bytes = None, sound_files: frozenset[str] = None):
+        """
+        :param sound_files: The sound files vanilla ships, relative to
+        the assets folder, if known. Otherwise every file the vanilla
+        events play is assumed to ship.
+        """
+        self._json_events: dict | None = json_events
+        self.sound_files: frozenset[str] | None = sound_files
+        self._data: bytes | None = data
+        self._raw_json: dict | None = None
+        self._subtitle_keys: frozenset[str] | None = None
+        self._keys: VanillaKeys | None = None
+        self._handlers: OrderedDict[CPath, SoundEventHandler] = (
+            OrderedDict())
+        self._lock: threading.Lock = threading.Lock()
+
+        self.version: str = version if version is not None else (
+            hashlib.sha1(json.dumps(json_events, sort_keys=True).encode())
+            .hexdigest())
+
+    @classmethod
+    def from_file(cls, path: CPath):
+        with open(path, "rb") as file:
+            data: bytes = file.read()
+
+        return cls(None, hashlib.sha1(data).hexdigest(), data)
+
+    @property
+    def raw_json(self) -> dict:
+        with self._lock:
+            if self._raw_json is None:
+                json_events = (
+                    self._json_events if self._json_events is not None
+                    else json.loads(self._data))
+
+                # Normalize the raw JSON once, so handlers built from
+                # it later have nothing left to rewrite
+                self._raw_json = SoundEventHandler(
+                    CPath(), json_events).raw_json
+                self._data = None
+
+        return self._raw_json
+
+    @property
+    def subtitle_keys(self) -> frozenset[str]:
+        """The subtitle keys vanilla uses, which the game translates"""
+
+        if self._subtitle_keys is None:
+            self._subtitle_keys = frozenset(
+                e['subtitle'] for e in self.raw_json.values()
+                if 'subtitle' in e)
+
+        return self._subtitle_keys
+
+    @property
+    def keys(self) -> VanillaKeys:
+        """The vanilla event names and sound file keys, as sets"""
+
+        if self._keys is None:
+            self._keys = VanillaKeys(self.raw_json, self.sound_files)
+
+        return self._keys
+
+    @classmethod
+    def from_launcher(cls, minecraft_dir: CPath, version: str = "latest",
+                      cache: CheckCache = None):
+        """
+        Load vanilla from the launcher's assets: the sounds.json of a
+        version's asset index, from the hashed object store, along with
+        the sound files it ships. No network access is needed, and with
+        a cache each index is only read once.
+        :param version: The asset index, e.g. "17", or "latest"
+        """
+        digest, data, sound_files = load_launcher_assets(
+            get_index_path(minecraft_dir, version), cache)
+
+        return cls(None, digest, data, sound_files)
+
+    @classmethod
+    def default(cls):
+        """Load the vanilla-sounds.json that ships next to spcheck.py"""
+        script_home_path: CPath = (
+            CPath(__file__).absolute().resolve().parent.parent)
+        return cls.from_file(script_home_path / "vanilla-sounds.json")
+
+    def get_events(self, assets_folder: CPath) -> SoundEventHandler:
+        """Return the vanilla events rooted at the given assets folder"""
+
+        with self._lock:
+            handler = self._handlers.get(assets_folder)
+            if handler is not None:
+                self._handlers.move_to_end(assets_folder)
+                return handler
+
+        # Built outside the lock; a thread racing for the same folder
+        # only does the work twice
+        handler = SoundEventHandler(assets_folder, self.raw_json)
+
+        with self._lock:
+            self._handlers[assets_folder] = handler
+            while len(self._handlers) > MAX_VANILLA_HANDLERS:
+                self._handlers.popitem(last=False)
+
+        return handler
+
+
+class CheckResult:
+    """
+    The outcome of checking one pack.
+
+    findings maps each file category ("irrelevant_files",
+    "broken_links", "orphaned_files", "invalid_file_names") to a sorted
+    list of paths, sound_files holds the .ogg files that passed every
+    check, sound_counts maps event names to the number of files they
+    play, missing_subtitles maps locales to the subtitle keys they
+    don't translate, invalid_sounds lists the sound entries with
+    invalid attributes, and timings maps each phase to the seconds it
+    took. get_found_categories() names "missing_subtitles" and
+    "invalid_sounds" as categories too when they aren't empty. events
+    is None for results replayed from a cache. file_sizes maps paths
+    to sizes when the scan recorded them.
+    """
+
+    CATEGORIES: list[str] = [
+        "irrelevant_files",
+        "broken_links",
+        "orphaned_files",
+        "invalid_file_names"]
+
+    def __init__(self, sounds_json: CPath, assets_folder: CPath,
+                 events: SoundEventHandler):
+        self.sounds_json: CPath = sounds_json
+        self.assets_folder: CPath = assets_folder
+        self.events: SoundEventHandler = events
+        self.findings: dict[str, list[CPath]] = {}
+        self._sound_files: list[CPath] = []
+        self._sound_file_names: list[str] | None = None
+        self.sound_counts: dict[str, int] = {}
+        self.missing_subtitles: dict[str, list[str]] = {}
+        self.invalid_sounds: list[InvalidSound] = []
+        self.file_sizes: dict[str, int] = {}
+        self.timings: dict[str, float] = {}
+
+    @property
+    def sound_files(self) -> list[CPath]:
+        # Results built from plain path names only pay for CPath
+        # objects (a stat each) if somebody asks for them
+        if self._sound_file_names is not None:
+            self._sound_files = [CPath(f) for f in self._sound_file_names]
+            self._sound_file_names = None
+
+        return self._sound_files
+
+    @sound_files.setter
+    def sound_files(self, files: list[CPath]):
+        self._sound_files = files
+        self._sound_file_names = None
+
+    def set_sound_file_names(self, names: list[str]):
+        self._sound_file_names = names
+
+    def get_sound_file_names(self) -> list[str]:
+        """The passing files as strings, without building CPaths"""
+
+        if self._sound_file_names is not None:
+            return self._sound_file_names
+
+        return [str(f) for f in self._sound_files]
+
+    def has_findings(self) -> bool:
+        return len(self.get_found_categories()) > 0
+
+    def get_found_categories(self) -> set[str]:
+        """Return the names of the categories that have findings"""
+
+        found: set[str] = set(c for c, f in self.findings.items() if len(f) > 0)
+
+        if len(self.missing_subtitles) > 0:
+            found.add("missing_subtitles")
+        if len(self.invalid_sounds) > 0:
+            found.add("invalid_sounds")
+
+        return found
+
+    def get_relative(self, category: str) -> list[str]:
+        """Return a category's paths relative to the assets folder"""
+        return [str(f.relative_to(self.assets_folder))
+                for f in self.findings[category]]
+
+    def to_dict(self) -> dict:
+        """A JSON-serializable version of the result"""
+
+        result: dict = {
+            "sounds_json": str(self.sounds_json),
+            "assets_folder": str(self.assets_folder)}
+
+        for category in self.findings:
+            result[category] = self.get_relative(category)
+
+        result["missing_subtitles"] = dict(self.missing_subtitles)
+        result["invalid_sounds"] = list(self.invalid_sounds)
+        result["sound_counts"] = dict(self.sound_counts)
+        result["timings"] = dict(self.timings)
+
+        return result
+
+
+class PackChecker:
+    """
+    Check sound packs in-process. Nothing is printed; every method
+    returns a CheckResult.
+
+        checker = PackChecker(VanillaIndex.default())
+        result = checker.check_path(CPath("pack/assets/minecraft"))
+
+    Packs can be checked from a sounds.json path (or its folder), a .zip
+    file, an in-memory listing of relative file paths, or any file system
+    backend (check_vfs()). check_archive() finds and checks every pack
+    in an archive and the ones nested in it.
+
+    Folders are walked without what their .spcheckignore rules, and
+    ignore_patterns, leave out (see IgnoreRules.from_folder()).
+    """
+
+    def __init__(self, vanilla: VanillaIndex = None,
+                 ignore_patterns: list[str] = None):
+        self.vanilla: VanillaIndex = (
+            vanilla if vanilla is not None else VanillaIndex.default())
+        self.ignore_patterns: list[str] = list(ignore_patterns or [])
+
+    def get_ignore_rules(self, assets_folder: CPath) -> IgnoreRules:
+        """The rules for what to leave out of a folder's walk"""
+        return IgnoreRules.from_folder(assets_folder, self.ignore_patterns)
+
+    def check_path(self, path: CPath) -> CheckResult:
+        """
+        Check a sounds.json file, the folder holding it, or an archive
+        (.zip or .jar) holding exactly one pack.
+        The sounds.json of every other namespace in the same assets
+        folder is checked along with it, in the same scan.
+        """
+
+        if path.suffix in ARCHIVE_SUFFIXES:
+            return self.check_zip(path)
+
+        if path.is_dir():
+            path = find_sounds_json(path, self.get_ignore_rules)
+
+        # The "trunk" of our tree
+        assets_folder: CPath = path.parent.parent
+
+        # A folder's links may lead anywhere the game can follow them
+        fs = RealFS(assets_folder, self.get_ignore_rules(assets_folder),
+                    follow_outside=True)
+
+        return self.check_vfs(fs, assets_folder=assets_folder,
+                              namespace=path.parent.name)
+
+    def check_zip(self, path: CPath) -> CheckResult:
+        """Check a zipped pack in place, without extracting it"""
+
+        with zipfile.ZipFile(path) as archive:
+            names: list[str] = [
+                n for n in archive.namelist() if not n.endswith("/")]
+
+            packs: dict[str, list[str]] = group_by_pack(
+                find_sounds_jsons(names))
+
+            if len(packs) != 1:
+                raise ValueError(
+                    f"Expected exactly one pack in {path}, "
+                    f"found {len(packs)}")
+
+            return self._check_archived(
+                ZipFS(archive), CPath(path), next(iter(packs)))
+
+    def check_archive(self, path: CPath,
+                      spill_threshold: int = SPILL_THRESHOLD
+                      ) -> list[CheckResult]:
+        """
+        Check every pack in an archive, including those in archives
+        nested inside it (resource packs shipped in mod jars, modpacks
+        zipped up whole), without extracting anything.
+        :param spill_threshold: Nested archives larger than this many
+        bytes are copied to a temporary file instead of memory
+        :return: A result for every assets folder holding a sounds.json
+        """
+        results: list[CheckResult] = []
+
+        for location, archive, names in iter_archives(path, spill_threshold):
+            packs = group_by_pack(find_sounds_jsons(names))
+            if len(packs) == 0:
+                continue
+
+            fs = ZipFS(archive)
+            for prefix in packs:
+                results.append(self._check_archived(fs, location, prefix))
+
+        if len(results) == 0:
+            raise ValueError(f"No sounds.json found in {path}")
+
+        return results
+
+    def _check_archived(self, fs: ZipFS, location: CPath,
+                        prefix: str) -> CheckResult:
+        """
+        Check the assets folder of an open archive that starts with
+        prefix ("" or ending in "/")
+        """
+        # Everything is rooted beneath the archive itself, so results
+        # read like paths inside the archive
+        return self.check_vfs(
+            fs, prefix.rstrip("/"),
+            CPath(location, *prefix.split("/")[:-1]))
+
+    def check_vfs(self, fs: VFS, prefix: str = "",
+                  assets_folder: CPath = CPath("assets"),
+                  namespace: str = None) -> CheckResult:
+        """
+        Check the assets folder of any file system backend. Every file
+        system call of the check goes through fs.
+
+        Links are followed within the backend only: one leading out of
+        it counts as dangling, like it will once the pack is zipped
+        (unless the backend sets follow_outside).
+        :param prefix: Where the assets folder is in the backend
+        ("" for its root, or "assets")
+        :param assets_folder: The root results are reported under
+        :param namespace: The namespace the result's sounds.json is in,
+        minecraft's (or the first) by default
+        """
+        start: float = time.perf_counter()
+
+        found, links = walk(fs, prefix)
+        inside: str = prefix_path(prefix, "")
+        files: list[str] = [f[len(inside):] for f in found]
+
+        def relative(path: str) -> str:
+            """A backend path relative to the assets folder"""
+            if path.startswith(inside):
+                return path[len(inside):]
+            return posixpath.relpath(path, prefix)
+
+        sizes: dict[str, int] = {
+            f: fs.stat(p)["size"] for f, p in zip(files, found)}
+
+        # Where each file's contents are read from, links followed
+        sources: dict[str, str] = dict(zip(files, found))
+
+        symlinks: dict[str, str] = {}
+        linked: set[str] = set()
+        for link in links:
+            target, hops = fs.follow(link)
+            info = fs.stat(target) if target is not None else None
+
+            # Like get_all_files(), only count links to files
+            if info is None or info["kind"] != "file":
+                continue
+
+            name: str = link[len(inside):]
+            symlinks[name] = relative(target)
+            sizes[name] = info["size"]
+            sources[name] = target
+
+            # Links in the middle of a chain keep their file alive too
+            if link.endswith(".ogg"):
+                linked.update(relative(h) for h in hops)
+
+        timings: dict[str, float] = {"scan": time.perf_counter() - start}
+        start = time.perf_counter()
+
+        namespaced_json: dict[str, dict] = {
+            f.split("/")[0]: json.loads(fs.read(source))
+            for f, source in sorted(sources.items())
+            if f.count("/") == 1 and f.endswith("/sounds.json")}
+
+        if len(namespaced_json) == 0:
+            raise ValueError(f"No sounds.json found in {assets_folder}")
+        if namespace is not None and namespace not in namespaced_json:
+            raise FileNotFoundError(
+                f"No sounds.json found in {CPath(assets_folder, namespace)}")
+
+        # Lang files are only worth reading for namespaces with subtitles
+        lang_folders: tuple[str, ...] = tuple(
+            f"{n}/lang/" for n, events in namespaced_json.items()
+            if any('subtitle' in e for e in events.values()))
+
+        lang_files: dict[str, bytes] = {
+            f: fs.read(source) for f, source in sources.items()
+            if f.startswith(lang_folders) and f.endswith(".json")
+            and f.count("/") == 2}
+
+        timings["parse"] = time.perf_counter() - start
+
+        return self.check_namespaces(
+            namespaced_json, files, symlinks, assets_folder, lang_files,
+            timings, linked, namespace, sizes)
+
+    def check_listing(self, json_events: dict, files: Iterable[str],
+                      symlinks: dict[str, str | None] = None,
+                      assets_folder: CPath = CPath("assets"),
+                      namespace: str = "minecraft",
+                      lang_files: dict[str, bytes] = None,
+                      timings: dict[str, float] = None,
+                      linked: Iterable[str] = None) -> CheckResult:
+        """
+        Check a pack that only exists as data.
+        :param json_events: The contents of sounds.json
+        :param files: Paths of regular files, relative to the assets folder
+        :param symlinks: Paths of symlinks, relative to the assets folder,
+        mapped to their target's relative path (None if it doesn't resolve)
+        :param assets_folder: The root the relative paths hang from
+        :param namespace: The namespace folder holding sounds.json
+        :param lang_files: Contents of lang files, by path relative to
+        the assets folder ("minecraft/lang/en_us.json")
+        :param timings: Phase timings measured so far by the caller
+        :param linked: Paths reached through symlink chains, relative to
+        the assets folder, links in the middle of a chain included. The
+        targets of symlinks count without being listed here.
+        """
+        return self.check_namespaces(
+            {namespace: json_events}, files, symlinks, assets_folder,
+            lang_files, timings, linked)
+
+    def check_namespaces(self, namespaced_json: dict[str, dict],
+                         files: Iterable[str],
+                         symlinks: dict[str, str | None] = None,
+                         assets_folder: CPath = CPath("assets"),
+                         lang_files: dict[str, bytes] = None,
+                         timings: dict[str, float] = None,
+                         linked: Iterable[str] = None,
+                         namespace: str = None,
+                         file_sizes: dict[str, int] = None) -> CheckResult:
+        """
+        Check a pack that only exists as data, with the sounds.json
+        of each of its namespaces. Takes the same arguments as
+        check_listing(), apart from namespaced_json and namespace.
+        :param namespaced_json: Namespaces mapped to their sounds.json
+        :param namespace: The namespace the result's sounds.json is in,
+        minecraft's (or the first) by default
+        :param file_sizes: Sizes of files and symlinks by path relative
+        to the assets folder, kept in the result
+        """
+        timings = dict(timings or {})
+        start: float = time.perf_counter()
+
+        events = SoundEventHandler.combine(assets_folder, namespaced_json)
+
+        # Paths stay strings until the checks need them, and the paths
+        # built for those take their link status from the listing
+        # rather than the file system
+        root: str = str(assets_folder)
+        paths: dict[str, CPath] = {}
+        for f in files:
+            paths[f] = CPath(root, f)
+            paths[f].is_symbolic_link = False
+
+        for link, target in (symlinks or {}).items():
+            paths[link] = CPath(root, link)
+            paths[link].is_symbolic_link = True
+            paths[link].target_path = (
+                CPath(root, target) if target is not None else None)
+
+        all_files: list[CPath] = list(paths.values())
+
+        timings["scan"] = timings.get("scan", 0.0) + (
+            time.perf_counter() - start)
+
+        def read(n: str) -> dict[str, bytes]:
+            lang_folder: str = n + "/lang/"
+            return {f[len(lang_folder):-len(".json")].lower(): data
+                    for f, data in (lang_files or {}).items()
+                    if f.startswith(lang_folder)}
+
+        if namespace is None:
+            namespace = (
+                "minecraft" if "minecraft" in namespaced_json
+                else min(namespaced_json, default=""))
+
+        sounds_json: CPath = CPath(assets_folder, namespace, "sounds.json")
+        result = self.check(
+            sounds_json, events, all_files, timings,
+            self.get_lang_index(assets_folder, read),
+            set(str(CPath(root, f)) for f in linked or []))
+        result.file_sizes = {
+            str(paths[f]): size for f, size in (file_sizes or {}).items()
+            if f in paths}
+
+        return result
+
+    def get_lang_index(self, assets_folder: CPath,
+                       read: Callable[[str], dict[str, bytes]] = None
+                       ) -> LangIndex:
+        """
+        Index a pack's lang files, with vanilla's subtitles counting as
+        translated
+        :param read: How to read a namespace's lang files, from the
+        lang folders under assets_folder by default
+        """
+        return LangIndex(assets_folder, self.vanilla.subtitle_keys, read)
+
+    def check(self, sounds_json: CPath, events: SoundEventHandler,
+              all_files: list[CPath],
+              timings: dict[str, float] = None,
+              lang_index: LangIndex = None,
+              linked: set[str] = None) -> CheckResult:
+        """
+        Run every check on events and files that are already loaded
+        :param linked: Paths reached through symlink chains, as found
+        by SymlinkGraph.get_reachable()
+        """
+
+        assets_folder: CPath = sounds_json.parent.parent
+        result = CheckResult(sounds_json, assets_folder, events)
+        result.invalid_sounds = events.invalid_sounds
+        result.timings.update(timings or {})
+
+        start: float = time.perf_counter()
+        vanilla_events = self.vanilla.get_events(assets_folder)
+        result.timings["vanilla"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        findings = check_pack(events, vanilla_events, all_files, linked)
+        result.sound_files = findings.pop("sound_files")
+        result.findings = findings
+        result.timings["checks"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result.sound_counts = get_sound_counts(events, result.sound_files)
+        result.timings["counts"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        if lang_index is None:
+            lang_index = self.get_lang_index(assets_folder)
+        result.missing_subtitles = get_missing_subtitles(
+            events, lang_index, sounds_json.parent.name)
+        result.timings["subtitles"] = time.perf_counter() - start
+
+        return result
@@ -0,0 +1,247 @@
+import json
+import os
+import zipfile
+import zlib
+from pathlib import Path
+from typing import Iterator, TypedDict, TypeVar
+
+from objects.archive_reader import ARCHIVE_SUFFIXES, find_sounds_jsons
+from objects.custom_path import CPath
+from objects.ignore_rules import IgnoreRules
+from objects.pack_checker import find_sounds_json, group_by_pack
+from objects.sound_event_handler import SoundEventHandler
+
+CHUNK_SIZE: int = 1024 * 1024
+
+T = TypeVar("T")
+
+
+class FileEntry(TypedDict):
+    size: int
+    # From the zip's metadata, None for files on disk
+    crc: int | None
+    # For files on disk, None for archive members
+    mtime_ns: int | None
+    path: str | None
+
+
+class EventEntry(TypedDict):
+    # The event as sorted JSON, with every sound written out as a dict
+    definition: str
+    sounds: int
+
+
+class PackDiff(TypedDict):
+    added_events: list[str]
+    removed_events: list[str]
+    modified_events: list[str]
+    # Events whose number of sounds changed: (before, after)
+    count_changes: dict[str, tuple[int, int]]
+    added_files: list[str]
+    removed_files: list[str]
+    modified_files: list[str]
+
+
+class PackIndex:
+    """
+    A pack's events ("namespace:event") and .ogg files (relative to
+    the assets folder), each as a list sorted by name, so two indexes
+    can be compared in one pass.
+    """
+
+    def __init__(self, events: list[tuple[str, EventEntry]],
+                 files: list[tuple[str, FileEntry]]):
+        self.events: list[tuple[str, EventEntry]] = events
+        self.files: list[tuple[str, FileEntry]] = files
+
+    @classmethod
+    def from_json(cls, namespaced_json: dict[str, dict],
+                  files: list[tuple[str, FileEntry]]):
+
+        events: list[tuple[str, EventEntry]] = []
+        for namespace, json_events in namespaced_json.items():
+            handler = SoundEventHandler(Path(), json_events)
+            for key, event in handler.get_event_dictionary().items():
+                events.append((f"{namespace}:{key}", EventEntry(
+                    definition=json.dumps(event, sort_keys=True),
+                    sounds=len(event['sounds']))))
+
+        return cls(sorted(events, key=lambda e: e[0]),
+                   sorted(files, key=lambda f: f[0]))
+
+    @classmethod
+    def from_path(cls, path: CPath, ignore_patterns: list[str] = ()):
+        """
+        Index a pack folder, or a .zip or .jar without extracting it
+        :param ignore_patterns: More ignore rules for folders, on top of
+        their .spcheckignore files
+        """
+
+        if path.suffix in ARCHIVE_SUFFIXES:
+            return cls._from_archive(path)
+
+        sounds_json: CPath = (
+            find_sounds_json(path) if path.is_dir() else path)
+        if not sounds_json.is_file():
+            raise ValueError(f"No sounds.json found in {path}")
+
+        assets_folder: str = str(sounds_json.parent.parent)
+        ignore = IgnoreRules.from_folder(
+            sounds_json.parent.parent, ignore_patterns)
+
+        namespaced_json: dict[str, dict] = {}
+        files: list[tuple[str, FileEntry]] = []
+        pending: list[str] = [assets_folder]
+
+        while len(pending) > 0:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    is_folder: bool = entry.is_dir(follow_symlinks=False)
+                    if ignore and ignore.is_ignored(entry.path, is_folder):
+                        continue
+
+                    if is_folder:
+                        pending.append(entry.path)
+                        continue
+
+                    relative: str = entry.path[len(assets_folder) + 1:]
+
+                    if relative.count("/") == 1 and entry.name == "sounds.json":
+                        with open(entry.path, "rb") as file:
+                            namespaced_json[relative.split("/")[0]] = (
+                                json.load(file))
+
+                    if not entry.name.endswith(".ogg"):
+                        continue
+
+                    # Follows symlinks, like the checks do
+                    try:
+                        info: os.stat_result = entry.stat()
+                    except OSError:
+                        continue
+
+                    files.append((relative, FileEntry(
+                        size=info.st_size, crc=None,
+                        mtime_ns=info.st_mtime_ns, path=entry.path)))
+
+        return cls.from_json(namespaced_json, files)
+
+    @classmethod
+    def _from_archive(cls, path: CPath):
+
+        with zipfile.ZipFile(path) as archive:
+            infos: list[zipfile.ZipInfo] = [
+                i for i in archive.infolist() if not i.is_dir()]
+
+            packs: dict[str, list[str]] = group_by_pack(
+                find_sounds_jsons([i.filename for i in infos]))
+            if len(packs) != 1:
+                raise ValueError(
+                    f"Expected exactly one pack in {path}, "
+                    f"found {len(packs)}")
+
+            prefix, sounds_jsons = next(iter(packs.items()))
+
+            namespaced_json: dict[str, dict] = {
+                n.split("/")[-2]: json.loads(archive.read(n))
+                for n in sounds_jsons}
+
+        # Size and CRC come from the central directory, nothing is read
+        files: list[tuple[str, FileEntry]] = [
+            (i.filename[len(prefix):], FileEntry(
+                size=i.file_size, crc=i.CRC, mtime_ns=None, path=None))
+            for i in infos
+            if i.filename.startswith(prefix) and i.filename.endswith(".ogg")]
+
+        return cls.from_json(namespaced_json, files)
+
+
+def merge_sorted(old: list[tuple[str, T]], new: list[tuple[str, T]]
+                 ) -> Iterator[tuple[str, T | None, T | None]]:
+    """
+    Walk two lists sorted by key side by side
+    :return: Each key with its value on either side, None where the
+    key is missing
+    """
+    i: int = 0
+    j: int = 0
+
+    while i < len(old) and j < len(new):
+        if old[i][0] == new[j][0]:
+            yield old[i][0], old[i][1], new[j][1]
+            i += 1
+            j += 1
+        elif old[i][0] < new[j][0]:
+            yield old[i][0], old[i][1], None
+            i += 1
+        else:
+            yield new[j][0], None, new[j][1]
+            j += 1
+
+    for key, value in old[i:]:
+        yield key, value, None
+    for key, value in new[j:]:
+        yield key, None, value
+
+
+def diff_packs(old: PackIndex, new: PackIndex) -> PackDiff:
+    """Compare two indexes of a pack, before and after"""
+
+    diff = PackDiff(
+        added_events=[], removed_events=[], modified_events=[],
+        count_changes={}, added_files=[], removed_files=[],
+        modified_files=[])
+
+    for key, before, after in merge_sorted(old.events, new.events):
+        if before is None:
+            diff['added_events'].append(key)
+        elif after is None:
+            diff['removed_events'].append(key)
+        elif before['definition'] != after['definition']:
+            diff['modified_events'].append(key)
+            if before['sounds'] != after['sounds']:
+                diff['count_changes'][key] = (
+                    before['sounds'], after['sounds'])
+
+    for key, before, after in merge_sorted(old.files, new.files):
+        if before is None:
+            diff['added_files'].append(key)
+        elif after is None:
+            diff['removed_files'].append(key)
+        elif file_changed(before, after):
+            diff['modified_files'].append(key)
+
+    return diff
+
+
+def file_changed(before: FileEntry, after: FileEntry) -> bool:
+    """
+    Tell whether a file changed from its size, then its CRC. Archive
+    members carry their CRC; files on disk with the same size and
+    mtime are taken as unchanged, and are only read otherwise.
+    """
+    if before['size'] != after['size']:
+        return True
+
+    if before['crc'] is not None and after['crc'] is not None:
+        return before['crc'] != after['crc']
+
+    if before['mtime_ns'] is not None and (
+            before['mtime_ns'] == after['mtime_ns']):
+        return False
+
+    return get_crc(before) != get_crc(after)
+
+
+def get_crc(entry: FileEntry) -> int:
+    """The CRC of a file, reading it from disk if it isn't known"""
+
+    if entry['crc'] is not None:
+        return entry['crc']
+
+    crc: int = 0
+    with open(entry['path'], "rb") as file:
+        while chunk := file.read(CHUNK_SIZE):
+            crc = zlib.crc32(chunk, crc)
+
+    return crc
@@ -0,0 +1,303 @@
+import json
+import os
+import zipfile
+from pathlib import Path
+
+from objects.ignore_rules import IgnoreRules
+from objects.scan_index import list_directory
+from objects.sound_event_handler import (
+    SoundEvent, SoundEventHandler, get_sound_key)
+
+
+class Pack:
+    """
+    One layer of a resource pack stack: the sound events defined by
+    each namespace's sounds.json, and the sound files the pack ships.
+    Event keys are namespaced ("minecraft:entity.cow.ambient") and file
+    keys are relative to the assets folder ("minecraft/sounds/x.ogg").
+    """
+
+    def __init__(self, name: str,
+                 events: dict[str, SoundEvent],
+                 files: set[str]):
+        self.name: str = name
+        self.events: dict[str, SoundEvent] = events
+        self.files: set[str] = files
+
+    @classmethod
+    def from_json(cls, name: str, namespaced_json: dict[str, dict],
+                  files: set[str] = None):
+        """
+        Build a pack from raw sounds.json contents keyed by namespace.
+        If no files are given, the pack is assumed to ship every file
+        its events refer to (this is how vanilla is represented).
+        """
+        events: dict[str, SoundEvent] = {}
+
+        for namespace, json_events in namespaced_json.items():
+            handler = SoundEventHandler(Path(), json_events)
+            for key, event in handler.get_event_dictionary().items():
+                events[namespace + ":" + key] = event
+
+        if files is None:
+            files = set(
+                get_sound_key(s['name'])
+                for e in events.values() for s in e['sounds']
+                if s.get('type', "file") == "file")
+
+        return cls(name, events, files)
+
+    @classmethod
+    def from_path(cls, path: Path, name: str = None,
+                  ignore_patterns: list[str] = ()):
+        """
+        Load a pack from a directory or a .zip file
+        :param name: What to call the pack, its file name by default
+        :param ignore_patterns: More ignore rules for folders, on top of
+        their .spcheckignore files
+        """
+        name = name if name is not None else path.name
+
+        if path.suffix == ".zip":
+            return cls._from_zip(path, name)
+
+        assets_folder: Path = find_assets_folder(path)
+
+        namespaced_json: dict[str, dict] = {}
+        for sounds_json in sorted(assets_folder.glob("*/sounds.json")):
+            with open(sounds_json, "r") as file:
+                namespaced_json[sounds_json.parent.name] = json.load(file)
+
+        ignore = IgnoreRules.from_folder(assets_folder, ignore_patterns)
+        cut: int = len(str(assets_folder)) + 1
+
+        files: set[str] = set()
+        pending: list[str] = [str(assets_folder)]
+        while len(pending) > 0:
+            found, symlinks, subdirectories = list_directory(
+                pending.pop(), ignore)
+            pending.extend(subdirectories)
+
+            # Symlinks count when they lead to a file
+            files.update(f[cut:] for f in found if f.endswith(".ogg"))
+            files.update(
+                s[cut:] for s in symlinks
+                if s.endswith(".ogg") and os.path.isfile(s))
+
+        return cls.from_json(name, namespaced_json, files)
+
+    @classmethod
+    def _from_zip(cls, path: Path, name: str):
+        """Read a zipped pack straight from its listing, no extraction"""
+
+        with zipfile.ZipFile(path) as archive:
+            names: list[str] = archive.namelist()
+
+            # The assets folder is whatever contains <namespace>/sounds.json
+            sounds_jsons: list[str] = sorted(
+                (n for n in names if n.endswith("/sounds.json")),
+                key=lambda n: n.count("/"))
+
+            if len(sounds_jsons) == 0:
+                return cls(name, {}, set())
+
+            prefix: str = "/".join(sounds_jsons[0].split("/")[:-2])
+            prefix = prefix + "/" if prefix != "" else ""
+
+            namespaced_json: dict[str, dict] = {}
+            for sounds_json in sounds_jsons:
+                namespace, _, rest = sounds_json[len(prefix):].partition("/")
+                if sounds_json.startswith(prefix) and rest == "sounds.json":
+                    namespaced_json[namespace] = json.loads(
+                        archive.read(sounds_json))
+
+            files: set[str] = set(
+                n[len(prefix):] for n in names
+                if n.startswith(prefix) and n.endswith(".ogg"))
+
+        return cls.from_json(name, namespaced_json, files)
+
+
+def find_assets_folder(path: Path) -> Path:
+    """
+    Accept a pack root, its assets folder, a namespace folder or a
+    sounds.json file, and return the assets folder
+    """
+    if path.is_file():
+        return path.parent.parent
+
+    if (path / "assets").is_dir():
+        return path / "assets"
+
+    if (path / "sounds.json").is_file():
+        return path.parent
+
+    return path
+
+
+class PackStack:
+    """
+    Simulate the merged sound event table the game builds from a stack
+    of resource packs. Packs are ordered lowest priority first, the same
+    order they are applied over vanilla (and the order of options.txt).
+
+    For every event, each pack that defines it either appends its sounds
+    to what the packs below it produced, or throws that away when it
+    sets "replace": true. Each sound file is supplied by the highest
+    pack that ships it.
+
+    The merged table is maintained incrementally: adding, removing or
+    moving a pack only recomputes the events and files that the packs
+    whose position changed define.
+    """
+
+    def __init__(self, vanilla: Pack = None):
+        self.vanilla: Pack = vanilla
+        self.packs: list[Pack] = []
+
+        self.events: dict[str, SoundEvent] = {}
+        self.event_sources: dict[str, list[str]] = {}
+        self.providers: dict[str, str] = {}
+
+        if vanilla is not None:
+            self._refresh([vanilla])
+
+    def _layers(self) -> list[Pack]:
+        """All layers, lowest priority first"""
+        return ([self.vanilla] if self.vanilla else []) + self.packs
+
+    def get_pack_names(self) -> list[str]:
+        return [p.name for p in self.packs]
+
+    def add_pack(self, pack: Pack, position: int = None):
+        """Add a pack on top of the stack, or at the given position"""
+
+        if pack.name in self.get_pack_names():
+            raise ValueError(f"Pack {pack.name} is already in the stack")
+
+        position = len(self.packs) if position is None else position
+        self.packs.insert(position, pack)
+
+        # Packs above the new one keep their relative order, so their
+        # events only change where they overlap with the new pack
+        self._refresh([pack])
+
+    def remove_pack(self, name: str):
+        pack: Pack = self._get_pack(name)
+        self.packs.remove(pack)
+        self._refresh([pack])
+
+    def move_pack(self, name: str, position: int):
+        """Move a pack to a new position, lowest priority being 0"""
+
+        pack: Pack = self._get_pack(name)
+        old_position: int = self.packs.index(pack)
+        self.packs.remove(pack)
+        self.packs.insert(position, pack)
+
+        # Only the packs between the old and new positions changed order
+        low, high = sorted([old_position, position])
+        self._refresh(self.packs[low:high + 1])
+
+    def _get_pack(self, name: str) -> Pack:
+        for pack in self.packs:
+            if pack.name == name:
+                return pack
+
+        raise ValueError(f"Pack {name} is not in the stack")
+
+    def _refresh(self, touched: list[Pack]):
+        """Recompute the events and files defined by the touched packs"""
+
+        event_keys: set[str] = set()
+        file_keys: set[str] = set()
+        for pack in touched:
+            event_keys.update(pack.events)
+            file_keys.update(pack.files)
+
+        layers: list[Pack] = self._layers()
+
+        for key in event_keys:
+            self._merge_event(key, layers)
+
+        for key in file_keys:
+            self.providers.pop(key, None)
+            for pack in reversed(layers):
+                if key in pack.files:
+                    self.providers[key] = pack.name
+                    break
+
+    def _merge_event(self, key: str, layers: list[Pack]):
+        """Fold one event over every layer that defines it"""
+
+        merged: SoundEvent | None = None
+        sources: list[str] = []
+
+        for pack in layers:
+            event: SoundEvent = pack.events.get(key)
+            if event is None:
+                continue
+
+            if merged is None or event.get('replace', False):
+                merged = SoundEvent(sounds=[])
+                sources = []
+
+            merged['sounds'] = merged['sounds'] + event['sounds']
+            sources.append(pack.name)
+
+            # Appending keeps the subtitle of the packs below, if any
+            if 'subtitle' in event and 'subtitle' not in merged:
+                merged['subtitle'] = event['subtitle']
+
+        if merged is None:
+            self.events.pop(key, None)
+            self.event_sources.pop(key, None)
+            return
+
+        self.events[key] = merged
+        self.event_sources[key] = sources
+
+    def get_event_names(self) -> list[str]:
+        return sorted(self.events)
+
+    def get_effective_files(self, key: str) -> list[tuple[str, str | None]]:
+        """
+        Return each sound file the merged event plays, paired with the
+        name of the pack that supplies it (None if nothing does)
+        """
+        files: list[str] = sorted(
+            get_sound_key(s['name']) for s in self.events[key]['sounds']
+            if s.get('type', "file") == "file")
+
+        return [(f, self.providers.get(f)) for f in files]
+
+    def get_empty_events(self) -> list[str]:
+        """Events whose merged sound list ended up empty"""
+        return [k for k in self.get_event_names()
+                if len(self.events[k]['sounds']) == 0]
+
+    def get_broken_events(self) -> dict[str, list[str]]:
+        """
+        Events that play sound files (or refer to other events)
+        that no layer of the stack supplies
+        """
+        broken: dict[str, list[str]] = {}
+
+        for key in self.get_event_names():
+            missing: list[str] = [
+                f for f, provider in self.get_effective_files(key)
+                if provider is None]
+
+            missing.extend(
+                s['name'] for s in self.events[key]['sounds']
+                if s.get('type') == "event" and
+                _namespaced(s['name']) not in self.events)
+
+            if len(missing) > 0:
+                broken[key] = sorted(missing)
+
+        return broken
+
+
+def _namespaced(name: str) -> str:
+    return name if ":" in name else "minecraft:" + name
@@ -0,0 +1,137 @@
+import difflib
+from collections import Counter
+
+from objects.custom_path import CPath
+
+# How many of the paths sharing the most trigrams get a closer look
+CANDIDATES: int = 10
+
+# How alike a path and its suggestion must be, from 0 to 1
+MIN_SIMILARITY: float = 0.6
+
+# A file of the same name in another folder was probably moved there
+MOVED_BONUS: float = 0.2
+
+# Orphans are often what a broken link meant, so they rank higher
+ORPHAN_BONUS: float = 0.1
+
+
+def get_trigrams(text: str) -> set[str]:
+    """The trigrams of a path, padded so short names have some"""
+
+    padded: str = f"  {text.lower()} "
+    return set(padded[n:n + 3] for n in range(len(padded) - 2))
+
+
+class TrigramIndex:
+    """
+    An index of paths by the trigrams they contain, to find the paths
+    most like a given one without comparing it to all of them.
+
+    A lookup counts shared trigrams over the postings of the query's
+    rarer trigrams only: those in a large share of the paths (from a
+    folder most files are in) would make each lookup touch most of the
+    index, and tell little apart anyway. Only the few paths sharing the
+    most trigrams are then compared in full.
+    """
+
+    def __init__(self, paths: list[str]):
+        self.paths: list[str] = paths
+        self.postings: dict[str, list[int]] = {}
+
+        for n, path in enumerate(paths):
+            for gram in get_trigrams(path):
+                self.postings.setdefault(gram, []).append(n)
+
+        # Trigrams in more postings than this are too common to count
+        self.common: int = max(64, len(paths) // 50)
+
+    def get_candidates(self, text: str,
+                       limit: int = CANDIDATES) -> list[int]:
+        """
+        :return: The positions in paths of the paths sharing the most
+        trigrams with text
+        """
+
+        postings: list[list[int]] = sorted(
+            (self.postings[g] for g in get_trigrams(text)
+             if g in self.postings), key=len)
+
+        rare: list[list[int]] = [p for p in postings if len(p) <= self.common]
+
+        # Nothing but common trigrams: the rarest of them will have to do
+        if len(rare) == 0:
+            rare = postings[:1]
+
+        counts: Counter = Counter()
+        for posting in rare:
+            counts.update(posting)
+
+        return [n for n, _ in counts.most_common(limit)]
+
+
+def get_sound_name(path: str) -> str:
+    """
+    The part of a path relative to the assets folder that tells sounds
+    apart: "minecraft/sounds/mob/cow/say1.ogg" -> "mob/cow/say1"
+    """
+    _, _, name = path.partition("/")
+    return name.removeprefix("sounds/").removesuffix(".ogg")
+
+
+def suggest_files(broken_links: list[CPath], files: list[CPath],
+                  orphans: list[CPath],
+                  assets_folder: CPath) -> dict[CPath, CPath]:
+    """
+    Find the existing file each broken link most likely meant: a typo
+    away from it, or the same file moved to another folder.
+    :param broken_links: The paths sounds.json refers to, which are missing
+    :param files: The .ogg files that exist
+    :param orphans: The files nothing refers to, which are preferred
+    :return: Broken links mapped to their suggestion, links nothing is
+    similar enough to are left out
+    """
+    if len(broken_links) == 0 or len(files) == 0:
+        return {}
+
+    prefix: str = str(assets_folder) + "/"
+
+    # Every path shares its namespace's "sounds/", so only the rest is
+    # indexed and compared
+    existing: list[CPath] = sorted(set(files), key=str)
+    names: list[str] = [
+        get_sound_name(str(f).removeprefix(prefix)) for f in existing]
+    orphaned: set[CPath] = set(orphans)
+
+    index = TrigramIndex(names)
+    suggestions: dict[CPath, CPath] = {}
+
+    # The matcher keeps what it learned about the second sequence, so
+    # the broken path goes there and only the candidates change
+    matcher = difflib.SequenceMatcher(autojunk=False)
+
+    for link in sorted(set(broken_links), key=str):
+        wanted: str = get_sound_name(str(link).removeprefix(prefix))
+        wanted_file: str = wanted.rsplit("/", 1)[-1]
+        matcher.set_seq2(wanted)
+
+        # The highest score, then the first path in order
+        best: tuple[float, int] | None = None
+
+        for n in index.get_candidates(wanted):
+            matcher.set_seq1(names[n])
+            score: float = matcher.ratio()
+            if names[n].rsplit("/", 1)[-1] == wanted_file:
+                score += MOVED_BONUS
+            if score < MIN_SIMILARITY:
+                continue
+
+            if existing[n] in orphaned:
+                score += ORPHAN_BONUS
+            if best is None or (-score, n) < best:
+                best = (-score, n)
+
+        if best is not None:
+            suggestions[link] = existing[best[1]]
+
+    return suggestions
@@ -0,0 +1,372 @@
+import glob
+import hashlib
+import json
+import os
+import sqlite3
+from typing import Collection
+
+from objects.check_cache import default_cache_dir
+from objects.custom_path import CPath
+from objects.ignore_rules import IgnoreRules
+from objects.pack_checker import CheckResult, VanillaIndex, load_events
+from objects.sound_event_handler import (
+    SoundEventHandler, get_sound_key, is_prefixed)
+from objects.symlink_graph import SymlinkGraph
+
+# Bump whenever the tables change; older databases are rebuilt
+SCHEMA_VERSION: int = 2
+
+# The searched column leads each index, so the planner can't mistake
+# one for the other by the pack they share
+SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS packs (
+    id INTEGER PRIMARY KEY,
+    sounds_json TEXT UNIQUE,
+    assets_folder TEXT,
+    signature TEXT);
+CREATE TABLE IF NOT EXISTS events (
+    pack INTEGER, name TEXT, digest TEXT, PRIMARY KEY (pack, name));
+CREATE TABLE IF NOT EXISTS refs (
+    pack INTEGER, event TEXT, kind TEXT, target TEXT);
+CREATE INDEX IF NOT EXISTS refs_by_target ON refs (target, pack);
+CREATE INDEX IF NOT EXISTS refs_by_event ON refs (event, pack);
+CREATE TABLE IF NOT EXISTS links (
+    pack INTEGER, link TEXT, reached TEXT);
+CREATE INDEX IF NOT EXISTS links_by_reached ON links (reached, pack);
+CREATE INDEX IF NOT EXISTS links_by_link ON links (link, pack);
+CREATE TABLE IF NOT EXISTS vanilla (file TEXT PRIMARY KEY);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+def default_index_path(cache_dir: CPath = None) -> str:
+    """Where the index lives, next to the check cache"""
+
+    return os.path.join(
+        str(cache_dir if cache_dir is not None else default_cache_dir()),
+        "references.sqlite")
+
+
+def get_event_key(name: str, namespaces: Collection[str] = ()) -> str:
+    """
+    The name an event reference ({"type": "event"}) goes by among the
+    events of a pack, which leave the namespace off when it's
+    minecraft, or the pack's only one (see is_prefixed())
+    :param namespaces: The namespaces of the pack's sounds.json files
+    """
+    namespace, _, key = (
+        name.partition(":") if ":" in name else ("minecraft", "", name))
+
+    return name if is_prefixed(namespace, namespaces) else key
+
+
+class ReferenceIndex:
+    """
+    Which events play which files, kept in an SQLite database so
+    either direction can be looked up without reading sounds.json.
+
+    update() files a checked pack's references, event by event: each
+    event is stored with a digest of its definition, and only events
+    whose digest changed have their references replaced. When none of
+    the pack's sounds.json files changed size or mtime, the events
+    aren't even looked at. The symlinks the check found are stored
+    with every path their chains pass through, and vanilla's sound
+    files with the vanilla version they came from.
+
+    Files are stored relative to the assets folder
+    ("minecraft/sounds/mob/cow/say1.ogg").
+    """
+
+    def __init__(self, path: str):
+        directory: str = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.connection = sqlite3.connect(path)
+
+        version: int = self.connection.execute(
+            "PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            self._drop()
+
+        self.connection.executescript(SCHEMA)
+        self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def _drop(self):
+        tables: list[str] = [row[0] for row in self.connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'")]
+        for table in tables:
+            self.connection.execute(f"DROP TABLE {table}")
+
+    def update(self, result: CheckResult, vanilla: VanillaIndex,
+               ignore: IgnoreRules = None) -> dict:
+        """
+        Bring a pack's entries up to date with a check of it
+        :param ignore: The rules the check left files out by, for
+        results replayed from a cache that must read sounds.json again
+        :return: How much had to be rewritten
+        """
+        sounds_json: str = str(CPath(result.sounds_json).absolute())
+        assets_folder: str = str(CPath(result.assets_folder).absolute())
+        signature: str = _signature(result.sounds_json)
+
+        with self.connection:
+            row = self.connection.execute(
+                "SELECT id, signature FROM packs WHERE sounds_json = ?",
+                (sounds_json,)).fetchone()
+
+            if row is None:
+                pack: int = self.connection.execute(
+                    "INSERT INTO packs (sounds_json, assets_folder) "
+                    "VALUES (?, ?)", (sounds_json, assets_folder)).lastrowid
+            else:
+                pack = row[0]
+
+            events: int = 0
+            if row is None or row[1] != signature:
+                # Results replayed from a cache come without events
+                events = self._update_events(
+                    pack, result.events if result.events is not None
+                    else load_events(result.sounds_json, ignore))
+                self.connection.execute(
+                    "UPDATE packs SET signature = ?, assets_folder = ? "
+                    "WHERE id = ?", (signature, assets_folder, pack))
+
+            links: int = self._update_links(pack, result)
+            vanilla_updated: bool = self._update_vanilla(vanilla)
+
+        return {"events_updated": events, "links": links,
+                "vanilla_updated": vanilla_updated}
+
+    def _update_events(self, pack: int, events: SoundEventHandler) -> int:
+
+        stored: dict[str, str] = dict(self.connection.execute(
+            "SELECT name, digest FROM events WHERE pack = ?", (pack,)))
+
+        dictionary: dict = events.get_event_dictionary()
+        digests: dict[str, str] = {
+            key: hashlib.sha1(
+                json.dumps(event, sort_keys=True).encode()).hexdigest()
+            for key, event in dictionary.items()}
+
+        changed: list[str] = [
+            k for k, d in digests.items() if stored.get(k) != d]
+        removed: list[str] = [k for k in stored if k not in digests]
+
+        # New events have nothing to delete
+        self.connection.executemany(
+            "DELETE FROM refs WHERE pack = ? AND event = ?",
+            ((pack, k) for k in changed + removed if k in stored))
+        self.connection.executemany(
+            "DELETE FROM events WHERE pack = ? AND name = ?",
+            ((pack, k) for k in removed))
+
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO events (pack, name, digest) "
+            "VALUES (?, ?, ?)", ((pack, k, digests[k]) for k in changed))
+
+        self.connection.executemany(
+            "INSERT INTO refs (pack, event, kind, target) VALUES (?, ?, ?, ?)",
+            ((pack, key, *_get_target(sound, events.namespaces))
+             for key in changed for sound in dictionary[key]['sounds']))
+
+        return len(changed) + len(removed)
+
+    def _update_links(self, pack: int, result: CheckResult) -> int:
+        """Replace the pack's symlinks, which are few, all at once"""
+
+        assets_folder: str = str(result.assets_folder)
+        real_folder: str = os.path.realpath(assets_folder)
+        graph = SymlinkGraph(result.assets_folder)
+
+        rows: list[tuple[int, str, str]] = []
+        for f in (result.sound_files + result.findings["orphaned_files"]
+                  + result.findings["invalid_file_names"]):
+            if not f.is_symbolic_link:
+                continue
+
+            link: str = _relative(str(f), assets_folder)
+            graph.resolve(str(f))
+            rows.extend((pack, link, _relative(hop, real_folder))
+                        for hop in graph.get_hops(str(f)))
+
+        self.connection.execute("DELETE FROM links WHERE pack = ?", (pack,))
+        self.connection.executemany(
+            "INSERT INTO links (pack, link, reached) VALUES (?, ?, ?)", rows)
+
+        return len(rows)
+
+    def _update_vanilla(self, vanilla: VanillaIndex) -> bool:
+        """Replace vanilla's files only when its version changed"""
+
+        version: str = str(vanilla.version)
+        row = self.connection.execute(
+            "SELECT value FROM meta WHERE key = 'vanilla'").fetchone()
+        if row is not None and row[0] == version:
+            return False
+
+        self.connection.execute("DELETE FROM vanilla")
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO vanilla (file) VALUES (?)",
+            ((f,) for f in vanilla.keys.sound_keys))
+        self.connection.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('vanilla', ?)",
+            (version,))
+
+        return True
+
+    def find_pack(self, path: CPath) -> tuple[int, str] | None:
+        """
+        :param path: A pack's sounds.json, or any path inside an
+        indexed assets folder
+        :return: The pack's id and assets folder, None if not indexed
+        """
+        absolute: str = str(CPath(path).absolute())
+
+        row = self.connection.execute(
+            "SELECT id, assets_folder FROM packs WHERE sounds_json = ?",
+            (absolute,)).fetchone()
+        if row is not None:
+            return row
+
+        # The deepest assets folder holding the path
+        for pack, assets_folder in self.connection.execute(
+                "SELECT id, assets_folder FROM packs "
+                "ORDER BY length(assets_folder) DESC"):
+            if absolute.startswith(assets_folder + "/"):
+                return pack, assets_folder
+
+        return None
+
+    def get_events_playing(self, pack: int, file: str
+                           ) -> list[tuple[str, str | None]]:
+        """
+        Every event that plays a file: directly, through a symlink
+        whose chain reaches it, or through an event that plays it
+        :param file: The file, relative to the assets folder
+        :return: Event names, each with what it goes through (a symlink
+        or an event), sorted
+        """
+        found: dict[str, str | None] = {}
+
+        # The file itself, then the links leading to it
+        targets: list[tuple[str, str | None]] = [(file, None)] + [
+            (link, link) for (link,) in self.connection.execute(
+                "SELECT DISTINCT link FROM links "
+                "WHERE pack = ? AND reached = ?", (pack, file))]
+
+        pending: list[tuple[str, str, str | None]] = [
+            ("file", target, via) for target, via in targets]
+
+        while len(pending) > 0:
+            kind, target, via = pending.pop()
+            for (event,) in self.connection.execute(
+                    "SELECT DISTINCT event FROM refs "
+                    "WHERE pack = ? AND kind = ? AND target = ?",
+                    (pack, kind, target)):
+                if event in found:
+                    continue
+                found[event] = via
+                pending.append(("event", event, via or event))
+
+        return sorted(found.items())
+
+    def get_files_played(self, pack: int, event: str
+                         ) -> list[tuple[str, str]]:
+        """
+        Every file an event plays, events it plays included
+        :return: Files relative to the assets folder, each with where it
+        comes from: "pack", "symlink -> <end of chain>", "vanilla" or
+        "missing", sorted
+        """
+        assets_folder: str = self.connection.execute(
+            "SELECT assets_folder FROM packs WHERE id = ?",
+            (pack,)).fetchone()[0]
+
+        files: set[str] = set()
+        seen: set[str] = set()
+        pending: list[str] = [event]
+
+        while len(pending) > 0:
+            current: str = pending.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+
+            for kind, target in self.connection.execute(
+                    "SELECT kind, target FROM refs "
+                    "WHERE pack = ? AND event = ?", (pack, current)):
+                if kind == "event":
+                    pending.append(target)
+                else:
+                    files.add(target)
+
+        return [(f, self._get_origin(pack, assets_folder, f))
+                for f in sorted(files)]
+
+    def _get_origin(self, pack: int, assets_folder: str, file: str) -> str:
+
+        hops: list[str] = [reached for (reached,) in self.connection.execute(
+            "SELECT reached FROM links WHERE pack = ? AND link = ? "
+            "ORDER BY rowid", (pack, file))]
+        if len(hops) > 0:
+            return f"symlink -> {hops[-1]}"
+
+        # Whether the file is still there is the file system's to say
+        if os.path.isfile(os.path.join(assets_folder, file)):
+            return "pack"
+
+        return "vanilla" if self.is_vanilla(file) else "missing"
+
+    def has_event(self, pack: int, event: str) -> bool:
+        return self.connection.execute(
+            "SELECT 1 FROM events WHERE pack = ? AND name = ?",
+            (pack, event)).fetchone() is not None
+
+    def is_vanilla(self, file: str) -> bool:
+        return self.connection.execute(
+            "SELECT 1 FROM vanilla WHERE file = ?",
+            (file,)).fetchone() is not None
+
+
+def _get_target(sound: dict, namespaces: Collection[str]
+                ) -> tuple[str, str]:
+    """The kind of a sound entry and what it refers to, as stored"""
+
+    if sound.get('type', "file") == "event":
+        return "event", get_event_key(sound['name'], namespaces)
+
+    return "file", get_sound_key(sound['name'])
+
+
+def _relative(path: str, folder: str) -> str:
+    prefix: str = folder + "/"
+    return path[len(prefix):] if path.startswith(prefix) else path
+
+
+def _signature(sounds_json: CPath) -> str:
+    """
+    The size and mtime of every namespace's sounds.json, which the
+    pack's events come from
+    """
+    pattern: str = os.path.join(
+        glob.escape(str(sounds_json.parent.parent)), "*", "sounds.json")
+
+    signature: list[str] = []
+    for path in sorted(set(glob.glob(pattern)) | {str(sounds_json)}):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        signature.append(f"{path}\0{stat.st_size}\0{stat.st_mtime_ns}")
+
+    return "\n".join(signature)
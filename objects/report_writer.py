@@ -0,0 +1,339 @@
+import io
+import sys
+from typing import Iterable, TextIO
+
+from objects.custom_path import CPath
+
+RED: str = "\033[31m"
+GREEN: str = "\033[32m"
+DEFAULT: str = "\033[0m"
+
+
+class _Directory:
+    """A node of the findings trie"""
+
+    def __init__(self):
+        self.children: dict[str, _Directory] = {}
+        self.files: list[str] = []
+        self.count: int = 0
+
+
+class ReportWriter:
+    """
+    Render the report into one buffer and write it with a single call,
+    so the time spent doesn't depend on how the terminal flushes.
+
+    Long lists of findings are collapsed by directory: each directory is
+    shown once with the number of findings beneath it and the first few
+    file names as examples. With full=True every path is listed.
+    """
+
+    def __init__(self, stream: TextIO = None, full: bool = False,
+                 examples: int = 3, collapse_above: int = 20):
+        self.stream: TextIO | None = stream
+        self.full: bool = full
+        self.examples: int = examples
+        self.collapse_above: int = collapse_above
+        self.buffer: io.StringIO = io.StringIO()
+
+    def write(self, text: str):
+        self.buffer.write(text)
+
+    def flush(self):
+        """Write everything rendered so far to the stream in one go"""
+
+        # Look sys.stdout up late, so redirection still applies
+        stream: TextIO = self.stream if self.stream is not None else sys.stdout
+        stream.write(self.buffer.getvalue())
+        stream.flush()
+
+        self.buffer = io.StringIO()
+
+    def warnings(self, message: str, files: list[CPath],
+                 assets_folder: CPath):
+
+        if len(files) == 0:
+            return
+
+        names: list[str] = relative_names(files, assets_folder)
+
+        if self.full or len(names) <= self.collapse_above:
+            self.write(f"{RED}\n{message}{DEFAULT}\n")
+            self.write("".join(f" .../{n}\n" for n in names))
+            return
+
+        self.write(f"{RED}\n{message} ({len(names)}){DEFAULT}\n")
+        self._write_directory(_build_trie(names), "", 0)
+
+    def spooled_warnings(self, message: str, paths: Iterable[str],
+                         count: int, assets_folder: CPath):
+        """
+        List sorted paths given one at a time, for findings too many to
+        hold. Collapsing by directory would need them all at once, so
+        past collapse_above only the count of the rest is given.
+        Written out as it goes.
+        """
+        if count == 0:
+            return
+
+        prefix: str = str(assets_folder) + "/"
+        shown: int = count if self.full else min(count, self.collapse_above)
+
+        self.write(f"{RED}\n{message} ({count}){DEFAULT}\n")
+
+        for n, path in enumerate(paths):
+            if n == shown:
+                break
+            self.write(f" .../{path.removeprefix(prefix)}\n")
+            if n % 1000 == 999:
+                self.flush()
+
+        if count > shown:
+            self.write(f" ... and {count - shown} more\n")
+
+        self.flush()
+
+    def finding(self, label: str, path: str, assets_folder: CPath):
+        """
+        Write one finding out the moment it is found, for checks that
+        report as they go rather than at the end
+        """
+        prefix: str = str(assets_folder) + "/"
+        self.write(f"{RED}{label}:{DEFAULT} .../{path.removeprefix(prefix)}\n")
+        self.flush()
+
+    def suggestions(self, message: str, suggestions: dict[CPath, CPath],
+                    assets_folder: CPath):
+        """List broken paths, each with the file it probably meant"""
+
+        if len(suggestions) == 0:
+            return
+
+        links: list[str] = relative_names(list(suggestions), assets_folder)
+        files: list[str] = relative_names(
+            list(suggestions.values()), assets_folder)
+
+        self.write(f"{GREEN}\n{message}{DEFAULT}\n")
+        self.write("".join(
+            f" .../{link}\n     -> .../{file}\n"
+            for link, file in zip(links, files)))
+
+    def _write_directory(self, node: _Directory, path: str, depth: int):
+
+        # Fold chains of single subdirectories into one line
+        while len(node.children) == 1 and len(node.files) == 0:
+            name, node = next(iter(node.children.items()))
+            path += name + "/"
+
+        indent: str = "    " * depth
+        self.write(f"{indent} .../{path} ({node.count})\n")
+
+        shown: list[str] = node.files[:self.examples]
+        self.write("".join(f"{indent}     {n}\n" for n in shown))
+
+        hidden: int = len(node.files) - len(shown)
+        if hidden > 0:
+            self.write(f"{indent}     ... and {hidden} more\n")
+
+        for name in sorted(node.children):
+            self._write_directory(node.children[name], name + "/", depth + 1)
+
+    def missing_keys(self, message: str, missing: dict[str, list[str]]):
+        """List missing translation keys under each locale"""
+
+        if len(missing) == 0:
+            return
+
+        total: int = sum(len(keys) for keys in missing.values())
+        collapse: bool = not self.full and total > self.collapse_above
+
+        self.write(f"{RED}\n{message}{DEFAULT}\n")
+
+        for locale, keys in missing.items():
+            shown: list[str] = keys[:self.examples] if collapse else keys
+
+            self.write(f" {locale} ({len(keys)})\n")
+            self.write("".join(f"     {k}\n" for k in shown))
+
+            hidden: int = len(keys) - len(shown)
+            if hidden > 0:
+                self.write(f"     ... and {hidden} more\n")
+
+    def invalid_sounds(self, message: str, invalid: list[dict]):
+        """List sound entries by event and index, with their problems"""
+
+        if len(invalid) == 0:
+            return
+
+        shown: list[dict] = (
+            invalid if self.full or len(invalid) <= self.collapse_above
+            else invalid[:self.collapse_above])
+
+        self.write(f"{RED}\n{message}{DEFAULT}\n")
+        for entry in shown:
+            self.write(f" {entry['event']} [{entry['index']}]: "
+                       f"{', '.join(entry['problems'])}\n")
+
+        hidden: int = len(invalid) - len(shown)
+        if hidden > 0:
+            self.write(f" ... and {hidden} more\n")
+
+    def corrupt_members(self, message: str, members: list[dict]):
+        """List damaged archive members with what's wrong with them"""
+
+        if len(members) == 0:
+            return
+
+        self.write(f"{RED}\n{message}{DEFAULT}\n")
+        self.write("".join(
+            f" .../{m['name']}: {m['problem']}\n" for m in members))
+
+    def stream_advice(self, report: dict):
+        """List sounds to stream, oversized preloads and preload totals"""
+
+        self.advice(
+            "The following sounds are long enough that they should "
+            "stream, but don't:", report['should_stream'])
+
+        self.advice(
+            "The following preloaded sounds take more memory "
+            "than the budget:", report['large_preloads'])
+
+        if len(report['preload_memory']) == 0:
+            return
+
+        self.write(f"{GREEN}\nPreloaded memory by namespace:{DEFAULT}\n")
+        self.write("".join(f" {n}: {format_size(m)}\n"
+                           for n, m in report['preload_memory'].items()))
+
+    def advice(self, message: str, sounds: list[dict]):
+
+        if len(sounds) == 0:
+            return
+
+        shown: list[dict] = (
+            sounds if self.full or len(sounds) <= self.collapse_above
+            else sounds[:self.collapse_above])
+
+        self.write(f"{RED}\n{message}{DEFAULT}\n")
+        for sound in shown:
+            seconds: str = (f"{sound['seconds']:.1f} s, "
+                            if sound['seconds'] is not None else "")
+            self.write(f" {sound['event']} -> {sound['name']} "
+                       f"({seconds}{format_size(sound['memory'])})\n")
+
+        hidden: int = len(sounds) - len(shown)
+        if hidden > 0:
+            self.write(f" ... and {hidden} more\n")
+
+    def overrides(self, report: dict):
+        """List what a pack changes about vanilla, with totals"""
+
+        self.names("The following files replace vanilla sounds:",
+                   report['overridden_files'])
+        self.names("The following events replace vanilla's:",
+                   report['replaced_events'])
+        self.names("The following events add sounds to vanilla's:",
+                   report['extended_events'])
+        self.names("The following vanilla sounds are played as they are:",
+                   report['vanilla_references'])
+
+        if len(report['totals']) == 0:
+            return
+
+        self.write(f"{GREEN}\nVanilla overrides by namespace:{DEFAULT}\n")
+        for namespace, counts in report['totals'].items():
+            self.write(
+                f" {namespace}: {counts['overridden_files']} files, "
+                f"{counts['replaced_events']} replaced events, "
+                f"{counts['extended_events']} extended events, "
+                f"{counts['vanilla_references']} vanilla sounds\n")
+
+    def pack_diff(self, diff: dict):
+        """List what changed between two versions of a pack"""
+
+        self.names("Added events:", diff['added_events'])
+        self.names("Removed events:", diff['removed_events'])
+        self.names("Modified events:", diff['modified_events'])
+
+        if len(diff['count_changes']) > 0:
+            self.write(f"{GREEN}\nSound counts that changed:{DEFAULT}\n")
+            self.write("".join(
+                f" {key}: {before} -> {after}\n"
+                for key, (before, after) in diff['count_changes'].items()))
+
+        self.names("Added files:", diff['added_files'])
+        self.names("Removed files:", diff['removed_files'])
+        self.names("Modified files:", diff['modified_files'])
+
+        if not any(len(v) > 0 for v in diff.values()):
+            self.write(f"{GREEN}\nNo differences{DEFAULT}\n")
+
+    def names(self, message: str, names: list[str]):
+        """List names as they are, the first few unless full"""
+
+        if len(names) == 0:
+            return
+
+        shown: list[str] = (
+            names if self.full or len(names) <= self.collapse_above
+            else names[:self.collapse_above])
+
+        self.write(f"{GREEN}\n{message} ({len(names)}){DEFAULT}\n")
+        self.write("".join(f" {n}\n" for n in shown))
+
+        hidden: int = len(names) - len(shown)
+        if hidden > 0:
+            self.write(f" ... and {hidden} more\n")
+
+    def sound_counts(self, sound_counts: dict[str, int]):
+
+        # Sound count / summary
+        bar = "-" * 56
+        self.write(f"{GREEN}\n{bar}\nSound count:\n\n")
+
+        self.write("".join(f"{k} -> {c}\n" for k, c in sound_counts.items()))
+
+        count: int = sum(sound_counts.values())
+        self.write(f"\nTotal sounds: {count}\n{bar}{DEFAULT}\n")
+
+
+def format_size(size: int) -> str:
+    """Render a byte count for people, e.g. 1.5 MiB"""
+
+    for unit in ["B", "KiB", "MiB"]:
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+    return f"{size:.1f} GiB"
+
+
+def relative_names(files: list[CPath], assets_folder: CPath) -> list[str]:
+    """
+    Paths relative to the assets folder, by cutting off the common
+    prefix instead of calling relative_to() for each file
+    """
+    prefix: str = str(assets_folder) + "/"
+    cut: int = len(prefix)
+
+    return [s[cut:] if s.startswith(prefix) else str(f.relative_to(assets_folder))
+            for f, s in ((f, str(f)) for f in files)]
+
+
+def _build_trie(names: list[str]) -> _Directory:
+
+    root = _Directory()
+
+    for name in names:
+        *folders, file = name.split("/")
+
+        node: _Directory = root
+        node.count += 1
+        for folder in folders:
+            node = node.children.setdefault(folder, _Directory())
+            node.count += 1
+
+        node.files.append(file)
+
+    return root
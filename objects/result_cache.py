@@ -0,0 +1,191 @@
+import glob
+import hashlib
+import os
+import time
+
+from objects.archive_reader import ARCHIVE_SUFFIXES
+from objects.check_cache import CACHE_VERSION, CheckCache
+from objects.custom_path import CPath
+from objects.ignore_rules import IgnoreRules
+from objects.pack_checker import (
+    CheckResult, PackChecker, find_sounds_json, list_sounds_jsons)
+
+
+def tree_manifest(assets_folder: CPath, ignore: IgnoreRules = None
+                  ) -> dict[str, tuple[int, int]]:
+    """
+    The mtime and size of every directory under the assets folder.
+    Adding, removing or renaming anything changes its directory, so
+    a matching manifest means the same names are still there.
+    :param ignore: Rules for directories to leave out, as checks do
+    """
+    manifest: dict[str, tuple[int, int]] = {}
+    pending: list[str] = [str(assets_folder)]
+
+    while len(pending) > 0:
+        directory: str = pending.pop()
+        stat = os.stat(directory)
+        manifest[directory] = (stat.st_mtime_ns, stat.st_size)
+
+        with os.scandir(directory) as entries:
+            pending.extend(
+                e.path for e in entries if e.is_dir(follow_symlinks=False)
+                and not (ignore and ignore.is_ignored(e.path, True)))
+
+    return manifest
+
+
+class ResultCache:
+    """
+    Replay the result of an earlier run when nothing it depends on
+    has changed.
+
+    Results are filed under a fingerprint of the sounds.json contents,
+    the vanilla index version and a manifest of directory (and lang
+    file) mtimes and sizes. Checking whether a result can be replayed
+    only takes reading sounds.json and one stat per entry in the
+    manifest the previous run left behind; nothing is parsed or listed.
+
+    Symlinks that point outside the assets folder aren't covered, so a
+    target disappearing out there goes unnoticed until the tree changes.
+    """
+
+    def __init__(self, checker=None, cache: CheckCache = None):
+        """
+        :param checker: What computes results on a cache miss: a
+        PackChecker, or anything else with check_path() that has one
+        as its .checker (like IncrementalChecker)
+        """
+        self.checker = checker if checker is not None else PackChecker()
+        self.cache: CheckCache = cache if cache is not None else CheckCache()
+        self.last_hit: bool = False
+
+    def _vanilla_version(self) -> str:
+        checker = getattr(self.checker, "checker", self.checker)
+        return checker.vanilla.version
+
+    def _ignore_rules(self, assets_folder: CPath) -> IgnoreRules:
+        checker = getattr(self.checker, "checker", self.checker)
+        return checker.get_ignore_rules(assets_folder)
+
+    def check_path(self, path: CPath) -> CheckResult:
+
+        start: float = time.perf_counter()
+
+        if path.suffix not in ARCHIVE_SUFFIXES and path.is_dir():
+            path = find_sounds_json(path, self._ignore_rules)
+
+        key: str = str(CPath(path).absolute())
+
+        # Fingerprint the current state from the previous run's manifest
+        directories: list[str] | None = self.cache.load("manifests", key)
+        if directories is not None:
+            fingerprint = self._fingerprint(path, directories)
+            stored: dict | None = (
+                self.cache.load("results", fingerprint)
+                if fingerprint is not None else None)
+
+            if stored is not None:
+                self.last_hit = True
+                result: CheckResult = _thaw(stored)
+                result.timings = {"cache": time.perf_counter() - start}
+                return result
+
+        self.last_hit = False
+
+        # Take the manifest before checking, so anything that changes
+        # while the check runs makes the next fingerprint differ
+        directories = self._directories(path)
+        fingerprint = self._fingerprint(path, directories)
+
+        result: CheckResult = self.checker.check_path(path)
+
+        if fingerprint is not None:
+            self.cache.store("results", fingerprint, _freeze(result))
+            self.cache.store("manifests", key, directories)
+
+        return result
+
+    def _directories(self, path: CPath) -> list[str]:
+        if path.suffix in ARCHIVE_SUFFIXES:
+            return [str(path)]
+
+        assets_folder: CPath = path.parent.parent
+
+        # Lang files are edited in place, which leaves their directory's
+        # mtime alone, so they're fingerprinted one by one
+        lang_files: list[str] = glob.glob(
+            os.path.join(glob.escape(str(assets_folder)), "*", "lang", "*.json"))
+
+        return (sorted(tree_manifest(
+                    assets_folder, self._ignore_rules(assets_folder)))
+                + sorted(lang_files))
+
+    def _fingerprint(self, path: CPath, directories: list[str]) -> str | None:
+        """None if anything in the manifest no longer exists"""
+
+        digest = hashlib.sha256()
+        digest.update(f"{CACHE_VERSION}\0{self._vanilla_version()}\0".encode())
+
+        try:
+            # For an archive, its size and mtime (in the manifest) stand in
+            if path.suffix not in ARCHIVE_SUFFIXES:
+                # Ignore files are edited in place too
+                ignore: IgnoreRules = self._ignore_rules(path.parent.parent)
+                digest.update("\n".join(ignore.patterns).encode() + b"\0")
+
+                for sounds_json in _sounds_jsons(path, ignore):
+                    with open(sounds_json, "rb") as file:
+                        digest.update(f"{sounds_json}\0".encode())
+                        digest.update(hashlib.sha256(file.read()).digest())
+
+            for directory in directories:
+                stat = os.stat(directory)
+                digest.update(
+                    f"{directory}\0{stat.st_mtime_ns}\0{stat.st_size}\0"
+                    .encode())
+        except OSError:
+            return None
+
+        return digest.hexdigest()
+
+
+def _sounds_jsons(path: CPath, ignore: IgnoreRules) -> list[str]:
+    """The sounds.json of every namespace checked along with path"""
+
+    return sorted(
+        set(list_sounds_jsons(path.parent.parent, ignore)) | {str(path)})
+
+
+def _freeze(result: CheckResult) -> dict:
+    """The parts of a result worth replaying, as plain data"""
+
+    return {
+        "sounds_json": str(result.sounds_json),
+        "assets_folder": str(result.assets_folder),
+        "findings": {c: [str(f) for f in files]
+                     for c, files in result.findings.items()},
+        "sound_files": result.get_sound_file_names(),
+        "sound_counts": result.sound_counts,
+        "missing_subtitles": result.missing_subtitles,
+        "invalid_sounds": result.invalid_sounds,
+        "file_sizes": result.file_sizes}
+
+
+def _thaw(stored: dict) -> CheckResult:
+    """
+    Rebuild a stored result. Replayed results have no events, since
+    sounds.json was never parsed
+    """
+    result = CheckResult(
+        CPath(stored["sounds_json"]), CPath(stored["assets_folder"]), None)
+
+    result.findings = {c: [CPath(f) for f in files]
+                       for c, files in stored["findings"].items()}
+    result.set_sound_file_names(stored["sound_files"])
+    result.sound_counts = stored["sound_counts"]
+    result.missing_subtitles = stored["missing_subtitles"]
+    result.invalid_sounds = stored["invalid_sounds"]
+    result.file_sizes = stored["file_sizes"]
+
+    return result
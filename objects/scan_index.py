@@ -0,0 +1,109 @@
+import os
+
+from objects.custom_path import CPath
+from objects.ignore_rules import IgnoreRules
+
+
+class ScanIndex:
+    """
+    A reusable listing of every file under an assets folder.
+
+    The first refresh walks the whole tree. Later refreshes only stat
+    each directory and list the ones whose mtime changed, since adding,
+    removing or renaming an entry always touches its parent directory.
+    Symlinks are re-resolved on every refresh, because their targets
+    can disappear without their own directory changing. Ignored
+    directories are never listed.
+    """
+
+    def __init__(self, assets_folder: CPath, ignore: IgnoreRules = None):
+        self.assets_folder: CPath = assets_folder
+        self.ignore: IgnoreRules | None = ignore
+
+        # directory -> (mtime_ns, files, symlinks, subdirectories)
+        self.directories: dict[str, tuple[int, list, list, list]] = {}
+
+    def refresh(self) -> int:
+        """
+        Bring the index up to date with the file system
+        :return: The number of directories that had to be listed again
+        """
+        seen: set[str] = set()
+        relisted: int = 0
+        pending: list[str] = [str(self.assets_folder)]
+
+        while len(pending) > 0:
+            directory: str = pending.pop()
+            seen.add(directory)
+
+            try:
+                mtime: int = os.stat(directory).st_mtime_ns
+            except FileNotFoundError:
+                continue
+
+            cached = self.directories.get(directory)
+            if cached is None or cached[0] != mtime:
+                cached = (mtime, *list_directory(directory, self.ignore))
+                self.directories[directory] = cached
+                relisted += 1
+
+            pending.extend(cached[3])
+
+        # Forget directories that have been removed
+        for directory in set(self.directories) - seen:
+            del self.directories[directory]
+
+        return relisted
+
+    def get_all_files(self) -> list[CPath]:
+        """
+        Return the same files get_all_files() would find: regular files,
+        plus symlinks that currently resolve to a file
+        """
+        regular, symlinks = self.get_file_names()
+        return [CPath(f) for f in regular + symlinks]
+
+    def get_file_names(self) -> tuple[list[str], list[str]]:
+        """
+        Return the paths of regular files, and of the symlinks that
+        currently resolve to a file, without building CPath objects
+        """
+        regular: list[str] = []
+        symlinks: list[str] = []
+
+        for _, files, links, _ in self.directories.values():
+            regular.extend(files)
+            symlinks.extend(s for s in links if os.path.isfile(s))
+
+        return regular, symlinks
+
+
+def list_directory(directory: str, ignore: IgnoreRules = None
+                   ) -> tuple[list[str], list[str], list[str]]:
+    """
+    List one directory without descending into it
+    :param ignore: Rules for entries to leave out, ignored
+    subdirectories included, so walks never descend into them
+    :return: The paths of regular files, of symlinks (not followed)
+    and of subdirectories
+    """
+    files: list[str] = []
+    symlinks: list[str] = []
+    subdirectories: list[str] = []
+
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subdirectories.append(entry.path)
+            elif entry.is_symlink():
+                symlinks.append(entry.path)
+            elif entry.is_file():
+                files.append(entry.path)
+
+    if ignore:
+        files = [f for f in files if not ignore.is_ignored(f)]
+        symlinks = [s for s in symlinks if not ignore.is_ignored(s)]
+        subdirectories = [
+            d for d in subdirectories if not ignore.is_ignored(d, True)]
+
+    return files, symlinks, subdirectories
@@ -1,5 +1,5 @@
 import json
-from typing import TypedDict, NotRequired
+from typing import Callable, Collection, TypedDict, NotRequired
 
 from pathlib import Path
 
@@ -23,26 +23,125 @@ class SoundEvent(TypedDict):
     subtitle: NotRequired[str]
 
 
+class InvalidSound(TypedDict):
+    event: str
+    index: int
+    problems: list[str]
+
+
+# The attributes a Sound may have: the JSON types allowed for each, a
+# test of the value (None if any value of those types will do), and
+# the legal values as shown to the user
+SOUND_SCHEMA: dict[str, tuple[tuple[type, ...], Callable | None, str]] = {
+    "name": ((str,), lambda v: len(v) > 0, "a non-empty string"),
+    "volume": ((float, int), lambda v: 0 <= v <= 1, "a number from 0 to 1"),
+    "pitch": ((float, int), lambda v: v > 0, "a number above 0"),
+    "weight": ((int,), lambda v: v >= 1, "a whole number above 0"),
+    "stream": ((bool,), None, "true or false"),
+    "attenuation_distance": (
+        (int,), lambda v: v >= 0, "a whole number, 0 or more"),
+    "preload": ((bool,), None, "true or false"),
+    "type": ((str,), lambda v: v in ("file", "event"), '"file" or "event"'),
+}
+
+
+def compile_sound_validator(
+        schema: dict[str, tuple[tuple[type, ...], Callable | None, str]]
+        ) -> Callable[[dict], list[str]]:
+    """
+    Turn a schema table into one function that validates a Sound.
+    Types are matched exactly (JSON true is not a number), so each
+    attribute costs a dictionary lookup, a set lookup and its test.
+    :return: A function returning the problems with a Sound, if any
+    """
+    checks: dict[str, tuple[frozenset[type], Callable | None, str]] = {
+        key: (frozenset(types), test, legal)
+        for key, (types, test, legal) in schema.items()}
+
+    def validate(sound: dict) -> list[str]:
+        problems: list[str] = []
+
+        for key, value in sound.items():
+            check = checks.get(key)
+            if check is None:
+                problems.append(f"unknown attribute '{key}'")
+            elif type(value) not in check[0] or (
+                    check[1] is not None and not check[1](value)):
+                problems.append(
+                    f"'{key}' must be {check[2]}, got {json.dumps(value)}")
+
+        if "name" not in sound:
+            problems.append("'name' is missing")
+
+        return problems
+
+    return validate
+
+
+validate_sound: Callable[[dict], list[str]] = (
+    compile_sound_validator(SOUND_SCHEMA))
+
+
 class SoundEventHandler:
     def __init__(self, root_folder: Path, json_events: dict):
         self.root_folder: Path = root_folder
         self.raw_json: dict = json_events
+        self.invalid_sounds: list[InvalidSound] = []
+        self.event_namespaces: dict[str, str] = {}
+        self.namespaces: list[str] = []
         self.events: dict[str, SoundEvent] = self._parse_json()
 
+    @classmethod
+    def combine(cls, root_folder: Path, namespaced_json: dict[str, dict]):
+        """
+        Create one handler for the sounds.json of several namespaces.
+        With more than one, events outside the minecraft namespace are
+        named "namespace:event", the way the game writes them, so names
+        can't clash. event_namespaces maps each event to its namespace,
+        and namespaces lists the namespaces combined.
+        :param namespaced_json: Namespaces mapped to their sounds.json
+        """
+        json_events: dict = {}
+        namespaces: dict[str, str] = {}
+        for namespace, events in namespaced_json.items():
+            prefixed: bool = is_prefixed(namespace, namespaced_json)
+            for key, event in events.items():
+                if prefixed:
+                    key = f"{namespace}:{key}"
+                json_events[key] = event
+                namespaces[key] = namespace
+
+        handler = cls(root_folder, json_events)
+        handler.event_namespaces = namespaces
+        handler.namespaces = list(namespaced_json)
+
+        return handler
+
     def _parse_json(self) -> dict[str, SoundEvent]:
         """
         Mojang's vanilla sounds.json contains many examples of lists of
         plain strings instead of dictionaries like our Sound object.
         We want to convert those here, so we don't need to expect
         to handle them later on.
+
+        The attributes of every Sound are validated on the way. Invalid
+        ones are recorded in invalid_sounds, and those without a usable
+        name are left out, since they can't refer to anything.
         """
         json_dict: dict[str, SoundEvent] = self.raw_json
         for key, event in json_dict.items():
 
             new_sounds: list[Sound] = []
-            for sound in event['sounds']:
+            for index, sound in enumerate(event['sounds']):
 
                 if isinstance(sound, dict):
+                    problems: list[str] = validate_sound(sound)
+                    if len(problems) > 0:
+                        self.invalid_sounds.append(InvalidSound(
+                            event=key, index=index, problems=problems))
+                        if not isinstance(sound.get('name'), str):
+                            continue
+
                     new_sounds.append(sound)
                     continue
 
@@ -62,6 +161,10 @@ class SoundEventHandler:
         """Return the events as a dictionary of SoundEvent"""
         return self.events
 
+    def get_namespace(self, event_name: str) -> str | None:
+        """Return the namespace an event came from, if it was combined"""
+        return self.event_namespaces.get(event_name)
+
     def get_event_names(self):
         """Return a simple list of all the sound event names"""
         return sorted(list(self.events.keys()))
@@ -103,20 +206,31 @@ class SoundEventHandler:
     def get_sound_path(self, sound_name: str) -> Path:
         """Create a real path from a sound record"""
 
-        namespace: str = "minecraft"
-        sound_path: str = sound_name
+        # Start with the root folder, then the namespaced relative path
+        return Path(str(self.root_folder) + "/" + get_sound_key(sound_name))
+
+
+def is_prefixed(namespace: str, namespaces: Collection[str]) -> bool:
+    """
+    Whether a namespace's events are named "namespace:event" among
+    the events combined from the given namespaces (see combine())
+    """
+    return namespace != "minecraft" and set(namespaces) != {namespace}
+
+
+def get_sound_key(sound_name: str) -> str:
+    """
+    Create the path of a sound record relative to the assets folder,
+    e.g. "namespace:path/to/file" -> "namespace/sounds/path/to/file.ogg"
+    """
 
-        if ":" in sound_name:
-            parts: list[str] = sound_name.split(":")
-            namespace: str = parts[0]
-            sound_path: str = parts[1]
+    namespace: str = "minecraft"
+    sound_path: str = sound_name
 
-        # Start with the root folder, unless sound_path already has it
-        result: str = (
-                str(self.root_folder) + "/" +
-                namespace +
-                "/sounds/" +
-                sound_path + ".ogg")
+    if ":" in sound_name:
+        parts: list[str] = sound_name.split(":")
+        namespace: str = parts[0]
+        sound_path: str = parts[1]
 
-        # Finish it off with the suffix
-        return Path(result)
+    # Finish it off with the suffix
+    return namespace + "/sounds/" + sound_path + ".ogg"
@@ -0,0 +1,180 @@
+import os
+import struct
+from typing import Callable, TypedDict
+
+from objects.sound_event_handler import SoundEventHandler, get_sound_key
+
+# Sounds longer than this many seconds should stream
+STREAM_SECONDS: float = 10.0
+
+# Preloaded sounds taking more memory than this, decoded, are flagged
+PRELOAD_BUDGET: int = 1024 * 1024
+
+# Vorbis never gets below this many bytes per second of sound, so
+# smaller files can't be long enough to stream and aren't opened
+MIN_BYTES_PER_SECOND: int = 1000
+
+# The game decodes to 16 bit samples
+BYTES_PER_SAMPLE: int = 2
+
+# An Ogg page header, up to its segment count
+PAGE_HEADER = struct.Struct("<4sBBqIIIB")
+CAPTURE_PATTERN: bytes = b"OggS"
+
+# The first page holds the identification header, the last one the
+# final granule position; this much of either end is read
+HEAD_SIZE: int = 512
+TAIL_SIZE: int = 64 * 1024
+
+
+class OggInfo(TypedDict):
+    channels: int
+    sample_rate: int
+    samples: int
+
+
+class SoundAdvice(TypedDict):
+    event: str
+    name: str
+    size: int
+    seconds: float | None
+    memory: int
+
+
+class StreamReport(TypedDict):
+    should_stream: list[SoundAdvice]
+    large_preloads: list[SoundAdvice]
+    preload_memory: dict[str, int]
+
+
+def read_ogg_info(path: str, size: int) -> OggInfo | None:
+    """
+    Read the channels, sample rate and length of an Ogg Vorbis (or
+    Opus) file from its page headers, without decoding anything: the
+    identification header is on the first page, and the last page's
+    granule position is the number of samples.
+    :param size: The size of the file, as the scan found it
+    :return: None if the file isn't an Ogg stream we understand
+    """
+    try:
+        with open(path, "rb") as file:
+            head: bytes = file.read(HEAD_SIZE)
+            file.seek(max(0, size - TAIL_SIZE))
+            tail: bytes = file.read(TAIL_SIZE)
+    except OSError:
+        return None
+
+    if len(head) < PAGE_HEADER.size or not head.startswith(CAPTURE_PATTERN):
+        return None
+
+    serial: int = PAGE_HEADER.unpack_from(head)[4]
+    segments: int = PAGE_HEADER.unpack_from(head)[7]
+    packet: bytes = head[PAGE_HEADER.size + segments:]
+
+    if packet.startswith(b"\x01vorbis") and len(packet) >= 16:
+        channels, sample_rate = struct.unpack_from("<BI", packet, 11)
+        pre_skip: int = 0
+    elif packet.startswith(b"OpusHead") and len(packet) >= 12:
+        channels, pre_skip = struct.unpack_from("<BH", packet, 9)
+        # Opus always decodes at 48 kHz
+        sample_rate = 48000
+    else:
+        return None
+
+    if sample_rate == 0:
+        return None
+
+    # Find the last page of this stream that ends a packet
+    end: int = len(tail)
+    while True:
+        start: int = tail.rfind(CAPTURE_PATTERN, 0, end)
+        if start < 0:
+            return None
+
+        if start + PAGE_HEADER.size <= len(tail):
+            fields = PAGE_HEADER.unpack_from(tail, start)
+            if fields[4] == serial and fields[3] >= 0:
+                return OggInfo(channels=channels, sample_rate=sample_rate,
+                               samples=max(0, fields[3] - pre_skip))
+        end = start
+
+
+def advise_streaming(events: SoundEventHandler, sizes: dict[str, int],
+                     stream_seconds: float = STREAM_SECONDS,
+                     preload_budget: int = PRELOAD_BUDGET,
+                     read: Callable[[str, int], OggInfo | None] = read_ogg_info
+                     ) -> StreamReport:
+    """
+    Find the sounds that should stream but don't, and the preloaded
+    sounds that cost too much memory. A preloaded sound is held
+    decoded from the moment resources load, so its cost is counted
+    decoded. Each file is read at most once, and only when it matters:
+    when it's preloaded, or not streamed and big enough to be long.
+    :param sizes: File sizes by path, from the scan. Files the scan
+    didn't record are stat-ed, missing ones are left out.
+    :param stream_seconds: Sounds longer than this should stream
+    :param preload_budget: Preloads using more bytes than this are
+    flagged
+    :param read: Reads a file's Ogg headers, given its path and size
+    :return: The flagged sounds, and the total preloaded memory by
+    namespace (files of unknown length counted by their size)
+    """
+    report = StreamReport(should_stream=[], large_preloads=[],
+                          preload_memory={})
+
+    infos: dict[str, OggInfo | None] = {}
+    preloaded_paths: set[str] = set()
+
+    for key, event in sorted(events.get_event_dictionary().items()):
+        for sound in event['sounds']:
+            if sound.get('type', "file") != "file":
+                continue
+
+            streamed: bool = sound.get('stream', False) is True
+            preloaded: bool = sound.get('preload', False) is True
+
+            path: str = str(events.get_sound_path(sound['name']))
+            size: int | None = sizes.get(path)
+            if size is None:
+                try:
+                    size = os.stat(path).st_size
+                except OSError:
+                    continue
+
+            long_enough: bool = size >= stream_seconds * MIN_BYTES_PER_SECOND
+            if not preloaded and (streamed or not long_enough):
+                continue
+
+            if path not in infos:
+                infos[path] = read(path, size)
+            info: OggInfo | None = infos[path]
+
+            seconds: float | None = None
+            memory: int = size
+            if info is not None:
+                seconds = info['samples'] / info['sample_rate']
+                memory = info['samples'] * info['channels'] * BYTES_PER_SAMPLE
+
+            advice = SoundAdvice(event=key, name=sound['name'], size=size,
+                                 seconds=seconds, memory=memory)
+
+            if not streamed and seconds is not None and (
+                    seconds > stream_seconds):
+                report['should_stream'].append(advice)
+
+            if not preloaded:
+                continue
+
+            if memory > preload_budget:
+                report['large_preloads'].append(advice)
+
+            # A file preloaded by several events is only loaded once
+            if path not in preloaded_paths:
+                preloaded_paths.add(path)
+                namespace: str = get_sound_key(sound['name']).split("/")[0]
+                report['preload_memory'][namespace] = (
+                    report['preload_memory'].get(namespace, 0) + memory)
+
+    report['preload_memory'] = dict(sorted(report['preload_memory'].items()))
+
+    return report
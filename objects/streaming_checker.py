@@ -0,0 +1,287 @@
+import heapq
+import os
+import posixpath
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+from typing import Callable, Iterator
+
+from objects.archive_reader import ARCHIVE_SUFFIXES
+from objects.custom_path import CPath
+from objects.pack_checker import (
+    CheckResult, PackChecker, VALID_NAME, find_sounds_json,
+    get_missing_subtitles, load_events)
+from objects.scan_index import list_directory
+from objects.sound_event_handler import SoundEventHandler
+from objects.symlink_graph import SymlinkGraph
+
+# How much memory the spooled paths may take by default, in bytes
+MEMORY_BUDGET: int = 64 * 1024 * 1024
+
+# Spools each get an equal share of the budget: one per category, plus
+# the orphan candidates and the paths symlinks reach
+SPOOLS: int = len(CheckResult.CATEGORIES) + 2
+
+
+class SortedSpool:
+    """
+    Paths collected in any order and given back sorted, holding no more
+    than budget bytes of them in memory. Whenever the budget is reached
+    the buffer is sorted and spilled to a run file; reading the spool
+    merges the runs with what is still buffered.
+    """
+
+    def __init__(self, budget: int, directory: str):
+        """
+        :param budget: Bytes of paths to buffer before spilling
+        :param directory: Where to write the runs
+        """
+        self.budget: int = budget
+        self.directory: str = directory
+        self.buffer: list[str] = []
+        self.buffered: int = 0
+        self.runs: list[str] = []
+        self.count: int = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def add(self, path: str):
+        self.buffer.append(path)
+        self.buffered += sys.getsizeof(path) + 8
+        self.count += 1
+
+        if self.buffered >= self.budget:
+            self.spill()
+
+    def spill(self):
+        """Write the buffer out as a sorted run"""
+
+        if len(self.buffer) == 0:
+            return
+
+        run: str = os.path.join(self.directory, f"run{id(self)}.{len(self.runs)}")
+        with open(run, "w", encoding="utf-8", errors="surrogateescape") as file:
+            file.writelines(p + "\n" for p in sorted(self.buffer))
+
+        self.runs.append(run)
+        self.buffer = []
+        self.buffered = 0
+
+    def __iter__(self) -> Iterator[str]:
+        """Every path, sorted, reading each run a line at a time"""
+
+        self.buffer.sort()
+        return heapq.merge(
+            *(_read_run(run) for run in self.runs), iter(self.buffer))
+
+
+def _read_run(run: str) -> Iterator[str]:
+    with open(run, encoding="utf-8", errors="surrogateescape") as file:
+        for line in file:
+            yield line[:-1]
+
+
+class StreamResult:
+    """
+    The outcome of a streaming check. Like a CheckResult, except that
+    findings are spools to iterate over rather than lists, and there is
+    no list of passing files. close() removes the spilled runs, so a
+    result can only be read until then.
+    """
+
+    def __init__(self, sounds_json: CPath, assets_folder: CPath,
+                 events: SoundEventHandler, budget: int):
+        self.sounds_json: CPath = sounds_json
+        self.assets_folder: CPath = assets_folder
+        self.events: SoundEventHandler = events
+        self.directory: str = tempfile.mkdtemp(prefix="spcheck-")
+        self.findings: dict[str, SortedSpool] = {
+            c: SortedSpool(budget // SPOOLS, self.directory)
+            for c in CheckResult.CATEGORIES}
+        self.sound_counts: dict[str, int] = {}
+        self.missing_subtitles: dict[str, list[str]] = {}
+        self.invalid_sounds: list = []
+        self.timings: dict[str, float] = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def close(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def get_found_categories(self) -> set[str]:
+        """Return the names of the categories that have findings"""
+
+        found: set[str] = set(
+            c for c, f in self.findings.items() if len(f) > 0)
+
+        if len(self.missing_subtitles) > 0:
+            found.add("missing_subtitles")
+        if len(self.invalid_sounds) > 0:
+            found.add("invalid_sounds")
+
+        return found
+
+
+class StreamingChecker:
+    """
+    Check a pack too large to hold in memory, one directory at a time.
+
+    Only the event index is kept whole: the paths sounds.json refers
+    to, with how often it refers to each, shrinking to the broken links
+    as their files turn up. Each
+    directory is listed, judged against it and forgotten. Files that
+    don't belong, and referenced files with invalid names, are settled
+    on the spot; unreferenced .ogg files can only be called orphans
+    once every symlink has been seen, so they are spooled with the
+    paths symlinks reach and the two sorted streams are joined at the
+    end. Memory beyond the event index (and the symlinks the graph
+    remembers) stays within the budget, whatever the size of the pack.
+
+    Findings are the ones check_path() would report.
+    """
+
+    def __init__(self, checker: PackChecker = None,
+                 memory_budget: int = MEMORY_BUDGET):
+        self.checker: PackChecker = (
+            checker if checker is not None else PackChecker())
+        self.memory_budget: int = memory_budget
+
+    def check_path(self, path: CPath,
+                   on_finding: Callable[[str, str], None] = None
+                   ) -> StreamResult:
+        """
+        :param on_finding: Called with the category and path of each
+        finding as soon as it is confirmed, in no particular order
+        """
+        if path.suffix in ARCHIVE_SUFFIXES:
+            raise ValueError("Only folders can be checked streaming")
+
+        if path.is_dir():
+            path = find_sounds_json(path, self.checker.get_ignore_rules)
+
+        start: float = time.perf_counter()
+
+        assets_folder: CPath = path.parent.parent
+        events: SoundEventHandler = load_events(
+            path, self.checker.get_ignore_rules(assets_folder))
+
+        result = StreamResult(path, assets_folder, events, self.memory_budget)
+        result.invalid_sounds = events.invalid_sounds
+        result.timings["parse"] = time.perf_counter() - start
+
+        try:
+            self._check(result, events, on_finding or (lambda *_: None))
+        except BaseException:
+            result.close()
+            raise
+
+        return result
+
+    def _check(self, result: StreamResult, events: SoundEventHandler,
+               on_finding: Callable[[str, str], None]):
+
+        start: float = time.perf_counter()
+        share: int = self.memory_budget // SPOOLS
+
+        def found(category: str, path: str):
+            result.findings[category].add(path)
+            on_finding(category, path)
+
+        # Like check_path(), a broken link is reported once per reference
+        referenced: Counter[str] = Counter(
+            sys.intern(str(p)) for p in events.get_sound_files())
+        missing: set[str] = set(referenced)
+        invalid_referenced: set[str] = set()
+
+        candidates = SortedSpool(share, result.directory)
+        reachable = SortedSpool(share, result.directory)
+
+        graph = SymlinkGraph(result.assets_folder)
+        ignore = self.checker.get_ignore_rules(result.assets_folder)
+        pending: list[str] = [str(result.assets_folder)]
+
+        while len(pending) > 0:
+            files, symlinks, subdirectories = list_directory(
+                pending.pop(), ignore)
+            pending.extend(subdirectories)
+
+            for f in files + [s for s in symlinks if os.path.isfile(s)]:
+                suffix: str = posixpath.splitext(f)[1]
+                if suffix != ".ogg":
+                    if suffix != ".json":
+                        found("irrelevant_files", f)
+                    continue
+
+                if f not in referenced:
+                    candidates.add(f)
+                    continue
+
+                missing.discard(f)
+                if not VALID_NAME.match(f):
+                    invalid_referenced.add(f)
+                    found("invalid_file_names", f)
+
+            for r in graph.get_reachable(
+                    s for s in symlinks if s.endswith(".ogg")):
+                reachable.add(r)
+
+        result.timings["scan"] = time.perf_counter() - start
+        start = time.perf_counter()
+
+        # Unreferenced files a symlink reaches are kept, and only then
+        # does their name matter
+        for f, is_reached in _join(iter(candidates), iter(reachable)):
+            if not is_reached:
+                found("orphaned_files", f)
+            elif not VALID_NAME.match(f):
+                found("invalid_file_names", f)
+
+        if len(missing) > 0:
+            vanilla_files: set[str] = set(
+                str(p) for p in self.checker.vanilla.get_events(
+                    result.assets_folder).get_sound_files())
+            for f in sorted(missing - vanilla_files):
+                for _ in range(referenced[f]):
+                    found("broken_links", f)
+
+        result.timings["checks"] = time.perf_counter() - start
+        start = time.perf_counter()
+
+        for key in events.get_event_names():
+            count: int = len(
+                set(str(p) for p in events.get_sound_files(key))
+                - missing - invalid_referenced)
+            if count > 0:
+                result.sound_counts[key] = count
+
+        result.timings["counts"] = time.perf_counter() - start
+        start = time.perf_counter()
+
+        result.missing_subtitles = get_missing_subtitles(
+            events, self.checker.get_lang_index(result.assets_folder),
+            result.sounds_json.parent.name)
+
+        result.timings["subtitles"] = time.perf_counter() - start
+
+
+def _join(paths: Iterator[str], reached: Iterator[str]
+          ) -> Iterator[tuple[str, bool]]:
+    """
+    Walk sorted paths against a sorted stream of reached paths, which
+    may repeat
+    :return: Each path, and whether it was reached
+    """
+    current: str | None = next(reached, None)
+
+    for path in paths:
+        while current is not None and current < path:
+            current = next(reached, None)
+
+        yield path, current == path
@@ -0,0 +1,215 @@
+import errno
+import os
+from typing import Iterable, TypedDict
+
+from objects.custom_path import CPath
+from objects.ignore_rules import IgnoreRules
+from objects.scan_index import list_directory
+
+# Chains with more links than this are reported
+MAX_HOPS: int = 2
+
+
+class LinkInfo(TypedDict):
+    # The path the chain ends at, which doesn't exist for dangling
+    # links and is None for cycles
+    target: str | None
+    # How many links were followed to get there, this one included
+    hops: int
+    # "ok", "dangling" or "cycle"
+    status: str
+    # Whether any hop lies outside the root
+    escapes: bool
+
+
+class LinkReport(TypedDict):
+    long_chains: list[str]
+    escaping: list[str]
+    cycles: list[str]
+    dangling: list[str]
+
+
+def list_symlinks(assets_folder: CPath,
+                  ignore: IgnoreRules = None) -> list[str]:
+    """
+    Find every symlink under an assets folder, dangling ones included,
+    without following any of them
+    :param ignore: Rules for links and folders to leave out
+    """
+    symlinks: list[str] = []
+    pending: list[str] = [str(assets_folder)]
+
+    while len(pending) > 0:
+        _, links, subdirectories = list_directory(pending.pop(), ignore)
+        symlinks.extend(links)
+        pending.extend(subdirectories)
+
+    return sorted(symlinks)
+
+
+class SymlinkGraph:
+    """
+    The symlinks of a pack, as a graph of hops.
+
+    Each link is read once with readlink(), and the whole chain it
+    starts is memoized: when a later link runs into a link resolved
+    before, the rest of its chain is taken from there. Links sharing
+    a target, or chaining through each other, cost one readlink each.
+
+    Hops are absolute paths, normalized and with their directory
+    resolved (once per directory), so they compare equal to the paths
+    a scan of a real root finds.
+    """
+
+    def __init__(self, root: CPath):
+        self.root: str = os.path.realpath(root)
+        self.readlinks: int = 0
+
+        # link -> its next hop
+        self._hops: dict[str, str] = {}
+        # path that isn't a link -> whether it exists
+        self._ends: dict[str, bool] = {}
+        # link -> where its chain leads
+        self._resolved: dict[str, LinkInfo] = {}
+        self._directories: dict[str, str] = {}
+
+    def resolve(self, link: str) -> LinkInfo:
+        """Follow a link to the end of its chain"""
+
+        link = self._canonical(link)
+
+        chain: list[str] = []
+        seen: set[str] = set()
+        current: str = link
+
+        while current not in self._resolved:
+            if current in seen:
+                # Every link on the way leads into the loop
+                for c in chain:
+                    self._resolved[c] = LinkInfo(
+                        target=None, hops=0, status="cycle",
+                        escapes=any(not self._inside(h) for h in chain))
+                return self._resolved[link]
+
+            following: str | None = self._step(current)
+            if following is None:
+                break
+
+            chain.append(current)
+            seen.add(current)
+            current = following
+
+        if current in self._resolved:
+            end: LinkInfo = self._resolved[current]
+        elif len(chain) == 0:
+            raise ValueError(f"{link} is not a symlink")
+        else:
+            end = LinkInfo(
+                target=current, hops=0,
+                status="ok" if self._ends[current] else "dangling",
+                escapes=not self._inside(current))
+
+        # Memoize every link of the chain, from the end backwards
+        escapes: bool = end["escapes"]
+        for n, c in enumerate(reversed(chain), start=1):
+            escapes = escapes or not self._inside(c)
+            self._resolved[c] = LinkInfo(
+                target=end["target"], hops=end["hops"] + n,
+                status=end["status"], escapes=escapes)
+
+        return self._resolved[link]
+
+    def get_hops(self, link: str) -> list[str]:
+        """
+        :return: Every path the link's chain passes through after the
+        link itself, up to and including the file it ends at
+        """
+        hops: list[str] = []
+        current: str = self._canonical(link)
+
+        while current in self._hops:
+            current = self._hops[current]
+            if current in hops:
+                break
+            hops.append(current)
+
+        return hops
+
+    def get_reachable(self, links: Iterable[str]) -> set[str]:
+        """
+        :return: Every path reached by following the given links:
+        the links they chain through and the files they end at
+        """
+        reachable: set[str] = set()
+
+        for link in links:
+            self.resolve(link)
+            reachable.update(self.get_hops(link))
+
+        return reachable
+
+    def analyze(self, links: Iterable[str],
+                max_hops: int = MAX_HOPS) -> LinkReport:
+        """
+        Sort the given links into the problems they have. A link can
+        have several: a long chain can also escape the root.
+        :param max_hops: Chains with more links than this are reported
+        :return: The links with each problem, sorted
+        """
+        report = LinkReport(
+            long_chains=[], escaping=[], cycles=[], dangling=[])
+
+        for link in sorted(links):
+            info: LinkInfo = self.resolve(link)
+
+            if info["status"] == "cycle":
+                report["cycles"].append(link)
+            elif info["status"] == "dangling":
+                report["dangling"].append(link)
+
+            if info["hops"] > max_hops:
+                report["long_chains"].append(link)
+            if info["escapes"]:
+                report["escaping"].append(link)
+
+        return report
+
+    def _step(self, path: str) -> str | None:
+        """
+        :return: Where the link at path leads, or None when path isn't
+        a link (and the chain ends there)
+        """
+        if path in self._hops:
+            return self._hops[path]
+        if path in self._ends:
+            return None
+
+        self.readlinks += 1
+        try:
+            target: str = os.readlink(path)
+        except OSError as e:
+            # EINVAL: there, but not a link
+            self._ends[path] = e.errno == errno.EINVAL
+            return None
+
+        following: str = self._canonical(
+            os.path.join(os.path.dirname(path), target))
+        self._hops[path] = following
+
+        return following
+
+    def _canonical(self, path: str) -> str:
+        """Normalize a path, with its directory resolved"""
+
+        path = os.path.abspath(path)
+        head, name = os.path.split(path)
+
+        directory = self._directories.get(head)
+        if directory is None:
+            directory = os.path.realpath(head)
+            self._directories[head] = directory
+
+        return os.path.join(directory, name)
+
+    def _inside(self, path: str) -> bool:
+        return path == self.root or path.startswith(self.root + os.sep)
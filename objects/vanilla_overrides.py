@@ -0,0 +1,112 @@
+import sys
+from typing import TypedDict
+
+from objects.sound_event_handler import SoundEventHandler, get_sound_key
+
+# Everything vanilla defines lives in this namespace
+VANILLA_NAMESPACE: str = "minecraft"
+
+
+class OverrideReport(TypedDict):
+    # Pack files at the path of a vanilla sound, which replace it
+    overridden_files: list[str]
+    # Events vanilla defines too, with "replace": true
+    replaced_events: list[str]
+    # Events vanilla defines too, whose sounds are added to vanilla's
+    extended_events: list[str]
+    # Vanilla sounds the pack plays without shipping its own
+    vanilla_references: list[str]
+    # Namespaces mapped to how many of each of the above they have
+    totals: dict[str, dict[str, int]]
+
+
+class VanillaKeys:
+    """
+    The vanilla event names and sound file keys ("minecraft/sounds/
+    x.ogg"), as interned strings in frozen sets. Built once per
+    vanilla, so comparing a pack against it only costs set operations
+    over the pack's own names.
+    """
+
+    def __init__(self, raw_json: dict, sound_files: frozenset[str] = None):
+        """
+        :param sound_files: The sound files vanilla ships, if known,
+        otherwise those its events play
+        """
+        self.event_names: frozenset[str] = frozenset(
+            sys.intern(key) for key in raw_json)
+
+        if sound_files is None:
+            sound_files = frozenset(
+                get_sound_key(s['name'])
+                for event in raw_json.values() for s in event['sounds']
+                if s.get('type', "file") == "file")
+
+        self.sound_keys: frozenset[str] = frozenset(
+            sys.intern(f) for f in sound_files)
+
+
+def find_overrides(events: SoundEventHandler, vanilla: VanillaKeys,
+                   files: list[str], namespace: str) -> OverrideReport:
+    """
+    Compare a pack with vanilla: the files it overwrites, the events
+    it redefines, and the vanilla sounds it plays as they are.
+    :param events: The pack's sound events
+    :param vanilla: The vanilla names to compare with
+    :param files: The pack's .ogg files, relative to the assets folder
+    :param namespace: The namespace holding sounds.json, for events
+    that weren't combined from several
+    :return: Sorted names in each category, and per namespace totals
+    """
+    file_keys: set[str] = set(files)
+
+    # Vanilla only defines events in its own namespace, where combined
+    # handlers leave the names bare
+    vanilla_events: set[str] = set()
+    # Sound file keys mapped to the namespace of the first event
+    # playing them
+    referenced: dict[str, str] = {}
+
+    for key, event in sorted(events.get_event_dictionary().items()):
+        event_namespace: str = events.get_namespace(key) or namespace
+
+        if event_namespace == VANILLA_NAMESPACE:
+            vanilla_events.add(key)
+
+        for sound in event['sounds']:
+            if sound.get('type', "file") == "file":
+                referenced.setdefault(
+                    get_sound_key(sound['name']), event_namespace)
+
+    overridden: set[str] = file_keys & vanilla.sound_keys
+    redefined: set[str] = vanilla_events & vanilla.event_names
+    played: set[str] = (referenced.keys() & vanilla.sound_keys) - file_keys
+
+    dictionary: dict = events.get_event_dictionary()
+    replaced: set[str] = set(
+        k for k in redefined if dictionary[k].get('replace') is True)
+
+    report = OverrideReport(
+        overridden_files=sorted(overridden),
+        replaced_events=sorted(replaced),
+        extended_events=sorted(redefined - replaced),
+        vanilla_references=sorted(played),
+        totals={})
+
+    # Files count for the namespace holding them, references for the
+    # namespace whose event plays them
+    owners: dict[str, list[str]] = {
+        "overridden_files": [f.split("/")[0] for f in overridden],
+        "replaced_events": [VANILLA_NAMESPACE] * len(replaced),
+        "extended_events": [VANILLA_NAMESPACE] * len(redefined - replaced),
+        "vanilla_references": [referenced[f] for f in played]}
+
+    for category, namespaces in owners.items():
+        for n in namespaces:
+            counts = report['totals'].setdefault(
+                n, {c: 0 for c in owners})
+            counts[category] += 1
+
+    report['totals'] = dict(sorted(report['totals'].items()))
+
+    return report
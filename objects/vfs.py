@@ -0,0 +1,332 @@
+import abc
+import io
+import os
+import posixpath
+import stat
+import time
+import zipfile
+from collections import Counter
+from typing import IO, TypedDict
+
+from objects.ignore_rules import IgnoreRules
+from objects.scan_index import list_directory
+
+# How many links a chain may have before it counts as a loop, as the
+# kernel does
+MAX_LINKS: int = 40
+
+
+class Stat(TypedDict):
+    # "file", "directory" or "link"
+    kind: str
+    size: int
+    mtime_ns: int
+
+
+class VFS(abc.ABC):
+    """
+    The few file system operations a check needs: list a directory,
+    stat a path (without following links), read a link and open a
+    file. Paths are "/"-separated and relative to the backend's root,
+    which is "".
+
+    Backends implement the underscored methods. The public ones count
+    every call in operations, and open() counts the bytes read, so
+    tests and benchmarks can hold a check to a budget.
+
+    Links leading out of the backend's root count as dangling, unless
+    follow_outside is set by a backend that can follow them.
+    """
+
+    def __init__(self):
+        self.operations: Counter = Counter()
+        self.follow_outside: bool = False
+
+    def list_directory(self, path: str
+                       ) -> tuple[list[str], list[str], list[str]]:
+        """
+        :return: The paths of the files, symlinks and subdirectories in
+        a directory, like scan_index.list_directory()
+        """
+        self.operations["list"] += 1
+        return self._list_directory(path)
+
+    def stat(self, path: str) -> Stat | None:
+        """:return: What is at path, or None if nothing is"""
+        self.operations["stat"] += 1
+        return self._stat(path)
+
+    def readlink(self, path: str) -> str:
+        self.operations["readlink"] += 1
+        return self._readlink(path)
+
+    def open(self, path: str) -> IO[bytes]:
+        self.operations["open"] += 1
+        return _CountingReader(self._open(path), self.operations)
+
+    def read(self, path: str) -> bytes:
+        with self.open(path) as file:
+            return file.read()
+
+    def resolve(self, path: str) -> str | None:
+        """
+        Follow a chain of links
+        :return: The path of the file or directory it ends at, or None
+        if it dangles, loops or leaves the backend
+        """
+        return self.follow(path)[0]
+
+    def follow(self, path: str) -> tuple[str | None, list[str]]:
+        """
+        Follow a chain of links, like resolve()
+        :return: Where it ends, and every path it passes through after
+        the first, up to where it ends or breaks off
+        """
+        hops: list[str] = []
+
+        for _ in range(MAX_LINKS):
+            info: Stat | None = self.stat(path)
+            if info is None:
+                return None, hops
+            if info["kind"] != "link":
+                return path, hops
+
+            path = posixpath.normpath(posixpath.join(
+                posixpath.dirname(path), self.readlink(path)))
+            if not self.follow_outside and (
+                    path.startswith("../") or path == ".."
+                    or path.startswith("/")):
+                return None, hops
+
+            hops.append(path)
+
+        return None, hops
+
+    @abc.abstractmethod
+    def _list_directory(self, path: str
+                        ) -> tuple[list[str], list[str], list[str]]:
+        ...
+
+    @abc.abstractmethod
+    def _stat(self, path: str) -> Stat | None:
+        ...
+
+    @abc.abstractmethod
+    def _readlink(self, path: str) -> str:
+        ...
+
+    @abc.abstractmethod
+    def _open(self, path: str) -> IO[bytes]:
+        ...
+
+
+class RealFS(VFS):
+    """A folder on disk"""
+
+    def __init__(self, root: str, ignore: IgnoreRules = None,
+                 follow_outside: bool = False):
+        """
+        :param ignore: Rules for files and folders to leave out of
+        listings (see scan_index.list_directory())
+        :param follow_outside: Follow links out of root, as the game
+        will while the pack is a folder
+        """
+        super().__init__()
+        self.root: str = str(root)
+        self.ignore: IgnoreRules | None = ignore
+        self.follow_outside = follow_outside
+
+    def _real(self, path: str) -> str:
+        return os.path.join(self.root, path) if path else self.root
+
+    def _list_directory(self, path: str):
+        cut: int = len(os.path.join(self.root, ""))
+        return tuple(
+            [p[cut:] for p in paths]
+            for paths in list_directory(self._real(path), self.ignore))
+
+    def _stat(self, path: str) -> Stat | None:
+        try:
+            info: os.stat_result = os.lstat(self._real(path))
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+
+        kind: str = ("link" if stat.S_ISLNK(info.st_mode)
+                     else "directory" if stat.S_ISDIR(info.st_mode)
+                     else "file")
+
+        return Stat(kind=kind, size=info.st_size, mtime_ns=info.st_mtime_ns)
+
+    def _readlink(self, path: str) -> str:
+        return os.readlink(self._real(path))
+
+    def _open(self, path: str) -> IO[bytes]:
+        return open(self._real(path), "rb")
+
+
+class ZipFS(VFS):
+    """
+    The contents of a zip archive, read in place. Members stored as
+    symlinks (zip -y) are links, holding their target as data.
+    """
+
+    def __init__(self, archive: zipfile.ZipFile):
+        super().__init__()
+        self.archive: zipfile.ZipFile = archive
+        self.members: dict[str, zipfile.ZipInfo] = {}
+        self.directories: dict[str, set[str]] = {"": set()}
+
+        for info in archive.infolist():
+            name: str = info.filename.rstrip("/")
+            if info.is_dir():
+                _add_directory(self.directories, name)
+                continue
+
+            self.members[name] = info
+            _add_directory(self.directories, posixpath.dirname(name))
+            self.directories[posixpath.dirname(name)].add(name)
+
+    def _is_link(self, info: zipfile.ZipInfo) -> bool:
+        return stat.S_ISLNK(info.external_attr >> 16)
+
+    def _list_directory(self, path: str):
+        files: list[str] = []
+        symlinks: list[str] = []
+        subdirectories: list[str] = []
+
+        if path not in self.directories:
+            raise FileNotFoundError(path)
+
+        for name in sorted(self.directories[path]):
+            if name in self.directories:
+                subdirectories.append(name)
+            elif self._is_link(self.members[name]):
+                symlinks.append(name)
+            else:
+                files.append(name)
+
+        return files, symlinks, subdirectories
+
+    def _stat(self, path: str) -> Stat | None:
+        if path in self.directories:
+            return Stat(kind="directory", size=0, mtime_ns=0)
+
+        info = self.members.get(path)
+        if info is None:
+            return None
+
+        mtime_ns: int = int(
+            time.mktime(info.date_time + (0, 0, -1)) * 10 ** 9)
+
+        return Stat(kind="link" if self._is_link(info) else "file",
+                    size=info.file_size, mtime_ns=mtime_ns)
+
+    def _readlink(self, path: str) -> str:
+        return self.archive.read(self.members[path]).decode()
+
+    def _open(self, path: str) -> IO[bytes]:
+        if path not in self.members:
+            raise FileNotFoundError(path)
+        return self.archive.open(self.members[path])
+
+
+class MemoryFS(VFS):
+    """Files and symlinks that only exist as data, for tests"""
+
+    def __init__(self, files: dict[str, bytes],
+                 symlinks: dict[str, str] = None):
+        """
+        :param files: Paths mapped to contents
+        :param symlinks: Paths of links mapped to their targets, as
+        readlink() would give them
+        """
+        super().__init__()
+        self.files: dict[str, bytes] = files
+        self.symlinks: dict[str, str] = symlinks or {}
+        self.directories: dict[str, set[str]] = {"": set()}
+
+        for name in list(self.files) + list(self.symlinks):
+            parent: str = posixpath.dirname(name)
+            _add_directory(self.directories, parent)
+            self.directories[parent].add(name)
+
+    def _list_directory(self, path: str):
+        if path not in self.directories:
+            raise FileNotFoundError(path)
+
+        names: list[str] = sorted(self.directories[path])
+
+        return ([n for n in names if n in self.files],
+                [n for n in names if n in self.symlinks],
+                [n for n in names if n in self.directories])
+
+    def _stat(self, path: str) -> Stat | None:
+        if path in self.directories:
+            return Stat(kind="directory", size=0, mtime_ns=0)
+        if path in self.symlinks:
+            return Stat(kind="link", size=len(self.symlinks[path]),
+                        mtime_ns=0)
+        if path in self.files:
+            return Stat(kind="file", size=len(self.files[path]), mtime_ns=0)
+
+        return None
+
+    def _readlink(self, path: str) -> str:
+        return self.symlinks[path]
+
+    def _open(self, path: str) -> IO[bytes]:
+        if path not in self.files:
+            raise FileNotFoundError(path)
+        return io.BytesIO(self.files[path])
+
+
+class _CountingReader(io.RawIOBase):
+    """Pass reads through, adding up the bytes in operations["bytes"]"""
+
+    def __init__(self, file: IO[bytes], operations: Counter):
+        super().__init__()
+        self.file: IO[bytes] = file
+        self.operations: Counter = operations
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data: bytes = self.file.read(len(buffer))
+        buffer[:len(data)] = data
+        self.operations["bytes"] += len(data)
+        return len(data)
+
+    def close(self):
+        self.file.close()
+        super().close()
+
+
+def _add_directory(directories: dict[str, set[str]], name: str):
+    """Add a directory to a tree of names, with its missing parents"""
+
+    if name in directories:
+        return
+
+    directories[name] = set()
+    parent: str = posixpath.dirname(name)
+    _add_directory(directories, parent)
+    directories[parent].add(name)
+
+
+def walk(fs: VFS, root: str = "") -> tuple[list[str], list[str]]:
+    """
+    List every file and symlink beneath a folder of a backend
+    :return: The paths of files and of symlinks, sorted
+    """
+    files: list[str] = []
+    symlinks: list[str] = []
+    pending: list[str] = [root]
+
+    while len(pending) > 0:
+        found, links, subdirectories = fs.list_directory(pending.pop())
+        files.extend(found)
+        symlinks.extend(links)
+        pending.extend(subdirectories)
+
+    return sorted(files), sorted(symlinks)
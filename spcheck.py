@@ -13,6 +13,40 @@ Command-line arguments:
 
     --help      (-h)    Show usage
     --version   (-v)    Show version number
+    --full      (-f)    List every finding instead of collapsing by folder
+    --changed-since REV Only check files changed since a git revision
+    --cache     (-c)    Replay or incrementally update the previous result
+    --verify-archive    Check the CRC of every member of a .zip or .jar
+    --deep              Walk every Ogg page of a folder's sounds,
+                        checking capture patterns, sequence and CRCs
+    --fail-on CATEGORIES  Exit with a category's code if it has findings
+    --fail-fast         Stop at the first finding that fails the run
+    --links             Report symlink chains, cycles, dangling links
+                        and links escaping the assets folder
+    --stream-advice     Flag long sounds that don't stream, and
+                        preloads over budget
+    --overrides         Report what the pack changes about vanilla
+    --vanilla-version V Take vanilla from the launcher's asset index V
+                        (or "latest") instead of vanilla-sounds.json
+    --minecraft-dir DIR Where the launcher keeps its assets
+    --streaming         Check a folder a directory at a time, within
+                        --memory-budget MiB, for very large packs
+    --ignore PATTERN    Leave out what a gitignore-style pattern matches,
+                        on top of the pack's .spcheckignore files
+    --index             File which events play which files, for query
+                        mode
+
+Modes (optional first argument):
+
+    stack <pack> <pack> ...     Simulate a stack of packs over vanilla,
+                                lowest priority first
+    serve [socket]              Answer check requests (one JSON object
+                                per line) on a Unix domain socket
+    diff <old> <new>            Compare two versions of a pack (folders,
+                                .zip or .jar files)
+    query file <path> [pack]    List the events playing a file, or the
+    query event <name> [pack]   files an event plays, from the index
+                                the last check with --index left
 """
 
 __version__ = '3.1.1'
@@ -21,15 +55,45 @@ __status__ = "Prototype"
 
 # Import modules
 import argparse
-import json
+import asyncio
 import os
-import re
+import sqlite3
 import sys
-import zipfile
 
-from tempfile import TemporaryDirectory
 from objects.sound_event_handler import SoundEventHandler
+from objects.archive_reader import ARCHIVE_SUFFIXES
+from objects.archive_verifier import CorruptMember, verify_archive
 from objects.custom_path import CPath
+from objects.check_cache import CheckCache
+from objects.changed_files import ChangedFilesChecker
+from objects.check_server import CheckServer
+from objects.fail_fast import FAIL_CODES, FailFastChecker, get_exit_code
+from objects.ignore_rules import IgnoreRules
+from objects.incremental_checker import IncrementalChecker
+from objects.launcher_assets import default_minecraft_dir
+from objects.ogg_verifier import CorruptSound, verify_sounds
+from objects.pack_checker import (
+    CheckResult, PackChecker, VanillaIndex, find_sounds_json, load_events)
+
+# The checks live in the library now; keep them importable from here
+from objects.pack_checker import (  # noqa: F401
+    get_all_files, get_irrelevant_files, get_orphaned_files,
+    get_broken_links, get_invalid_file_names, check_pack, get_sound_counts)
+from objects.pack_diff import PackIndex, diff_packs
+from objects.pack_stack import Pack, PackStack
+from objects.path_suggester import suggest_files
+from objects.reference_index import ReferenceIndex, default_index_path
+from objects.report_writer import ReportWriter
+from objects.result_cache import ResultCache
+from objects.stream_advisor import (
+    PRELOAD_BUDGET, STREAM_SECONDS, advise_streaming)
+from objects.streaming_checker import (
+    MEMORY_BUDGET, SortedSpool, StreamingChecker, StreamResult)
+from objects.symlink_graph import (
+    MAX_HOPS, LinkReport, SymlinkGraph, list_symlinks)
+from objects.vanilla_overrides import find_overrides
+
+MODES: list[str] = ["stack", "serve", "diff", "query"]
 
 
 # ------------------------------------------------------
@@ -59,31 +123,263 @@ def handle_command_line():
         action='store_true',
         help="Don't clear the screen before displaying report.")
 
+    parser.add_argument(
+        "-f",
+        "--full",
+        action='store_true',
+        help=("List every finding. By default, long lists are "
+              "collapsed by directory, with a few examples each."))
+
+    parser.add_argument(
+        "--examples",
+        action="store",
+        type=int,
+        default=3,
+        help="How many example files to show per collapsed directory")
+
+    parser.add_argument(
+        "--changed-since",
+        action="store",
+        metavar="REV",
+        default=None,
+        help=("Only check what changed since a git revision "
+              "(committed or not), e.g. origin/main"))
+
+    parser.add_argument(
+        "-c",
+        "--cache",
+        action='store_true',
+        help=("Keep results and a snapshot of each pack between runs. "
+              "Unchanged packs replay the previous result, and a run "
+              "after editing sounds.json only rechecks what changed."))
+
+    parser.add_argument(
+        "--cache-dir",
+        action="store",
+        type=CPath,
+        default=None,
+        help="Where to keep the cache (default: ~/.cache/spcheck)")
+
+    parser.add_argument(
+        "--verify-archive",
+        action='store_true',
+        help=("Check the CRC of every member of a .zip or .jar, to "
+              "catch corrupted or truncated downloads"))
+
+    parser.add_argument(
+        "--deep",
+        action='store_true',
+        help=("Walk every page of every .ogg file in a folder, checking "
+              "capture patterns, page sequence numbers and CRCs, to "
+              "catch sounds truncated or damaged by a failed upload. "
+              "Verdicts are cached until a file's size or mtime changes."))
+
+    parser.add_argument(
+        "--fail-on",
+        action="store",
+        type=get_categories,
+        metavar="CATEGORIES",
+        default=None,
+        help=("Comma-separated categories that fail the run, or 'all'. "
+              "The exit code tells the most serious one found: "
+              + ", ".join(f"{c}={n}" for c, n in FAIL_CODES.items())))
+
+    parser.add_argument(
+        "--fail-fast",
+        action='store_true',
+        help=("Stop at the first finding in a --fail-on category "
+              "(all of them if not given), skipping everything after, "
+              "summary included. Folders only, and not with "
+              "--changed-since, --deep, --overrides or --stream-advice"))
+
+    parser.add_argument(
+        "--links",
+        action='store_true',
+        help=("Report symlinks that dangle, loop, point outside the "
+              "assets folder (and break once the pack is zipped), or "
+              "chain through more than --max-link-hops links"))
+
+    parser.add_argument(
+        "--max-link-hops",
+        action="store",
+        type=int,
+        default=MAX_HOPS,
+        help="The longest symlink chain --links accepts")
+
+    parser.add_argument(
+        "--stream-advice",
+        action='store_true',
+        help=("Flag sounds longer than --stream-seconds that don't "
+              "stream, and preloaded sounds taking more memory than "
+              "--preload-budget, with the preloaded memory of each "
+              "namespace"))
+
+    parser.add_argument(
+        "--stream-seconds",
+        action="store",
+        type=float,
+        default=STREAM_SECONDS,
+        help="How long a sound may be before it should stream")
+
+    parser.add_argument(
+        "--preload-budget",
+        action="store",
+        type=int,
+        metavar="KIB",
+        default=PRELOAD_BUDGET // 1024,
+        help="How much memory one preloaded sound may take, decoded")
+
+    parser.add_argument(
+        "--streaming",
+        action='store_true',
+        help=("Check a folder one directory at a time, keeping memory "
+              "within --memory-budget however large the pack; long "
+              "lists are cut short instead of collapsed by folder"))
+
+    parser.add_argument(
+        "--memory-budget",
+        action="store",
+        type=int,
+        metavar="MIB",
+        default=MEMORY_BUDGET // (1024 * 1024),
+        help=("How much memory --streaming may hold findings in "
+              "before spilling them to temporary files"))
+
+    parser.add_argument(
+        "--ignore",
+        action="append",
+        metavar="PATTERN",
+        default=[],
+        help=("Leave out files and folders matching a gitignore-style "
+              "pattern, relative to the assets folder; may be given "
+              "several times. Rules in .spcheckignore files next to "
+              "and inside the assets folder apply too."))
+
+    parser.add_argument(
+        "--index",
+        action='store_true',
+        help=("Update the index of which events play which files that "
+              "query mode reads, kept next to the cache. Only a whole "
+              "check of a folder is filed."))
+
+    parser.add_argument(
+        "--overrides",
+        action='store_true',
+        help=("Report the files that replace vanilla sounds, the events "
+              "that redefine vanilla's, and the vanilla sounds played "
+              "as they are, with totals by namespace"))
+
+    parser.add_argument(
+        "--vanilla-version",
+        action="store",
+        metavar="VERSION",
+        default=None,
+        help=("Build vanilla from the launcher's asset index of this "
+              "version (e.g. 17), or the newest with 'latest', instead "
+              "of vanilla-sounds.json. Read once per version, then "
+              "kept in the cache."))
+
+    parser.add_argument(
+        "--minecraft-dir",
+        action="store",
+        type=CPath,
+        default=None,
+        help="The launcher's folder (default: ~/.minecraft)")
+
     parser.add_argument(
         "remainder",
         action="store",
         nargs=argparse.REMAINDER,
         help=("Path to the sounds.json file you want to check. "
               "The file name itself is not required. "
-              "You can also specify a .zip file, and this "
-              "application will check the contents in a"
-              "temporary directory."))
+              "You can also specify a .zip or .jar file, and "
+              "every pack inside it (and inside archives nested "
+              "in it) will be checked. In stack mode, the packs "
+              "(folders or .zip files) lowest priority first."))
 
     args = parser.parse_args()
 
-    args.path = get_real_path(args.remainder)
+    if args.fail_on is None:
+        args.fail_on = list(FAIL_CODES) if args.fail_fast else []
+
+    # An optional leading mode word selects something other than a check
+    args.mode = "check"
+    if len(args.remainder) > 0 and args.remainder[0] in MODES:
+        args.mode = args.remainder.pop(0)
+
+    if args.mode == "stack":
+        args.packs = [CPath(p) for p in args.remainder]
+        return args
+
+    if args.mode == "diff":
+        if len(args.remainder) != 2:
+            parser.error("diff needs two packs: the old and the new one")
+        args.packs = [CPath(p) for p in args.remainder]
+        return args
+
+    if args.mode == "query":
+        if (len(args.remainder) not in (2, 3)
+                or args.remainder[0] not in ("file", "event")):
+            parser.error("query needs file <path> or event <name>, "
+                         "then optionally the pack")
+        args.query_kind, args.query = args.remainder[:2]
+        args.pack = (CPath(args.remainder[2])
+                     if len(args.remainder) == 3 else None)
+        return args
+
+    if args.mode == "serve":
+        runtime_dir = os.environ.get("XDG_RUNTIME_DIR", "/tmp")
+        args.socket = (args.remainder[0] if len(args.remainder) > 0
+                       else os.path.join(runtime_dir, "spcheck.sock"))
+        return args
+
+    args.path = get_real_path(args.remainder, args.ignore)
+
+    if args.fail_fast:
+        # A fail-fast check scans a folder and stops at the first
+        # finding, leaving nothing for the other reports to build on
+        if args.path.suffix in ARCHIVE_SUFFIXES:
+            parser.error("--fail-fast needs a folder")
+
+        conflicts: list[str] = [
+            flag for flag, given in [
+                ("--changed-since", args.changed_since is not None),
+                ("--deep", args.deep),
+                ("--overrides", args.overrides),
+                ("--stream-advice", args.stream_advice)] if given]
+        if len(conflicts) > 0:
+            parser.error(f"--fail-fast can't be combined with "
+                         f"{', '.join(conflicts)}")
 
     return args
 
 
-def get_real_path(args_path: list[str]) -> CPath:
+def get_categories(text: str) -> list[str]:
+    """Parse a comma-separated list of categories for --fail-on"""
+
+    names: list[str] = [n.strip() for n in text.split(",") if n.strip()]
+    if names == ["all"]:
+        return list(FAIL_CODES)
+
+    unknown: list[str] = [n for n in names if n not in FAIL_CODES]
+    if len(unknown) > 0:
+        raise argparse.ArgumentTypeError(
+            f"unknown categories: {', '.join(unknown)} "
+            f"(choose from {', '.join(FAIL_CODES)}, or all)")
+
+    return names
+
+
+def get_real_path(args_path: list[str],
+                  ignore_patterns: list[str] = ()) -> CPath:
 
     # if path has been specified, use it, otherwise assume cwd
     path: CPath = CPath(args_path[0] if (len(args_path) > 0) else "")
 
-    # Does the path refer only to a folder?  Assume sounds.json
+    # Does the path refer only to a folder?  Find its sounds.json
     if path.is_dir():
-        path = path / "sounds.json"
+        path = find_sounds_json(
+            path, lambda a: IgnoreRules.from_folder(a, ignore_patterns))
 
     # Does the path exist on the file system?
     if not path.exists():
@@ -91,138 +387,345 @@ def get_real_path(args_path: list[str]) -> CPath:
                                 f"{path} is not a valid filesystem path.")
 
     # Has the user specified the wrong file extension?
-    if path.suffix not in [".json", ".zip"]:
+    if path.suffix not in [".json", *ARCHIVE_SUFFIXES]:
         raise ValueError(
             f"specified file: {path} is not a supported file\n"
-            f"Supported formats are currently .json and .zip")
+            f"Supported formats are currently .json, .zip and .jar")
 
     return CPath(path).resolve()
 
 
-def get_all_files(assets_folder: CPath):
+def get_vanilla(args) -> VanillaIndex:
+    """The vanilla index to check against, as the arguments choose"""
 
-    files: list[CPath] = (
-        list(CPath(f) for f in assets_folder.rglob("*") if f.is_file()))
+    if args.vanilla_version is None:
+        return VanillaIndex.default()
 
-    return files
+    minecraft_dir: CPath = (args.minecraft_dir if args.minecraft_dir
+                            is not None else default_minecraft_dir())
+    try:
+        return VanillaIndex.from_launcher(
+            minecraft_dir, args.vanilla_version, CheckCache(args.cache_dir))
+    except (OSError, ValueError) as e:
+        sys.exit(f"Can't read vanilla from the launcher's assets: {e}")
 
 
-def get_irrelevant_files(all_files: list[CPath]) -> list[CPath]:
-    """
-    Given the list of all files in the target path,
-    generate a list of all files that are not relevant
-    to the sound pack.
-    :param all_files: The list of files to search
-    :return: A list of paths to files that shouldn't be
-    in this folder structure
-    """
+def print_warnings(message: str, files: list[CPath], assets_folder: CPath):
+
+    writer = ReportWriter(full=True)
+    writer.warnings(message, files, assets_folder)
+    writer.flush()
 
-    irrelevant_files: list[CPath] = [
-        f for f in all_files if f.suffix != ".ogg" and f.suffix != ".json"]
 
-    return sorted(irrelevant_files)  # noqa
+def print_summary(events: SoundEventHandler, ogg_files: list[CPath]):
 
+    print_sound_counts(get_sound_counts(events, ogg_files))
 
-def get_orphaned_files(events: SoundEventHandler,
-                       ogg_files: list[CPath]) -> list[CPath]:
-    """
-    Given a list of sound events and a list of ogg files,
-    generate a list of files that don't have a matching record
-    in the JSON file.
-    :param events: A dictionary of sound events
-    :param ogg_files: A list of ogg paths
-    :return: A list of files that don't have matching JSON
-    """
-    sounds: list[CPath] = events.get_sound_files()
 
-    links: list[CPath] = list(
-        set([k.target_path for k in ogg_files if k.is_symbolic_link]))
+def print_sound_counts(sound_counts: dict[str, int]):
+
+    writer = ReportWriter()
+    writer.sound_counts(sound_counts)
+    writer.flush()
+
+
+def print_stack_report(stack: PackStack):
+
+    green = "\033[32m"
+    red = "\033[31m"
+    default = "\033[0m"
+
+    bar = "-" * 56
+    print(f"{green}\n{bar}\nEffective sound events:\n{default}")
+
+    for key in stack.get_event_names():
+        sources = ", ".join(stack.event_sources[key])
+        print(f"{key} <- [{sources}]")
+        for file, provider in stack.get_effective_files(key):
+            print(f"    {file} <- {provider or red + 'missing' + default}")
+
+    empty_events = stack.get_empty_events()
+    if len(empty_events) > 0:
+        print(f"{red}\nThe following events have no sounds "
+              f"once the stack is merged:{default}")
+        [print(f" {e}") for e in empty_events]
 
-    orphans: list[CPath] = [
-        o for o in ogg_files if o not in sounds and o not in links]
+    broken_events = stack.get_broken_events()
+    if len(broken_events) > 0:
+        print(f"{red}\nThe following events refer to sounds "
+              f"that no pack in the stack supplies:{default}")
+        for key, missing in broken_events.items():
+            print(f" {key}")
+            [print(f"    {m}") for m in missing]
 
-    orphaned_files: list[CPath] = orphans if len(orphans) > 0 else []
+    print(f"{green}\nPacks: {len(stack.packs)}  "
+          f"Events: {len(stack.events)}\n{bar}{default}")
 
-    return sorted(orphaned_files)  # noqa
 
+def print_result(result: CheckResult, writer: ReportWriter,
+                 summary: bool = True):
 
-def get_broken_links(
-        events: SoundEventHandler,
-        vanilla_events: SoundEventHandler,
-        ogg_files: list[CPath]) -> list[CPath]:
+    # Print all the warnings to the user
+    writer.warnings(
+        "The following files are not .ogg files, "
+        "but are in the sound folders anyway:",
+        result.findings["irrelevant_files"],
+        result.assets_folder)
+
+    writer.warnings(
+        "The following paths exist in JSON, "
+        "but do not correspond to actual file system files:",
+        result.findings["broken_links"],
+        result.assets_folder)
+
+    if len(result.findings["broken_links"]) > 0:
+        writer.suggestions(
+            "Perhaps these paths meant these existing files:",
+            suggest_files(
+                result.findings["broken_links"],
+                result.sound_files + result.findings["orphaned_files"]
+                + result.findings["invalid_file_names"],
+                result.findings["orphaned_files"], result.assets_folder),
+            result.assets_folder)
+
+    writer.warnings(
+        "The following .ogg files exist, "
+        "but no JSON record refers to them: ",
+        result.findings["orphaned_files"],
+        result.assets_folder)
+
+    writer.warnings(
+        "The following file names violate "
+        "Mojang's naming constraints:",
+        result.findings["invalid_file_names"],
+        result.assets_folder)
+
+    writer.invalid_sounds(
+        "The following sound entries have invalid attributes:",
+        result.invalid_sounds)
+
+    writer.missing_keys(
+        "The following subtitles have no translation "
+        "in these languages:",
+        result.missing_subtitles)
+
+    if summary:
+        writer.sound_counts(result.sound_counts)
+    writer.flush()
+
+
+# How each finding is labelled when --streaming reports it as it goes
+FINDING_LABELS: dict[str, str] = {
+    "irrelevant_files": "Not an .ogg file",
+    "broken_links": "Missing",
+    "orphaned_files": "Unreferenced",
+    "invalid_file_names": "Invalid name"}
+
+
+def print_stream_result(result: StreamResult, writer: ReportWriter,
+                        summary: bool = True, listed: bool = False):
     """
-    Given a list of JSON sound references and a list of the ogg files in
-    the folder structure, generate a list of the JSON references that
-    have no corresponding ogg file.
-    :param events: A dictionary of sound events
-    :param vanilla_events: A list of vanilla sound events
-    :param ogg_files: A list of ogg paths
-    :return: A list of JSON references that have no matching files
+    :param listed: Whether the findings were already written as they
+    were found, so only what comes at the end is left to report
     """
+    messages: dict[str, str] = {
+        "irrelevant_files": "The following files are not .ogg files, "
+                            "but are in the sound folders anyway:",
+        "broken_links": "The following paths exist in JSON, "
+                        "but do not correspond to actual file system files:",
+        "orphaned_files": "The following .ogg files exist, "
+                          "but no JSON record refers to them: ",
+        "invalid_file_names": "The following file names violate "
+                              "Mojang's naming constraints:"}
+
+    for category, message in messages.items():
+        if listed:
+            continue
+        spool: SortedSpool = result.findings[category]
+        writer.spooled_warnings(
+            message, spool, len(spool), result.assets_folder)
+
+    writer.invalid_sounds(
+        "The following sound entries have invalid attributes:",
+        result.invalid_sounds)
+
+    writer.missing_keys(
+        "The following subtitles have no translation "
+        "in these languages:",
+        result.missing_subtitles)
+
+    if summary:
+        writer.sound_counts(result.sound_counts)
+    writer.flush()
+
 
-    # Normal files
-    file_paths = [p for p in ogg_files if p.is_symbolic_link is False]
+def print_link_report(report: LinkReport, assets_folder: CPath,
+                      max_hops: int, writer: ReportWriter):
 
-    # Symlinks that can be resolved
-    file_paths.extend([
-        p for p in ogg_files if
-        p.is_symbolic_link is True and p.target_path is not None])
+    writer.warnings(
+        f"The following symlinks chain through "
+        f"more than {max_hops} links:",
+        report["long_chains"], assets_folder)
 
-    # JSON records that point to vanilla sounds
-    file_paths.extend(events.get_sound_files_in(vanilla_events))
+    writer.warnings(
+        "The following symlinks lead outside the assets folder, "
+        "and will break once the pack is zipped:",
+        report["escaping"], assets_folder)
 
-    # Based on the 3 categories, above, the following are bad
-    events_sounds = events.get_sound_files()
-    broken_links = [p for p in events_sounds if p not in file_paths]
+    writer.warnings(
+        "The following symlinks lead back to themselves:",
+        report["cycles"], assets_folder)
 
-    return sorted(broken_links)  # noqa
+    writer.warnings(
+        "The following symlinks lead nowhere:",
+        report["dangling"], assets_folder)
 
+    writer.flush()
 
-def get_invalid_file_names(ogg_files: list[CPath]) -> list[CPath]:
+
+def main_stack(args):
+    """Merge the given packs over vanilla and report the result"""
+
+    yellow = "\033[33m"
+    white = "\033[97m"
+    bold = "\033[1m"
+    default = "\033[0m"
+
+    index: VanillaIndex = get_vanilla(args)
+    vanilla = Pack.from_json(
+        "vanilla", {"minecraft": index.raw_json},
+        set(index.sound_files) if index.sound_files is not None else None)
+    stack = PackStack(vanilla)
+
+    # Packs are known by their file name, unless another pack shares it
+    names: list[str] = [p.name for p in args.packs]
+
+    print(f"{bold}{white}Stacking packs:{default}")
+    for path in args.packs:
+        if not path.exists():
+            sys.exit(f"Specified path not found. "
+                     f"{path} is not a valid filesystem path.")
+
+        print(f"{yellow}{path}{default}")
+        try:
+            stack.add_pack(Pack.from_path(
+                path, path.name if names.count(path.name) == 1
+                else str(path), args.ignore))
+        except ValueError as e:
+            sys.exit(str(e))
+
+    print_stack_report(stack)
+
+
+def main_diff(args):
+    """Compare two versions of a pack and list what changed"""
+
+    yellow = "\033[33m"
+    white = "\033[97m"
+    bold = "\033[1m"
+    default = "\033[0m"
+
+    print(f"{bold}{white}Comparing packs:{default}")
+
+    indexes: list[PackIndex] = []
+    for path in args.packs:
+        if not path.exists():
+            sys.exit(f"Specified path not found. "
+                     f"{path} is not a valid filesystem path.")
+
+        print(f"{yellow}{path}{default}")
+        try:
+            indexes.append(PackIndex.from_path(path, args.ignore))
+        except ValueError as e:
+            sys.exit(str(e))
+
+    writer = ReportWriter(full=args.full, examples=args.examples)
+    writer.pack_diff(diff_packs(*indexes))
+    writer.flush()
+
+
+def find_indexed_pack(args, index: ReferenceIndex) -> tuple[int, str]:
     """
-    Given a list of paths, generate a list of paths that
-    violate Mojang's naming rules.
-    :param: ogg_files: A list of paths
-    :return: A list of the paths that fail Mojang's naming test
+    The pack a query is about: the one given, the one holding the file
+    asked about, or the one in the current folder
     """
 
-    pattern = re.compile("^[a-z0-9/._-]+$")
-    bad_names = [n for n in ogg_files if not pattern.match(str(n))]
-    return sorted(bad_names)  # noqa
+    if args.pack is not None:
+        path: CPath = args.pack
+    elif args.query_kind == "file" and os.path.exists(args.query):
+        path = CPath(args.query)
+    else:
+        path = CPath.cwd()
 
+    if path.is_dir():
+        path = find_sounds_json(path)
 
-def print_warnings(message: str, files: list[CPath], assets_folder: CPath):
+    pack = index.find_pack(path)
+    if pack is None:
+        sys.exit(f"{path} hasn't been indexed yet. "
+                 f"Check it once with --index, then query it.")
 
-    if len(files) == 0:
-        return
+    return pack
 
-    red = "\033[31m"
+
+def main_query(args):
+    """Look up which events play a file, or which files an event plays"""
+
+    white = "\033[97m"
+    bold = "\033[1m"
     default = "\033[0m"
 
-    print(f"{red}\n{message}{default}")
-    [print(f" .../{f.relative_to(assets_folder)}") for f in files]
+    with ReferenceIndex(default_index_path(args.cache_dir)) as index:
+        pack, assets_folder = find_indexed_pack(args, index)
+        writer = ReportWriter(full=args.full, examples=args.examples)
 
+        if args.query_kind == "file":
+            # On disk, or already relative to the assets folder
+            file: str = args.query
+            if os.path.exists(file) or os.path.isabs(file):
+                file = os.path.relpath(os.path.abspath(file), assets_folder)
 
-def print_summary(events: SoundEventHandler, ogg_files: list[CPath]):
+            print(f"{bold}{white}{file}{default}")
+            writer.names("Played by:", [
+                event if via is None else f"{event} (through {via})"
+                for event, via in index.get_events_playing(pack, file)])
+            if index.is_vanilla(file):
+                writer.write("\nVanilla has this file too\n")
+        else:
+            if not index.has_event(pack, args.query):
+                sys.exit(f"No event {args.query} in {assets_folder}")
 
-    green = "\033[32m"
-    default = "\033[0m"
+            print(f"{bold}{white}{args.query}{default}")
+            writer.names("Plays:", [
+                f"{file} ({origin})"
+                for file, origin in index.get_files_played(pack, args.query)])
 
-    # Sound count / summary
-    bar = "-" * 56
-    print(f"{green}\n{bar}\nSound count:\n")
-    count: int = 0
+        writer.flush()
 
-    for key in events.get_event_names():
 
-        paths = set(ogg_files).intersection(events.get_sound_files(key))
+def update_index(args, checker: PackChecker, result: CheckResult):
+    """File a checked folder's references for query mode"""
+
+    try:
+        with ReferenceIndex(default_index_path(args.cache_dir)) as index:
+            index.update(result, checker.vanilla,
+                         checker.get_ignore_rules(result.assets_folder))
+    except (OSError, sqlite3.Error) as e:
+        # Like the cache, the index must never fail a check
+        print(f"Couldn't update the reference index: {e}", file=sys.stderr)
 
-        c = len(paths)
-        if c > 0:
-            print(f"{key} -> {c}")
-            count += c
 
-    print(f"\nTotal sounds: {count}\n{bar}{default}")
+def main_serve(args):
+    """Keep indexes warm and answer check requests on a socket"""
+
+    server = CheckServer(
+        args.socket, PackChecker(get_vanilla(args), args.ignore))
+
+    print(f"Listening on {args.socket}")
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        pass
 
 
 # Main -------------------------------------------------
@@ -246,93 +749,191 @@ def main():
     if not args.no_clear:
         os.system('cls||clear')
 
-    print(f"{bold}{white}Scanning file:\n{default}{yellow}{args.path}")
-
-    # Handle .zip files
-    if args.path.suffix == ".zip":
-
-        # Create temp directory
-        zip_dir = TemporaryDirectory(dir="/tmp")
-
-        # Extract contents of zip to temp dir
-        file = zipfile.ZipFile(args.path)
-        file.extractall(path=zip_dir.name)
-
-        # Set args.path to the location of sounds.json within the temp dir
-        sounds_json_paths = list(CPath(zip_dir.name).glob("**/sounds.json"))
-
-        # If it can find sounds.json, retrieve that path for the rest
-        # of the processing.
-        if len(sounds_json_paths) == 1:
-            args.path = sounds_json_paths[0]
-
-    # The "trunk" of our tree
-    assets_folder: CPath = args.path.parent.parent
-
-    # All sound event records in sounds.json
-    with open(args.path, "r") as file:
-        events = SoundEventHandler(assets_folder, json.load(file))
-
-    # All files in the entire folder structure
-    all_files: list[CPath] = get_all_files(assets_folder)
-
-    # All sound event records in the vanilla game
-    script_home_path: CPath = CPath(__file__).absolute().resolve().parent
-
-    with open(script_home_path / CPath("vanilla-sounds.json"), "r") as file:
-        vanilla_events = SoundEventHandler(assets_folder, json.load(file))
-
-    # Collect all the files that don't belong in the pack
-    irrelevant_files: list[CPath] = get_irrelevant_files(all_files)
-
-    # Remove the irrelevant files from our list
-    ogg_files = [
-        f for f in all_files if f.suffix == ".ogg" and f not in irrelevant_files]
-
-    # Collect all the ogg files that have no JSON reference
-    orphaned_files: list[CPath] = get_orphaned_files(events, ogg_files)
+    if args.mode == "stack":
+        main_stack(args)
+        return
 
-    # Remove the orphans from our list
-    ogg_files = [f for f in ogg_files if f not in orphaned_files]
+    if args.mode == "serve":
+        main_serve(args)
+        return
 
-    # Collect all the JSON references that have no corresponding ogg file
-    broken_links: list[CPath] = (
-        get_broken_links(events, vanilla_events, ogg_files))
+    if args.mode == "diff":
+        main_diff(args)
+        return
 
-    # Remove the orphans from our list
-    ogg_files = [f for f in ogg_files if f not in broken_links]
+    if args.mode == "query":
+        main_query(args)
+        return
 
-    invalid_file_names: list = get_invalid_file_names(ogg_files)
+    print(f"{bold}{white}Scanning file:\n{default}{yellow}{args.path}")
 
-    # Remove the orphans from our list
-    ogg_files = [f for f in ogg_files if f not in invalid_file_names]
+    checker = PackChecker(get_vanilla(args), args.ignore)
+    found: set[str] = set()
+
+    if args.verify_archive:
+        if args.path.suffix not in ARCHIVE_SUFFIXES:
+            sys.exit("--verify-archive needs a .zip or .jar file")
+
+        try:
+            corrupt_members: list[CorruptMember] = verify_archive(args.path)
+        except ValueError as e:
+            sys.exit(str(e))
+
+        writer = ReportWriter(full=args.full, examples=args.examples)
+        writer.corrupt_members(
+            "The following archive members are corrupt or truncated:",
+            corrupt_members)
+        writer.flush()
+
+        if len(corrupt_members) > 0:
+            found.add("corrupt_members")
+
+    if args.streaming:
+        if args.path.suffix in ARCHIVE_SUFFIXES:
+            sys.exit("--streaming needs a folder")
+        if (args.stream_advice or args.overrides or args.fail_fast
+                or args.deep):
+            sys.exit("--streaming can't be combined with --stream-advice, "
+                     "--overrides, --deep or --fail-fast")
+
+        writer = ReportWriter(full=args.full, examples=args.examples)
+        assets_folder: CPath = args.path.parent.parent
+
+        with StreamingChecker(
+                checker, args.memory_budget * 1024 * 1024).check_path(
+                    args.path,
+                    on_finding=lambda category, path: writer.finding(
+                        FINDING_LABELS[category], path, assets_folder)
+                ) as result:
+            print_stream_result(result, writer, listed=True)
+            found.update(result.get_found_categories())
+
+        if args.links:
+            print_link_report(
+                SymlinkGraph(result.assets_folder).analyze(
+                    list_symlinks(
+                        result.assets_folder,
+                        checker.get_ignore_rules(result.assets_folder)),
+                    args.max_link_hops),
+                result.assets_folder, args.max_link_hops,
+                ReportWriter(full=args.full, examples=args.examples))
+
+        exit_code: int = get_exit_code(found, args.fail_on)
+        if exit_code != 0:
+            sys.exit(exit_code)
+        return
 
-    # Print all the warnings to the user
-    print_warnings(
-        "The following files are not .ogg files, "
-        "but are in the sound folders anyway:",
-        irrelevant_files,
-        assets_folder)
+    if args.links and args.path.suffix in ARCHIVE_SUFFIXES:
+        sys.exit("--links needs a folder, archives keep no symlinks")
 
-    print_warnings(
-        "The following paths exist in JSON, "
-        "but do not correspond to actual file system files:",
-        broken_links,
-        assets_folder)
+    if args.stream_advice and args.path.suffix in ARCHIVE_SUFFIXES:
+        sys.exit("--stream-advice needs a folder")
 
-    print_warnings(
-        "The following .ogg files exist, "
-        "but no JSON record refers to them: ",
-        orphaned_files,
-        assets_folder)
+    if args.deep and args.path.suffix in ARCHIVE_SUFFIXES:
+        sys.exit("--deep needs a folder, use --verify-archive for archives")
 
-    print_warnings(
-        "The following file names violate "
-        "Mojang's naming constraints:",
-        invalid_file_names,
-        assets_folder)
+    try:
+        if args.changed_since is not None:
+            results: list[CheckResult] = [
+                ChangedFilesChecker(checker).check_path(
+                    args.path, args.changed_since)]
+        elif args.path.suffix in ARCHIVE_SUFFIXES:
+            results: list[CheckResult] = checker.check_archive(args.path)
+        elif args.fail_fast:
+            results: list[CheckResult] = [FailFastChecker(checker).check_path(
+                args.path, args.fail_on)]
+        elif args.cache:
+            cache = CheckCache(args.cache_dir)
+            results: list[CheckResult] = [ResultCache(
+                IncrementalChecker(checker, cache), cache).check_path(args.path)]
+        else:
+            results: list[CheckResult] = [checker.check_path(args.path)]
+    except ValueError as e:
+        sys.exit(str(e))
 
-    print_summary(events, ogg_files)
+    for result in results:
+        # Archives can hold several packs; say which one this is
+        if len(results) > 1:
+            print(f"{bold}{white}\nPack:\n{default}{yellow}"
+                  f"{result.sounds_json}{default}")
+
+        print_result(
+            result, ReportWriter(full=args.full, examples=args.examples),
+            summary=not args.fail_fast)
+
+        found.update(result.get_found_categories())
+
+    # Nothing runs after the finding that fails a fail-fast check
+    if args.fail_fast and get_exit_code(found, args.fail_on) != 0:
+        sys.exit(get_exit_code(found, args.fail_on))
+
+    # Only a whole check of a folder sees every reference and link
+    if (args.index and args.changed_since is None
+            and not args.fail_fast
+            and args.path.suffix not in ARCHIVE_SUFFIXES):
+        update_index(args, checker, results[0])
+
+    if args.links:
+        assets_folder: CPath = results[0].assets_folder
+        print_link_report(
+            SymlinkGraph(assets_folder).analyze(
+                list_symlinks(
+                    assets_folder, checker.get_ignore_rules(assets_folder)),
+                args.max_link_hops),
+            assets_folder, args.max_link_hops,
+            ReportWriter(full=args.full, examples=args.examples))
+
+    if args.stream_advice:
+        result: CheckResult = results[0]
+        writer = ReportWriter(full=args.full, examples=args.examples)
+        writer.stream_advice(advise_streaming(
+            result.events if result.events is not None
+            else load_events(result.sounds_json,
+                             checker.get_ignore_rules(result.assets_folder)),
+            result.file_sizes, args.stream_seconds,
+            args.preload_budget * 1024))
+        writer.flush()
+
+    if args.deep:
+        result: CheckResult = results[0]
+        corrupt_sounds: list[CorruptSound] = verify_sounds(
+            result.assets_folder,
+            [f for f in result.get_sound_file_names() + [
+                str(f) for f in result.findings["orphaned_files"]
+                + result.findings["invalid_file_names"]]
+             if f.endswith(".ogg")],
+            CheckCache(args.cache_dir))
+
+        writer = ReportWriter(full=args.full, examples=args.examples)
+        writer.corrupt_members(
+            "The following sound files are corrupt or truncated:",
+            corrupt_sounds)
+        writer.flush()
+
+        if len(corrupt_sounds) > 0:
+            found.add("corrupt_sounds")
+
+    if args.overrides:
+        writer = ReportWriter(full=args.full, examples=args.examples)
+        for result in results:
+            prefix: str = str(result.assets_folder) + "/"
+            writer.overrides(find_overrides(
+                result.events if result.events is not None
+                else load_events(
+                    result.sounds_json,
+                    checker.get_ignore_rules(result.assets_folder)),
+                checker.vanilla.keys,
+                [f.removeprefix(prefix) for f in
+                 result.get_sound_file_names() + [
+                     str(f) for f in result.findings["orphaned_files"]
+                     + result.findings["invalid_file_names"]]],
+                result.sounds_json.parent.name))
+        writer.flush()
+
+    # Let CI tell a clean pack from each kind of problem
+    exit_code: int = get_exit_code(found, args.fail_on)
+    if exit_code != 0:
+        sys.exit(exit_code)
 
 
 # ------------------------------------------------------
@@ -0,0 +1,94 @@
+import io
+import json
+import zipfile
+
+from objects.archive_reader import find_sounds_jsons, iter_archives
+from objects.custom_path import CPath
+from objects.pack_checker import PackChecker, VanillaIndex
+
+
+def make_zip(files: dict[str, bytes | str]) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in files.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+def make_pack(sound: str) -> dict[str, str]:
+    return {
+        "assets/minecraft/sounds.json": json.dumps(
+            {"entity.cow.ambient": {"sounds": [sound]}}),
+        f"assets/minecraft/sounds/{sound}.ogg": "",
+        "assets/minecraft/sounds/stray.ogg": ""}
+
+
+def make_modpack(tmp_path) -> CPath:
+    """A modpack zip holding a pack, and a mod jar holding another"""
+
+    jar: bytes = make_zip({
+        "com/example/Mod.class": b"\xca\xfe\xba\xbe",
+        "META-INF/MANIFEST.MF": "",
+        **make_pack("mod/ping")})
+
+    path = tmp_path / "modpack.zip"
+    path.write_bytes(make_zip({
+        "mods/example.jar": jar,
+        "resourcepacks/cows.zip": make_zip(make_pack("cow/moo")),
+        "config/notes.txt": ""}))
+
+    return CPath(path)
+
+
+def test_find_sounds_jsons_should_only_find_namespace_sounds_jsons():
+
+    assert find_sounds_jsons([
+        "assets/minecraft/sounds.json",
+        "pack/assets/other/sounds.json",
+        "minecraft/sounds.json",
+        "sounds.json",
+        "data/minecraft/misc/sounds.json"]) == [
+        "assets/minecraft/sounds.json",
+        "minecraft/sounds.json",
+        "pack/assets/other/sounds.json"]
+
+
+def test_iter_archives_should_open_nested_archives(tmp_path):
+
+    path = make_modpack(tmp_path)
+
+    locations = [str(location.relative_to(path))
+                 for location, _, _ in iter_archives(path)]
+
+    assert locations == [".", "mods/example.jar", "resourcepacks/cows.zip"]
+
+
+def test_iter_archives_should_spill_large_archives(tmp_path):
+
+    path = make_modpack(tmp_path)
+
+    # Everything is over the threshold, and still readable
+    names = {str(location.relative_to(path)): names
+             for location, _, names in iter_archives(path, spill_threshold=1)}
+
+    assert "assets/minecraft/sounds/cow/moo.ogg" in (
+        names["resourcepacks/cows.zip"])
+
+    # Nothing was extracted next to the archive
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_check_archive_should_check_every_embedded_pack(tmp_path):
+
+    path = make_modpack(tmp_path)
+
+    results = PackChecker(VanillaIndex({})).check_archive(path)
+
+    assert [str(r.sounds_json.relative_to(path)) for r in results] == [
+        "mods/example.jar/assets/minecraft/sounds.json",
+        "resourcepacks/cows.zip/assets/minecraft/sounds.json"]
+
+    for result in results:
+        assert result.get_relative("orphaned_files") == [
+            "minecraft/sounds/stray.ogg"]
+        assert result.sound_counts == {"entity.cow.ambient": 1}
@@ -0,0 +1,74 @@
+import os
+import zipfile
+
+from objects.archive_verifier import verify_archive, verify_members
+from objects.custom_path import CPath
+
+DATA: bytes = bytes(range(256)) * 4096
+
+
+def make_archive(tmp_path, compression: int) -> CPath:
+    path = tmp_path / "pack.zip"
+    with zipfile.ZipFile(path, "w", compression) as archive:
+        archive.writestr("assets/minecraft/sounds.json", "{}")
+        archive.writestr("assets/minecraft/sounds/big.ogg", DATA)
+    return CPath(path)
+
+
+def damage(path: CPath, name: str):
+    """Flip a byte in the middle of a member's data"""
+
+    with zipfile.ZipFile(path) as archive:
+        info = archive.getinfo(name)
+
+    with open(path, "r+b") as file:
+        position = info.header_offset + 100 + info.compress_size // 2
+        file.seek(position)
+        byte = file.read(1)
+        file.seek(position)
+        file.write(bytes([byte[0] ^ 0xFF]))
+
+
+def test_verify_archive_should_pass_intact_archives(tmp_path):
+
+    for compression in [zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED]:
+        path = make_archive(tmp_path, compression)
+        assert verify_archive(path, chunk_size=4096) == []
+
+
+def test_verify_archive_should_report_corrupt_stored_members(tmp_path):
+
+    path = make_archive(tmp_path, zipfile.ZIP_STORED)
+    damage(path, "assets/minecraft/sounds/big.ogg")
+
+    result = verify_archive(path)
+
+    assert [r["name"] for r in result] == ["assets/minecraft/sounds/big.ogg"]
+    assert result[0]["problem"].startswith("corrupt: CRC")
+
+
+def test_verify_archive_should_report_corrupt_deflated_members(tmp_path):
+
+    path = make_archive(tmp_path, zipfile.ZIP_DEFLATED)
+    damage(path, "assets/minecraft/sounds/big.ogg")
+
+    result = verify_archive(path, chunk_size=1024)
+
+    assert [r["name"] for r in result] == ["assets/minecraft/sounds/big.ogg"]
+    assert result[0]["problem"].startswith("corrupt")
+
+
+def test_verify_members_should_report_truncated_members(tmp_path):
+
+    path = make_archive(tmp_path, zipfile.ZIP_STORED)
+    with zipfile.ZipFile(path) as archive:
+        infos = archive.infolist()
+
+    # Cut the file off halfway through the last member
+    os.truncate(path, infos[-1].header_offset + 1000)
+
+    result = verify_members(path, infos)
+
+    assert result == [{"name": "assets/minecraft/sounds/big.ogg",
+                       "problem": f"truncated: {1000 - 30 - 31} "
+                                  f"of {len(DATA)} bytes"}]
@@ -0,0 +1,176 @@
+import asyncio
+import io
+import os
+import threading
+import zipfile
+
+import pytest
+
+from objects.async_checker import AsyncPackChecker
+from objects.custom_path import CPath
+from objects.pack_checker import PackChecker, VanillaIndex
+
+
+def make_pack(root, folders: int = 1) -> CPath:
+    (root / "minecraft").mkdir(parents=True)
+    (root / "minecraft/sounds.json").write_text(
+        '{"entity.cow.ambient": {"sounds": ["f0/moo", "f0/missing"]}}')
+
+    for i in range(folders):
+        folder = root / f"minecraft/sounds/f{i}"
+        folder.mkdir(parents=True)
+        (folder / "moo.ogg").write_text("")
+        (folder / "notes.txt").write_text("")
+
+    return CPath(root / "minecraft")
+
+
+def make_checker() -> AsyncPackChecker:
+    return AsyncPackChecker(PackChecker(VanillaIndex({})), max_workers=2)
+
+
+def test_async_checker_should_match_the_blocking_checker(tmp_path):
+
+    path = make_pack(tmp_path, folders=3)
+
+    async def check():
+        async with make_checker() as checker:
+            return await checker.check(path)
+
+    result = asyncio.run(check())
+    expected = PackChecker(VanillaIndex({})).check_path(path)
+
+    assert result.findings == expected.findings
+    assert result.sound_counts == expected.sound_counts
+    assert result.file_sizes == expected.file_sizes
+
+
+def test_async_checker_should_yield_irrelevant_files_before_other_findings(tmp_path):
+
+    path = make_pack(tmp_path)
+
+    async def collect():
+        async with make_checker() as checker:
+            return [f async for f in checker.iter_findings(path)]
+
+    result = asyncio.run(collect())
+
+    assert result == [
+        {"category": "irrelevant_files",
+         "path": "minecraft/sounds/f0/notes.txt"},
+        {"category": "broken_links",
+         "path": "minecraft/sounds/f0/missing.ogg"}]
+
+
+def test_async_checker_should_check_several_packs_concurrently(tmp_path):
+
+    paths = [make_pack(tmp_path / str(i), folders=2) for i in range(4)]
+
+    async def check_all():
+        async with make_checker() as checker:
+            return await asyncio.gather(*[checker.check(p) for p in paths])
+
+    results = asyncio.run(check_all())
+
+    assert [r.get_relative("broken_links") for r in results] == (
+        [["minecraft/sounds/f0/missing.ogg"]] * 4)
+
+
+def test_async_checker_should_stop_cleanly_when_cancelled_mid_scan(tmp_path):
+
+    path = make_pack(tmp_path, folders=50)
+
+    async def cancel_after_first_finding():
+        async with make_checker() as checker:
+            seen = []
+
+            async def consume():
+                async for finding in checker.iter_findings(path):
+                    seen.append(finding)
+                    await asyncio.sleep(1)
+
+            task = asyncio.create_task(consume())
+            while len(seen) == 0:
+                await asyncio.sleep(0.01)
+            task.cancel()
+
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+            # The checker is still usable afterwards
+            result = await checker.check(path)
+            return seen, result
+
+    seen, result = asyncio.run(cancel_after_first_finding())
+
+    assert len(seen) == 1
+    assert len(result.findings["irrelevant_files"]) == 50
+
+
+def test_async_checker_should_check_packs_nested_in_a_jar(tmp_path):
+
+    inner = io.BytesIO()
+    with zipfile.ZipFile(inner, "w") as archive:
+        archive.writestr(
+            "assets/minecraft/sounds.json",
+            '{"entity.cow.ambient": {"sounds": ["moo", "missing"]}}')
+        archive.writestr("assets/minecraft/sounds/moo.ogg", "")
+
+    path = tmp_path / "mod.jar"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("resourcepacks/pack.zip", inner.getvalue())
+
+    async def check():
+        async with make_checker() as checker:
+            return await checker.check(CPath(path))
+
+    result = asyncio.run(check())
+
+    assert result.get_relative("broken_links") == [
+        "minecraft/sounds/missing.ogg"]
+
+
+def test_async_checker_should_keep_files_reached_through_a_symlink_chain(tmp_path):
+
+    sounds = tmp_path / "minecraft/sounds"
+    sounds.mkdir(parents=True)
+    (tmp_path / "minecraft/sounds.json").write_text(
+        '{"entity.cow.ambient": {"sounds": ["link"]}}')
+    (sounds / "target.ogg").write_text("")
+    os.symlink("target.ogg", sounds / "hop.ogg")
+    os.symlink("hop.ogg", sounds / "link.ogg")
+
+    path = CPath(tmp_path / "minecraft")
+
+    async def check():
+        async with make_checker() as checker:
+            return await checker.check(path)
+
+    result = asyncio.run(check())
+
+    assert result.findings["orphaned_files"] == []
+    assert result.findings == \
+        PackChecker(VanillaIndex({})).check_path(path).findings
+
+
+def test_async_checker_should_read_ignore_rules_off_the_event_loop(tmp_path):
+
+    path = make_pack(tmp_path)
+    checker = make_checker()
+    threads: list[threading.Thread] = []
+    read_rules = checker.checker.get_ignore_rules
+
+    def recording_read_rules(assets_folder):
+        threads.append(threading.current_thread())
+        return read_rules(assets_folder)
+
+    checker.checker.get_ignore_rules = recording_read_rules
+
+    async def check():
+        async with checker:
+            return await checker.check(path)
+
+    asyncio.run(check())
+
+    assert len(threads) == 1
+    assert threads[0] is not threading.main_thread()
@@ -0,0 +1,133 @@
+import json
+import subprocess
+
+import pytest
+
+from objects.changed_files import ChangedFilesChecker
+from objects.custom_path import CPath
+from objects.pack_checker import PackChecker, VanillaIndex
+
+
+def run_git(repository, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com",
+         *args],
+        cwd=repository, check=True, capture_output=True)
+
+
+def write_events(repository, events: dict):
+    (repository / "assets/minecraft/sounds.json").write_text(
+        json.dumps(events))
+
+
+@pytest.fixture
+def repository(tmp_path):
+    """A throwaway git repository holding a committed, clean pack"""
+
+    sounds = tmp_path / "assets/minecraft/sounds"
+    (sounds / "cow").mkdir(parents=True)
+    (sounds / "pig").mkdir(parents=True)
+    for name in ["cow/moo", "cow/moo2", "pig/oink"]:
+        (sounds / f"{name}.ogg").write_text("")
+
+    write_events(tmp_path, {
+        "entity.cow.ambient": {"sounds": ["cow/moo", "cow/moo2"]},
+        "entity.pig.ambient": {"sounds": ["pig/oink"]}})
+
+    run_git(tmp_path, "init", "-q")
+    run_git(tmp_path, "add", "-A")
+    run_git(tmp_path, "commit", "-q", "-m", "pack")
+
+    return tmp_path
+
+
+def check(repository):
+    checker = ChangedFilesChecker(PackChecker(VanillaIndex({})))
+    return checker.check_path(
+        CPath(repository / "assets/minecraft"), "HEAD")
+
+
+def test_changed_files_checker_should_report_nothing_when_nothing_changed(repository):
+
+    result = check(repository)
+
+    assert result.has_findings() is False
+
+
+def test_changed_files_checker_should_catch_findings_introduced_by_new_files(repository):
+
+    sounds = repository / "assets/minecraft/sounds"
+    (sounds / "cow/stray.ogg").write_text("")
+    (sounds / "cow/readme.txt").write_text("")
+    (sounds / "pig/oink.ogg").unlink()
+
+    result = check(repository)
+
+    assert result.get_relative("orphaned_files") == [
+        "minecraft/sounds/cow/stray.ogg"]
+    assert result.get_relative("irrelevant_files") == [
+        "minecraft/sounds/cow/readme.txt"]
+    assert result.get_relative("broken_links") == [
+        "minecraft/sounds/pig/oink.ogg"]
+
+
+def test_changed_files_checker_should_compare_sounds_json_event_by_event(repository):
+
+    (repository / "assets/minecraft/sounds/pig/Squeal.ogg").write_text("")
+    write_events(repository, {
+        "entity.cow.ambient": {"sounds": ["cow/moo"]},
+        "entity.pig.ambient": {"sounds": ["pig/oink", "pig/Squeal",
+                                          "pig/missing"]}})
+
+    result = check(repository)
+
+    # Dropping a reference leaves its file orphaned
+    assert result.get_relative("orphaned_files") == [
+        "minecraft/sounds/cow/moo2.ogg"]
+    assert result.get_relative("broken_links") == [
+        "minecraft/sounds/pig/missing.ogg"]
+    assert result.get_relative("invalid_file_names") == [
+        "minecraft/sounds/pig/Squeal.ogg"]
+    assert result.sound_counts == {
+        "entity.cow.ambient": 1, "entity.pig.ambient": 1}
+
+
+def test_changed_files_checker_should_match_a_full_check_of_the_change(repository):
+
+    (repository / "assets/minecraft/sounds/cow/stray.ogg").write_text("")
+    write_events(repository, {
+        "entity.cow.ambient": {"sounds": ["cow/moo", "cow/gone"]},
+        "entity.pig.ambient": {"sounds": ["pig/oink"]}})
+
+    result = check(repository)
+    full = PackChecker(VanillaIndex({})).check_path(
+        CPath(repository / "assets/minecraft"))
+
+    for category in result.findings:
+        assert result.get_relative(category) == full.get_relative(category)
+
+
+def test_changed_files_checker_should_raise_value_error_outside_a_repository(tmp_path):
+
+    (tmp_path / "assets/minecraft").mkdir(parents=True)
+    write_events(tmp_path, {})
+
+    with pytest.raises(ValueError):
+        check(tmp_path)
+
+
+def test_changed_files_checker_should_compare_every_namespace(repository):
+
+    # A new namespace playing a file that was an orphan-to-be
+    (repository / "assets/farm").mkdir()
+    (repository / "assets/farm/sounds.json").write_text(json.dumps(
+        {"moo": {"sounds": ["cow/moo", "cow/gone"]}}))
+    write_events(repository, {
+        "entity.cow.ambient": {"sounds": ["cow/moo2"]},
+        "entity.pig.ambient": {"sounds": ["pig/oink"]}})
+
+    result = check(repository)
+
+    assert result.get_relative("orphaned_files") == []
+    assert result.get_relative("broken_links") == [
+        "minecraft/sounds/cow/gone.ogg"]
@@ -0,0 +1,229 @@
+import asyncio
+import json
+import os
+
+from objects import lang_index
+from objects.check_server import CheckServer
+from objects.custom_path import CPath
+from objects.pack_checker import PackChecker, VanillaIndex
+
+
+async def request(socket_path: str, *requests: dict) -> list[dict]:
+
+    reader, writer = await asyncio.open_unix_connection(socket_path)
+
+    responses: list[dict] = []
+    for r in requests:
+        writer.write(json.dumps(r).encode() + b"\n")
+        await writer.drain()
+        responses.append(json.loads(await reader.readline()))
+
+    writer.close()
+    await writer.wait_closed()
+    return responses
+
+
+def run_with_server(tmp_path, client):
+
+    socket_path = str(tmp_path / "spcheck.sock")
+    server = CheckServer(socket_path, PackChecker(VanillaIndex({})))
+
+    async def scenario():
+        task = asyncio.create_task(server.serve())
+        while not (tmp_path / "spcheck.sock").exists():
+            await asyncio.sleep(0.01)
+        try:
+            return await client(socket_path)
+        finally:
+            task.cancel()
+
+    return asyncio.run(scenario())
+
+
+def test_check_server_should_answer_check_requests_with_relative_paths(tmp_path):
+
+    (tmp_path / "minecraft/sounds").mkdir(parents=True)
+    (tmp_path / "minecraft/sounds.json").write_text(
+        '{"entity.cow.ambient": {"sounds": ["a"]}}')
+    (tmp_path / "minecraft/sounds/a.ogg").write_text("")
+    (tmp_path / "minecraft/sounds/b.ogg").write_text("")
+
+    path = str(tmp_path / "minecraft")
+    first, second = run_with_server(
+        tmp_path,
+        lambda s: request(s, {"command": "check", "path": path},
+                          {"command": "check", "path": path}))
+
+    assert first["ok"] is True
+    assert first["orphaned_files"] == ["minecraft/sounds/b.ogg"]
+    assert first["broken_links"] == []
+    assert first["sound_counts"] == {"entity.cow.ambient": 1}
+    assert first["sounds_json_reloaded"] is True
+
+    # Nothing changed, so nothing is read again
+    assert second["sounds_json_reloaded"] is False
+    assert second["directories_relisted"] == 0
+
+
+def test_check_server_should_serve_clients_concurrently(tmp_path):
+
+    async def clients(socket_path):
+        return await asyncio.gather(
+            *[request(socket_path, {"command": "ping"}) for _ in range(5)])
+
+    result = run_with_server(tmp_path, clients)
+
+    assert result == [[{"ok": True}]] * 5
+
+
+def test_check_server_should_report_errors_without_disconnecting(tmp_path):
+
+    result = run_with_server(
+        tmp_path,
+        lambda s: request(s, {"command": "bogus"}, {"command": "ping"}))
+
+    assert result[0] == {"ok": False, "error": "ValueError: Unknown command: bogus"}
+    assert result[1] == {"ok": True}
+
+
+def test_check_server_should_reject_requests_that_are_not_objects(tmp_path):
+
+    async def client(socket_path):
+        reader, writer = await asyncio.open_unix_connection(socket_path)
+        responses: list[dict] = []
+        for line in [b"[]\n", b'"x"\n', b'{"path": 1}\n', b"{}\n"]:
+            writer.write(line)
+            await writer.drain()
+            responses.append(json.loads(await reader.readline()))
+        writer.close()
+        await writer.wait_closed()
+        return responses
+
+    result = run_with_server(tmp_path, client)
+
+    assert [r["ok"] for r in result] == [False] * 4
+    assert result[0]["error"] == "ValueError: Requests must be JSON objects"
+    assert result[2]["error"] == "ValueError: check needs a path"
+
+
+def test_check_server_should_find_sounds_json_like_the_command_line(tmp_path):
+
+    (tmp_path / "pack/assets/minecraft/sounds").mkdir(parents=True)
+    (tmp_path / "pack/assets/minecraft/sounds.json").write_text(
+        '{"entity.cow.ambient": {"sounds": ["a"]}}')
+    (tmp_path / "pack/assets/minecraft/sounds/a.ogg").write_text("")
+    (tmp_path / "other/minecraft").mkdir(parents=True)
+    (tmp_path / "other/minecraft/sounds.json").write_text("{}")
+
+    socket_path = str(tmp_path / "spcheck.sock")
+    server = CheckServer(
+        socket_path, PackChecker(VanillaIndex({})), max_packs=1)
+
+    async def scenario():
+        task = asyncio.create_task(server.serve())
+        while not (tmp_path / "spcheck.sock").exists():
+            await asyncio.sleep(0.01)
+        try:
+            return await request(
+                socket_path,
+                {"command": "check", "path": str(tmp_path / "pack")},
+                {"command": "check", "path": str(tmp_path / "nowhere")},
+                {"command": "check", "path": str(tmp_path / "other")})
+        finally:
+            task.cancel()
+
+    found, missing, other = asyncio.run(scenario())
+
+    assert found["ok"] is True
+    assert found["sounds_json"] == str(
+        tmp_path / "pack/assets/minecraft/sounds.json")
+    assert found["sound_counts"] == {"entity.cow.ambient": 1}
+    assert missing["ok"] is False
+
+    # Only the most recently checked pack is kept warm
+    assert other["ok"] is True
+    assert list(server.packs) == [
+        tmp_path / "other/minecraft/sounds.json"]
+
+
+def test_check_server_should_keep_files_reached_through_a_symlink_chain(tmp_path):
+
+    sounds = tmp_path / "minecraft/sounds"
+    sounds.mkdir(parents=True)
+    (tmp_path / "minecraft/sounds.json").write_text(
+        '{"entity.cow.ambient": {"sounds": ["link"]}}')
+    (sounds / "target.ogg").write_text("")
+    os.symlink("target.ogg", sounds / "hop.ogg")
+    os.symlink("hop.ogg", sounds / "link.ogg")
+
+    path = str(tmp_path / "minecraft")
+    response, = run_with_server(
+        tmp_path, lambda s: request(s, {"command": "check", "path": path}))
+
+    assert response["orphaned_files"] == []
+    assert response["orphaned_files"] == PackChecker(VanillaIndex({})) \
+        .check_path(CPath(path)).findings["orphaned_files"]
+
+
+def test_check_server_should_reuse_results_until_something_changes(
+        tmp_path, monkeypatch):
+
+    (tmp_path / "minecraft/sounds").mkdir(parents=True)
+    (tmp_path / "minecraft/lang").mkdir()
+    (tmp_path / "minecraft/sounds.json").write_text(
+        '{"cow": {"sounds": ["a"], "subtitle": "subtitles.cow"}}')
+    (tmp_path / "minecraft/sounds/a.ogg").write_text("")
+    (tmp_path / "minecraft/lang/en_us.json").write_text("{}")
+
+    reads: list[str] = []
+    read_lang_folder = lang_index.read_lang_folder
+
+    def counting_read(assets_folder, namespace):
+        reads.append(namespace)
+        return read_lang_folder(assets_folder, namespace)
+
+    monkeypatch.setattr(lang_index, "read_lang_folder", counting_read)
+
+    path = str(tmp_path / "minecraft")
+
+    async def client(socket_path):
+        first, second = await request(
+            socket_path, {"command": "check", "path": path},
+            {"command": "check", "path": path})
+
+        (tmp_path / "minecraft/lang/en_us.json").write_text(
+            '{"subtitles.cow": "Cow moos"}')
+        os.utime(tmp_path / "minecraft/lang/en_us.json", ns=(1, 1))
+
+        third, = await request(
+            socket_path, {"command": "check", "path": path})
+        return first, second, third
+
+    first, second, third = run_with_server(tmp_path, client)
+
+    assert first["rechecked"] is True
+    assert first["missing_subtitles"] == {"en_us": ["subtitles.cow"]}
+    assert second["rechecked"] is False
+    assert second["missing_subtitles"] == first["missing_subtitles"]
+    assert reads == ["minecraft", "minecraft"]
+
+    assert third["lang_reloaded"] is True
+    assert third["rechecked"] is True
+    assert third["missing_subtitles"] == {}
+
+
+def test_check_server_should_report_malformed_packs(tmp_path):
+
+    (tmp_path / "minecraft").mkdir()
+    (tmp_path / "minecraft/sounds.json").write_text(
+        '{"cow": {"sounds": 5}}')
+
+    path = str(tmp_path / "minecraft")
+    result = run_with_server(
+        tmp_path,
+        lambda s: request(s, {"command": "check", "path": path},
+                          {"command": "ping"}))
+
+    assert result[0]["ok"] is False
+    assert result[0]["error"].startswith("TypeError: ")
+    assert result[1] == {"ok": True}
@@ -0,0 +1,98 @@
+import json
+
+from objects.custom_path import CPath
+from objects.fail_fast import FAIL_CODES, FailFastChecker, get_exit_code
+from objects.pack_checker import PackChecker, VanillaIndex
+
+
+class CountingVanilla(VanillaIndex):
+    """A vanilla index that counts how often its events are needed"""
+
+    def __init__(self, json_events: dict):
+        super().__init__(json_events)
+        self.loads: int = 0
+
+    def get_events(self, assets_folder):
+        self.loads += 1
+        return super().get_events(assets_folder)
+
+
+def make_pack(root, events: dict, files: list[str]) -> CPath:
+    (root / "minecraft/sounds").mkdir(parents=True)
+    (root / "minecraft/sounds.json").write_text(json.dumps(events))
+    for name in files:
+        (root / "minecraft/sounds" / name).write_text("")
+    return CPath(root / "minecraft")
+
+
+def check(path: CPath, fail_on: list[str], vanilla: VanillaIndex = None):
+    checker = PackChecker(vanilla or VanillaIndex({}))
+    return FailFastChecker(checker).check_path(path, fail_on)
+
+
+def test_fail_fast_should_stop_at_the_first_irrelevant_file(tmp_path):
+
+    path = make_pack(tmp_path, {"cow": {"sounds": ["missing"]}},
+                     ["notes.txt", "stray.ogg"])
+    vanilla = CountingVanilla({})
+
+    result = check(path, list(FAIL_CODES), vanilla)
+
+    assert result.get_found_categories() == {"irrelevant_files"}
+    assert result.get_relative("irrelevant_files") == [
+        "minecraft/sounds/notes.txt"]
+    assert vanilla.loads == 0
+
+
+def test_fail_fast_should_only_load_vanilla_for_broken_links(tmp_path):
+
+    path = make_pack(tmp_path, {"cow": {"sounds": ["moo", "vanilla"]}},
+                     ["moo.ogg"])
+    vanilla = CountingVanilla({"cow": {"sounds": ["vanilla"]}})
+
+    result = check(path, ["orphaned_files", "broken_links"], vanilla)
+
+    assert result.has_findings() is False
+    assert vanilla.loads == 1
+
+    (tmp_path / "minecraft/sounds/stray.ogg").write_text("")
+    result = check(path, ["orphaned_files", "broken_links"], vanilla)
+
+    assert result.get_relative("orphaned_files") == [
+        "minecraft/sounds/stray.ogg"]
+    assert vanilla.loads == 1
+
+
+def test_fail_fast_should_agree_with_a_full_check(tmp_path):
+
+    path = make_pack(tmp_path, {"cow": {"sounds": ["Moo", "gone"]}},
+                     ["Moo.ogg"])
+    full = PackChecker(VanillaIndex({})).check_path(path)
+
+    for category in full.get_found_categories():
+        assert check(path, [category]).get_found_categories() == {category}
+
+
+def test_get_exit_code_should_pick_the_most_serious_category():
+
+    found = {"irrelevant_files", "broken_links"}
+
+    assert get_exit_code(found, list(FAIL_CODES)) == FAIL_CODES["broken_links"]
+    assert get_exit_code(found, ["irrelevant_files"]) == (
+        FAIL_CODES["irrelevant_files"])
+    assert get_exit_code(found, ["orphaned_files"]) == 0
+
+
+def test_fail_codes_should_keep_the_codes_scripts_depend_on():
+
+    assert {c: FAIL_CODES[c] for c in sorted(FAIL_CODES)} == {
+        "broken_links": 5,
+        "corrupt_members": 3,
+        "corrupt_sounds": 10,
+        "invalid_file_names": 7,
+        "invalid_sounds": 4,
+        "irrelevant_files": 8,
+        "missing_subtitles": 9,
+        "orphaned_files": 6}
+    assert get_exit_code({"corrupt_sounds", "invalid_sounds"},
+                         list(FAIL_CODES)) == 10
@@ -11,6 +11,14 @@ def test_get_real_path_should_add_sounds_json_when_only_a_folder_specified(fs):
     assert str(result) == file.path
 
 
+def test_get_real_path_should_find_a_namespace_when_a_pack_folder_is_specified(fs):
+
+    fs.create_file("/test/pack/assets/farm/sounds.json")
+    file = fs.create_file("/test/pack/assets/minecraft/sounds.json")
+    result = get_real_path(["/test/pack"])
+    assert str(result) == file.path
+
+
 @pytest.mark.parametrize(
     "file_path, expectation", [
         ("/test/folder/sounds.txt", pytest.raises(ValueError)),
@@ -28,7 +36,7 @@ def test_get_real_path_should_raise_exception_when_path_is_not_a_supported_file(
     if result is not None:
         assert result.value.args[0] == (
             f"specified file: {file.path} is not a supported file\n"
-            f"Supported formats are currently .json and .zip")
+            f"Supported formats are currently .json, .zip and .jar")
 
 
 def test_get_real_path_should_raise_exception_when_path_does_not_exist(fs):
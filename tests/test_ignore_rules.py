@@ -0,0 +1,138 @@
+import json
+import os
+
+from objects import scan_index
+from objects.check_cache import CheckCache
+from objects.custom_path import CPath
+from objects.fail_fast import FAIL_CODES, FailFastChecker
+from objects.ignore_rules import IgnoreRules
+from objects.pack_checker import PackChecker, VanillaIndex
+from objects.result_cache import ResultCache
+from objects.streaming_checker import StreamingChecker
+
+
+def test_ignore_rules_should_follow_gitignore_patterns():
+
+    rules = IgnoreRules("pack/assets", [
+        "# build output",
+        "*.wav",
+        "!keep.wav",
+        "build/",
+        "/minecraft/sounds/drafts",
+        "src/**",
+        "**/tmp/*.ogg"])
+
+    assert rules.is_ignored("pack/assets/minecraft/sounds/cow.wav")
+    assert not rules.is_ignored("pack/assets/minecraft/sounds/keep.wav")
+    assert rules.is_ignored("pack/assets/minecraft/build", True)
+    # Rules ending in "/" only match folders
+    assert not rules.is_ignored("pack/assets/minecraft/build")
+    assert rules.is_ignored("pack/assets/minecraft/sounds/drafts", True)
+    # Rules with a slash are anchored to the rules' folder
+    assert not rules.is_ignored("pack/assets/extra/minecraft/sounds/drafts")
+    assert rules.is_ignored("pack/assets/src/a/b.ogg")
+    assert rules.is_ignored("pack/assets/minecraft/tmp/x.ogg")
+    assert not rules.is_ignored("pack/assets/minecraft/sounds/cow.ogg")
+    assert not rules.is_ignored("pack/assets/# build output")
+
+
+def test_ignore_rules_should_exclude_files_in_ignored_folders():
+
+    rules = IgnoreRules("assets", ["drafts/", "!drafts/keep.ogg"])
+
+    # A file can't be kept once its folder is ignored
+    assert rules.excludes("assets/minecraft/drafts/keep.ogg")
+    assert not rules.excludes("assets/minecraft/sounds/keep.ogg")
+    assert not IgnoreRules("assets", []).excludes("assets/x.txt")
+
+
+def test_ignore_rules_should_read_both_ignore_files(tmp_path):
+
+    (tmp_path / "assets/minecraft").mkdir(parents=True)
+    (tmp_path / ".spcheckignore").write_text(
+        ".git/\n/assets/minecraft/wav/\n/src/\n")
+    (tmp_path / "assets/.spcheckignore").write_text("*.psd\n")
+
+    rules = IgnoreRules.from_folder(CPath(tmp_path / "assets"), ["*.txt"])
+    root = str(tmp_path / "assets")
+
+    # Rules of the pack root are rebased into the assets folder, and
+    # dropped if they can't reach into it
+    assert rules.patterns == [
+        ".git/", "/minecraft/wav/", "*.psd", "*.txt"]
+    assert rules.is_ignored(root + "/minecraft/.git", True)
+    assert rules.is_ignored(root + "/minecraft/wav", True)
+    assert rules.is_ignored(root + "/minecraft/art.psd")
+    assert rules.is_ignored(root + "/minecraft/notes.txt")
+
+
+def test_check_path_should_prune_ignored_folders(tmp_path, monkeypatch):
+
+    sounds = tmp_path / "assets/minecraft/sounds"
+    (sounds / "wav").mkdir(parents=True)
+    (tmp_path / "assets/minecraft/.git/objects").mkdir(parents=True)
+    (tmp_path / "assets/minecraft/sounds.json").write_text(json.dumps(
+        {"cow": {"sounds": ["cow"]}}))
+    (sounds / "cow.ogg").write_text("")
+    (sounds / "wav/cow.wav").write_text("")
+    (sounds / "notes.txt").write_text("")
+    (tmp_path / "assets/minecraft/.git/objects/ab").write_text("")
+    (tmp_path / ".spcheckignore").write_text(".git/\n")
+
+    listed: list[str] = []
+    scandir = os.scandir
+
+    def counting_scandir(path):
+        listed.append(os.path.basename(path))
+        return scandir(path)
+
+    monkeypatch.setattr(scan_index.os, "scandir", counting_scandir)
+
+    checker = PackChecker(VanillaIndex({}), ignore_patterns=["wav/"])
+    result = checker.check_path(CPath(tmp_path / "assets/minecraft"))
+
+    assert result.get_relative("irrelevant_files") == [
+        "minecraft/sounds/notes.txt"]
+    assert ".git" not in listed and "wav" not in listed
+
+
+def test_every_mode_should_skip_sounds_json_in_ignored_folders(tmp_path):
+
+    (tmp_path / "assets/minecraft/sounds").mkdir(parents=True)
+    (tmp_path / "assets/wip").mkdir()
+    (tmp_path / "assets/minecraft/sounds.json").write_text(json.dumps(
+        {"cow": {"sounds": ["cow"]}}))
+    (tmp_path / "assets/minecraft/sounds/cow.ogg").write_text("")
+    (tmp_path / "assets/wip/sounds.json").write_text(json.dumps(
+        {"pig": {"sounds": ["wip:pig"]}}))
+    (tmp_path / ".spcheckignore").write_text("/assets/wip/\n")
+
+    path = CPath(tmp_path / "assets/minecraft")
+    checker = PackChecker(VanillaIndex({}))
+
+    assert not checker.check_path(path).has_findings()
+    assert not FailFastChecker(checker).check_path(
+        path, list(FAIL_CODES)).has_findings()
+    assert not ResultCache(checker, CheckCache(
+        CPath(tmp_path / "cache"))).check_path(path).has_findings()
+    with StreamingChecker(checker).check_path(path) as result:
+        assert result.get_found_categories() == set()
+
+
+def test_check_should_never_list_the_ignore_file(tmp_path):
+
+    (tmp_path / "assets/minecraft/sounds").mkdir(parents=True)
+    (tmp_path / "assets/minecraft/sounds.json").write_text(json.dumps(
+        {"cow": {"sounds": ["cow"]}}))
+    (tmp_path / "assets/minecraft/sounds/cow.ogg").write_text("")
+    (tmp_path / "assets/.spcheckignore").write_text("# nothing yet\n")
+
+    path = CPath(tmp_path / "assets/minecraft")
+    checker = PackChecker(VanillaIndex({}))
+
+    assert not checker.check_path(path).has_findings()
+    assert not FailFastChecker(checker).check_path(
+        path, list(FAIL_CODES)).has_findings()
+    # Not even when a rule would keep it
+    assert IgnoreRules(str(tmp_path / "assets"), ["!.spcheckignore"]).excludes(
+        str(tmp_path / "assets/.spcheckignore"))
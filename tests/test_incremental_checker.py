@@ -0,0 +1,163 @@
+import json
+import os
+import random
+
+from objects.check_cache import CheckCache
+from objects.custom_path import CPath
+from objects.incremental_checker import IncrementalChecker
+from objects.pack_checker import PackChecker, VanillaIndex
+
+
+VANILLA = {"entity.cow.ambient": {"sounds": ["vanilla/say1"]}}
+
+
+def make_checkers(tmp_path):
+    checker = PackChecker(VanillaIndex(json.loads(json.dumps(VANILLA))))
+    cache = CheckCache(CPath(tmp_path / "cache"))
+    return checker, IncrementalChecker(checker, cache)
+
+
+def write_events(root, events: dict):
+    (root / "minecraft/sounds.json").write_text(json.dumps(events))
+
+
+def make_pack(root) -> CPath:
+    sounds = root / "assets/minecraft/sounds"
+    sounds.mkdir(parents=True)
+    for name in ["a", "b", "c", "Upper", "shared"]:
+        (sounds / f"{name}.ogg").write_text("")
+    (sounds / "notes.txt").write_text("")
+    os.symlink("shared.ogg", sounds / "link.ogg")
+
+    write_events(root / "assets", {
+        "one": {"sounds": ["a", "missing"]},
+        "two": {"sounds": ["b", "Upper", "link"]}})
+
+    return CPath(root / "assets/minecraft/sounds.json")
+
+
+def assert_same_result(incremental, full):
+    assert incremental.findings == full.findings
+    assert incremental.sound_counts == full.sound_counts
+    assert sorted(incremental.sound_files) == sorted(full.sound_files)
+
+
+def test_incremental_checker_should_match_a_full_check_on_the_first_run(tmp_path):
+
+    path = make_pack(tmp_path)
+    checker, incremental = make_checkers(tmp_path)
+
+    assert_same_result(incremental.check_path(path), checker.check_path(path))
+    assert incremental.last_update["full"] is True
+
+
+def test_incremental_checker_should_only_recompute_changed_events(tmp_path):
+
+    path = make_pack(tmp_path)
+    checker, incremental = make_checkers(tmp_path)
+    incremental.check_path(path)
+
+    write_events(tmp_path / "assets", {
+        "one": {"sounds": ["a", "c", "missing"]},
+        "two": {"sounds": ["b", "Upper", "link"]}})
+
+    result = incremental.check_path(path)
+
+    assert incremental.last_update == {
+        "full": False, "events_changed": 1, "paths_reclassified": 3}
+    assert_same_result(result, checker.check_path(path))
+
+
+def test_incremental_checker_should_only_reclassify_changed_files(tmp_path):
+
+    path = make_pack(tmp_path)
+    checker, incremental = make_checkers(tmp_path)
+    incremental.check_path(path)
+
+    (tmp_path / "assets/minecraft/sounds/missing.ogg").write_text("")
+
+    result = incremental.check_path(path)
+
+    assert incremental.last_update == {
+        "full": False, "events_changed": 0, "paths_reclassified": 1}
+    assert_same_result(result, checker.check_path(path))
+
+
+def test_incremental_checker_should_diff_events_of_an_atomic_save(tmp_path):
+
+    path = make_pack(tmp_path)
+    checker, incremental = make_checkers(tmp_path)
+    incremental.check_path(path)
+
+    # Editors write a temporary file and rename it over sounds.json,
+    # which changes the folder holding it
+    temporary = tmp_path / "assets/minecraft/.sounds.json.swp"
+    temporary.write_text(json.dumps({
+        "one": {"sounds": ["a", "c", "missing"]},
+        "two": {"sounds": ["b", "Upper", "link"]}}))
+    os.utime(tmp_path / "assets/minecraft", ns=(1, 1))
+    os.replace(temporary, path)
+
+    result = incremental.check_path(path)
+
+    assert incremental.last_update == {
+        "full": False, "events_changed": 1, "paths_reclassified": 3}
+    assert_same_result(result, checker.check_path(path))
+
+
+def test_incremental_checker_should_follow_retargeted_links(tmp_path):
+
+    path = make_pack(tmp_path)
+    checker, incremental = make_checkers(tmp_path)
+    incremental.check_path(path)
+
+    # Retarget link.ogg from shared.ogg to c.ogg, keeping the folder's
+    # mtime so it isn't listed again
+    sounds = tmp_path / "assets/minecraft/sounds"
+    mtime = os.stat(sounds).st_mtime_ns
+    os.unlink(sounds / "link.ogg")
+    os.symlink("c.ogg", sounds / "link.ogg")
+    os.utime(sounds, ns=(mtime, mtime))
+
+    result = incremental.check_path(path)
+
+    assert result.get_relative("orphaned_files") == [
+        "minecraft/sounds/shared.ogg"]
+    assert incremental.last_update["paths_reclassified"] == 2
+    assert_same_result(result, checker.check_path(path))
+
+
+def test_incremental_checker_should_match_full_checks_after_random_edits(tmp_path):
+
+    path = make_pack(tmp_path)
+    checker, incremental = make_checkers(tmp_path)
+    rng = random.Random(1)
+
+    names = ["a", "b", "c", "Upper", "shared", "link", "missing",
+             "vanilla/say1", "other:x"]
+    events: dict = {}
+
+    for _ in range(30):
+        key = rng.choice(["one", "two", "three", "four"])
+        if rng.random() < 0.2:
+            events.pop(key, None)
+        else:
+            events[key] = {"sounds": rng.sample(names, rng.randint(0, 4))}
+
+        write_events(tmp_path / "assets", events)
+        assert_same_result(
+            incremental.check_path(path), checker.check_path(path))
+
+
+def test_check_cache_should_ignore_entries_from_another_version(tmp_path):
+
+    cache = CheckCache(CPath(tmp_path))
+    cache.store("kind", "key", {"value": 1})
+
+    assert cache.load("kind", "key") == {"value": 1}
+    assert cache.load("kind", "other") is None
+
+    path = cache._path("kind", "key")
+    path.write_bytes(b"not a pickle")
+
+    assert cache.load("kind", "key") is None
@@ -0,0 +1,97 @@
+import json
+import zipfile
+
+from objects.custom_path import CPath
+from objects.lang_index import LangIndex
+from objects.pack_checker import PackChecker, VanillaIndex
+
+EVENTS = {
+    "entity.cow.ambient": {
+        "sounds": ["cow/moo"], "subtitle": "subtitles.cow.ambient"},
+    "entity.cow.hurt": {
+        "sounds": ["cow/hurt"], "subtitle": "subtitles.cow.hurt"},
+    "entity.cow.step": {"sounds": ["cow/step"]}}
+
+
+def make_pack(root, langs: dict[str, dict]) -> CPath:
+    (root / "minecraft/lang").mkdir(parents=True)
+    (root / "minecraft/sounds.json").write_text(json.dumps(EVENTS))
+    for locale, keys in langs.items():
+        (root / f"minecraft/lang/{locale}.json").write_text(json.dumps(keys))
+    return CPath(root / "minecraft")
+
+
+def test_lang_index_should_report_missing_keys_per_locale(tmp_path):
+
+    make_pack(tmp_path, {
+        "en_us": {"subtitles.cow.ambient": "Cow moos",
+                  "subtitles.cow.hurt": "Cow hurts"},
+        "de_de": {"subtitles.cow.ambient": "Kuh muht"},
+        "fr_fr": {}})
+
+    index = LangIndex(CPath(tmp_path))
+    missing = index.get_missing_keys(
+        ["minecraft"], {"subtitles.cow.ambient", "subtitles.cow.hurt"})
+
+    assert missing == {
+        "de_de": ["subtitles.cow.hurt"],
+        "fr_fr": ["subtitles.cow.ambient", "subtitles.cow.hurt"]}
+
+
+def test_lang_index_should_fall_back_to_vanilla_keys(tmp_path):
+
+    make_pack(tmp_path, {"de_de": {}})
+
+    index = LangIndex(CPath(tmp_path), frozenset({"subtitles.cow.hurt"}))
+    missing = index.get_missing_keys(
+        ["minecraft"], {"subtitles.cow.ambient", "subtitles.cow.hurt"})
+
+    # en_us is always checked, since the game falls back to it
+    assert missing == {
+        "de_de": ["subtitles.cow.ambient"],
+        "en_us": ["subtitles.cow.ambient"]}
+
+
+def test_lang_index_should_only_read_namespaces_it_is_asked_for(tmp_path):
+
+    read: list[str] = []
+
+    def reader(namespace):
+        read.append(namespace)
+        return {"en_us": b'{"a": "A"}'}
+
+    index = LangIndex(CPath(tmp_path), read=reader)
+
+    assert index.get_missing_keys(["minecraft"], set()) == {}
+    assert read == []
+
+    index.get_missing_keys(["minecraft"], {"a"})
+    index.get_missing_keys(["minecraft"], {"b"})
+    assert read == ["minecraft"]
+
+
+def test_pack_checker_should_check_subtitles(tmp_path):
+
+    path = make_pack(tmp_path, {"en_us": {"subtitles.cow.ambient": "Moo"}})
+    checker = PackChecker(VanillaIndex({}))
+
+    result = checker.check_path(path)
+
+    assert result.missing_subtitles == {"en_us": ["subtitles.cow.hurt"]}
+    assert result.to_dict()["missing_subtitles"] == result.missing_subtitles
+
+
+def test_check_zip_should_read_lang_files_from_the_archive(tmp_path):
+
+    archive_path = tmp_path / "pack.zip"
+    with zipfile.ZipFile(archive_path, "w") as archive:
+        archive.writestr("assets/minecraft/sounds.json", json.dumps(EVENTS))
+        archive.writestr("assets/minecraft/lang/en_us.json", json.dumps(
+            {"subtitles.cow.ambient": "Moo", "subtitles.cow.hurt": "Ow"}))
+        archive.writestr("assets/minecraft/lang/de_de.json", "{}")
+
+    vanilla = VanillaIndex({"entity.cow.hurt": {
+        "sounds": ["cow/hurt"], "subtitle": "subtitles.cow.hurt"}})
+    result = PackChecker(vanilla).check_zip(CPath(archive_path))
+
+    assert result.missing_subtitles == {"de_de": ["subtitles.cow.ambient"]}
@@ -0,0 +1,75 @@
+import hashlib
+import json
+import os
+
+import pytest
+
+from objects.check_cache import CheckCache
+from objects.custom_path import CPath
+from objects.launcher_assets import get_index_path, read_launcher_assets
+from objects.pack_checker import VanillaIndex
+
+
+SOUNDS = {"entity.cow.ambient": {"sounds": ["mob/cow/say1"]}}
+
+
+def make_launcher(root, version: str = "17") -> bytes:
+    """A launcher folder holding one asset index and its objects"""
+
+    data: bytes = json.dumps(SOUNDS).encode()
+    digest: str = hashlib.sha1(data).hexdigest()
+
+    objects = root / "assets/objects" / digest[:2]
+    objects.mkdir(parents=True)
+    (objects / digest).write_bytes(data)
+
+    indexes = root / "assets/indexes"
+    indexes.mkdir(parents=True, exist_ok=True)
+    (indexes / f"{version}.json").write_text(json.dumps({"objects": {
+        "minecraft/sounds.json": {"hash": digest, "size": len(data)},
+        "minecraft/sounds/mob/cow/say1.ogg": {"hash": "00", "size": 1},
+        "minecraft/lang/de_de.json": {"hash": "11", "size": 1}}}))
+
+    return data
+
+
+def test_vanilla_index_should_load_from_the_launcher_assets(tmp_path):
+
+    data = make_launcher(tmp_path / ".minecraft")
+
+    vanilla = VanillaIndex.from_launcher(CPath(tmp_path / ".minecraft"), "17")
+
+    # The same content gives the same version, whichever way it's loaded
+    assert vanilla.version == hashlib.sha1(data).hexdigest()
+    assert vanilla.raw_json["entity.cow.ambient"]["sounds"] == [
+        {"name": "mob/cow/say1"}]
+    assert vanilla.sound_files == {"minecraft/sounds/mob/cow/say1.ogg"}
+
+
+def test_vanilla_index_should_read_each_asset_index_once(tmp_path):
+
+    make_launcher(tmp_path / ".minecraft")
+    minecraft_dir = CPath(tmp_path / ".minecraft")
+    cache = CheckCache(CPath(tmp_path / "cache"))
+
+    first = VanillaIndex.from_launcher(minecraft_dir, "latest", cache)
+
+    # Served from the cache, though the object store is gone
+    for directory, _, files in os.walk(tmp_path / ".minecraft/assets/objects"):
+        for name in files:
+            os.unlink(os.path.join(directory, name))
+
+    second = VanillaIndex.from_launcher(minecraft_dir, "latest", cache)
+
+    assert second.version == first.version
+    assert second.raw_json == first.raw_json
+
+
+def test_read_launcher_assets_should_refuse_damaged_objects(tmp_path):
+
+    data = make_launcher(tmp_path)
+    digest = hashlib.sha1(data).hexdigest()
+    (tmp_path / "assets/objects" / digest[:2] / digest).write_text("{}")
+
+    with pytest.raises(ValueError):
+        read_launcher_assets(get_index_path(CPath(tmp_path), "17"))
@@ -0,0 +1,121 @@
+import os
+
+from objects.check_cache import CheckCache
+from objects.custom_path import CPath
+from objects.ogg_verifier import ogg_crc, verify_ogg, verify_sounds
+from objects.stream_advisor import PAGE_HEADER
+
+
+def reference_crc(data: bytes) -> int:
+    """The Ogg CRC32 a bit at a time, as the specification gives it"""
+
+    crc: int = 0
+    for byte in data:
+        crc ^= byte << 24
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x04C11DB7 if crc & 0x80000000
+                   else crc << 1) & 0xFFFFFFFF
+    return crc
+
+
+def ogg_page(sequence: int, payload: bytes, flags: int = 0,
+             serial: int = 7) -> bytes:
+    segments: bytes = bytes([255] * (len(payload) // 255)
+                            + [len(payload) % 255])
+    page: bytes = PAGE_HEADER.pack(
+        b"OggS", 0, flags, sequence, serial, sequence, 0, len(segments)
+    ) + segments + payload
+    crc: bytes = reference_crc(page).to_bytes(4, "little")
+    return page[:22] + crc + page[26:]
+
+
+def ogg_file(pages: int = 4) -> bytes:
+    return b"".join(
+        ogg_page(n, bytes(range(256)) * (n + 1),
+                 2 if n == 0 else 4 if n == pages - 1 else 0)
+        for n in range(pages))
+
+
+def test_ogg_crc_should_match_the_specification():
+
+    data: bytes = bytes(range(256)) * 3
+    assert ogg_crc(data) == reference_crc(data)
+    assert ogg_crc(data[:100], data[100:]) == reference_crc(data)
+    assert ogg_crc(b"") == 0
+
+
+def test_verify_ogg_should_pass_intact_files(tmp_path):
+
+    path = tmp_path / "cow.ogg"
+    path.write_bytes(ogg_file())
+
+    assert verify_ogg(str(path)) is None
+
+
+def test_verify_ogg_should_report_truncated_and_corrupt_pages(tmp_path):
+
+    data: bytes = ogg_file()
+    path = tmp_path / "cow.ogg"
+
+    # An upload cut off in the middle of a page
+    path.write_bytes(data[:-100])
+    assert verify_ogg(str(path)).startswith("truncated:")
+
+    # ... or right after one, before the last page
+    path.write_bytes(data[:len(data) - len(ogg_page(3, bytes(1024)))])
+    assert verify_ogg(str(path)) == (
+        "truncated: 3 pages, then the file ends mid-stream")
+
+    damaged = bytearray(data)
+    damaged[500] ^= 0xFF
+    path.write_bytes(damaged)
+    assert verify_ogg(str(path)).startswith("corrupt: page 1 has CRC")
+
+    # A page missing from the middle
+    second: int = len(ogg_page(0, bytes(256)))
+    third: int = second + len(ogg_page(1, bytes(512)))
+    path.write_bytes(data[:second] + data[third:])
+    assert verify_ogg(str(path)) == (
+        "corrupt: page 1 is number 2 of its stream instead of 1")
+
+    path.write_bytes(b"")
+    assert verify_ogg(str(path)) == "truncated: the file is empty"
+
+    path.write_bytes(b"ID3" + bytes(100))
+    assert verify_ogg(str(path)) == (
+        "corrupt: no page where page 0 should start")
+
+
+def test_verify_sounds_should_only_rescan_changed_files(tmp_path,
+                                                        monkeypatch):
+
+    sounds = tmp_path / "assets/minecraft/sounds"
+    sounds.mkdir(parents=True)
+    (sounds / "cow.ogg").write_bytes(ogg_file())
+    (sounds / "pig.ogg").write_bytes(ogg_file()[:-10])
+
+    assets_folder = CPath(tmp_path / "assets")
+    paths = [str(sounds / "cow.ogg"), str(sounds / "pig.ogg")]
+    cache = CheckCache(CPath(tmp_path / "cache"))
+
+    scanned: list[str] = []
+
+    def counting_verify(path):
+        scanned.append(os.path.basename(path))
+        return verify_ogg(path)
+
+    monkeypatch.setattr(
+        "objects.ogg_verifier.verify_ogg", counting_verify)
+
+    expected = [{"name": "minecraft/sounds/pig.ogg",
+                 "problem": "truncated: 1014 of 1024 bytes of page 3"}]
+
+    assert verify_sounds(assets_folder, paths, cache) == expected
+    assert verify_sounds(assets_folder, paths, cache) == expected
+    assert sorted(scanned) == ["cow.ogg", "pig.ogg"]
+
+    (sounds / "pig.ogg").write_bytes(ogg_file())
+    os.utime(sounds / "pig.ogg", ns=(1, 1))
+
+    assert verify_sounds(assets_folder, paths, cache) == []
+    assert sorted(scanned) == ["cow.ogg", "pig.ogg", "pig.ogg"]
@@ -0,0 +1,184 @@
+import json
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+from objects.custom_path import CPath
+from objects.pack_checker import PackChecker, VanillaIndex
+
+
+def make_checker() -> PackChecker:
+    return PackChecker(VanillaIndex(
+        {"entity.cow.ambient": {"sounds": ["mob/cow/say1"]}}))
+
+
+# --------------------------------------------------------------
+# check_listing
+# --------------------------------------------------------------
+
+def test_check_listing_should_categorize_findings(capsys):
+
+    result = make_checker().check_listing(
+        json_events={
+            "entity.cow.ambient": {"sounds": [
+                "mob/cow/say1", "mob/cow/moo", "mob/cow/missing"]},
+            "entity.cow.hurt": {"sounds": ["mob/cow/Hurt"]}},
+        files=[
+            "minecraft/sounds.json",
+            "minecraft/sounds/mob/cow/moo.ogg",
+            "minecraft/sounds/mob/cow/Hurt.ogg",
+            "minecraft/sounds/mob/cow/orphan.ogg",
+            "minecraft/sounds/mob/cow/notes.txt"])
+
+    assert result.get_relative("irrelevant_files") == [
+        "minecraft/sounds/mob/cow/notes.txt"]
+    assert result.get_relative("broken_links") == [
+        "minecraft/sounds/mob/cow/missing.ogg"]
+    assert result.get_relative("orphaned_files") == [
+        "minecraft/sounds/mob/cow/orphan.ogg"]
+    assert result.get_relative("invalid_file_names") == [
+        "minecraft/sounds/mob/cow/Hurt.ogg"]
+    assert result.sound_counts == {"entity.cow.ambient": 1}
+    assert result.has_findings() is True
+
+    # The library never prints
+    assert capsys.readouterr().out == ""
+
+
+def test_check_listing_should_follow_symlinks_given_in_the_listing():
+
+    result = make_checker().check_listing(
+        json_events={"entity.cow.ambient": {"sounds": ["mob/cow/link"]}},
+        files=["minecraft/sounds/shared/moo.ogg"],
+        symlinks={
+            "minecraft/sounds/mob/cow/link.ogg":
+                "minecraft/sounds/shared/moo.ogg"})
+
+    assert result.has_findings() is False
+    assert result.sound_counts == {"entity.cow.ambient": 1}
+
+
+def test_check_listing_should_report_timings_for_every_phase():
+
+    result = make_checker().check_listing({}, [])
+
+    assert set(result.timings) == {
+        "scan", "vanilla", "checks", "counts", "subtitles"}
+
+
+# --------------------------------------------------------------
+# check_zip
+# --------------------------------------------------------------
+
+def test_check_zip_should_check_the_archive_listing(tmp_path):
+
+    zip_path = tmp_path / "pack.zip"
+    with zipfile.ZipFile(zip_path, "w") as archive:
+        archive.writestr(
+            "assets/minecraft/sounds.json",
+            '{"entity.cow.ambient": {"sounds": ["mob/cow/moo"]}}')
+        archive.writestr("assets/minecraft/sounds/mob/cow/moo.ogg", "")
+        archive.writestr("assets/minecraft/sounds/mob/cow/orphan.ogg", "")
+
+    result = make_checker().check_zip(CPath(zip_path))
+
+    assert result.assets_folder == CPath(zip_path, "assets")
+    assert result.get_relative("orphaned_files") == [
+        "minecraft/sounds/mob/cow/orphan.ogg"]
+    assert result.to_dict()["sound_counts"] == {"entity.cow.ambient": 1}
+
+    # Nothing was extracted next to the archive
+    assert list(tmp_path.iterdir()) == [zip_path]
+
+
+# --------------------------------------------------------------
+# VanillaIndex
+# --------------------------------------------------------------
+
+def test_vanilla_index_should_be_shared_between_checkers():
+
+    vanilla = VanillaIndex({"entity.cow.ambient": {"sounds": ["a"]}})
+
+    PackChecker(vanilla).check_listing({}, [])
+    handler = vanilla.get_events(CPath("assets"))
+    PackChecker(vanilla).check_listing({}, [])
+
+    assert vanilla.get_events(CPath("assets")) is handler
+    assert vanilla.raw_json["entity.cow.ambient"]["sounds"] == [{"name": "a"}]
+
+
+def test_vanilla_index_should_parse_once_across_threads():
+
+    vanilla = VanillaIndex.from_file(
+        CPath(__file__).parent.parent / "vanilla-sounds.json")
+
+    with ThreadPoolExecutor(8) as pool:
+        handlers = list(pool.map(
+            lambda n: vanilla.get_events(CPath(f"pack{n % 2}/assets")),
+            range(64)))
+
+    assert all(len(h.get_event_names()) > 0 for h in handlers)
+    assert len(vanilla._handlers) == 2
+
+
+def test_check_listing_should_report_invalid_sound_attributes():
+
+    result = make_checker().check_listing(
+        json_events={"entity.cow.ambient": {"sounds": [
+            {"name": "mob/cow/say1", "pitch": 0}]}},
+        files=[])
+
+    assert result.invalid_sounds == [{
+        "event": "entity.cow.ambient", "index": 0,
+        "problems": ["'pitch' must be a number above 0, got 0"]}]
+    assert result.has_findings() is True
+
+
+# --------------------------------------------------------------
+# Several namespaces
+# --------------------------------------------------------------
+
+def make_namespaces(root) -> CPath:
+    """Two namespaces, each playing a file the other one holds"""
+
+    (root / "minecraft/sounds").mkdir(parents=True)
+    (root / "farm/sounds").mkdir(parents=True)
+    (root / "minecraft/sounds/moo.ogg").write_text("")
+    (root / "minecraft/sounds/stray.ogg").write_text("")
+    (root / "farm/sounds/oink.ogg").write_text("")
+
+    (root / "minecraft/sounds.json").write_text(json.dumps(
+        {"entity.pig.ambient": {"sounds": ["farm:oink"]}}))
+    (root / "farm/sounds.json").write_text(json.dumps(
+        {"cow": {"sounds": ["moo", "missing"]}}))
+
+    return CPath(root / "minecraft")
+
+
+def test_check_path_should_check_every_namespace_together(tmp_path):
+
+    result = make_checker().check_path(make_namespaces(tmp_path))
+
+    # Files played by another namespace's events aren't orphans
+    assert result.get_relative("orphaned_files") == [
+        "minecraft/sounds/stray.ogg"]
+    assert result.get_relative("broken_links") == [
+        "minecraft/sounds/missing.ogg"]
+    assert result.sound_counts == {
+        "entity.pig.ambient": 1, "farm:cow": 1}
+
+
+def test_check_zip_should_check_every_namespace_together(tmp_path):
+
+    zip_path = tmp_path / "pack.zip"
+    with zipfile.ZipFile(zip_path, "w") as archive:
+        archive.writestr("assets/minecraft/sounds.json", json.dumps(
+            {"entity.pig.ambient": {"sounds": ["farm:oink"]}}))
+        archive.writestr("assets/farm/sounds.json", json.dumps(
+            {"cow": {"sounds": ["moo"]}}))
+        archive.writestr("assets/minecraft/sounds/moo.ogg", "")
+        archive.writestr("assets/farm/sounds/oink.ogg", "")
+
+    result = make_checker().check_zip(CPath(zip_path))
+
+    assert result.has_findings() is False
+    assert result.sound_counts == {"entity.pig.ambient": 1, "farm:cow": 1}
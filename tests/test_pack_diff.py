@@ -0,0 +1,105 @@
+import json
+import os
+import zipfile
+
+from objects.custom_path import CPath
+from objects.pack_diff import (
+    FileEntry, PackIndex, diff_packs, file_changed, merge_sorted)
+
+
+OLD_SOUNDS = {
+    "entity.cow.ambient": {"sounds": ["mob/cow/say1", "mob/cow/say2"]},
+    "entity.pig.ambient": {"sounds": ["mob/pig/say1"]},
+    "block.door.open": {"sounds": ["block/door/open"]}}
+
+NEW_SOUNDS = {
+    "entity.cow.ambient": {"sounds": ["mob/cow/say1", "mob/cow/say2",
+                                      "mob/cow/say3"]},
+    "entity.pig.ambient": {"sounds": [{"name": "mob/pig/say1"}]},
+    "block.door.close": {"sounds": ["block/door/close"]}}
+
+
+def make_folder(root, sounds: dict, files: dict[str, bytes]):
+    """A pack folder with a minecraft namespace"""
+
+    namespace = root / "assets/minecraft"
+    namespace.mkdir(parents=True)
+    (namespace / "sounds.json").write_text(json.dumps(sounds))
+
+    for name, data in files.items():
+        path = namespace / "sounds" / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+
+def make_zip(path, sounds: dict, files: dict[str, bytes]):
+    """The same, as a zipped pack"""
+
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("pack.mcmeta", "{}")
+        archive.writestr("assets/minecraft/sounds.json", json.dumps(sounds))
+        for name, data in files.items():
+            archive.writestr(f"assets/minecraft/sounds/{name}", data)
+
+
+def test_diff_packs_should_compare_a_folder_with_a_zip(tmp_path):
+
+    make_folder(tmp_path / "old", OLD_SOUNDS, {
+        "mob/cow/say1.ogg": b"moo",
+        "mob/pig/say1.ogg": b"oink",
+        "block/door/open.ogg": b"creak"})
+    make_zip(tmp_path / "new.zip", NEW_SOUNDS, {
+        "mob/cow/say1.ogg": b"moo",
+        "mob/pig/say1.ogg": b"OINK",
+        "block/door/close.ogg": b"slam"})
+
+    diff = diff_packs(PackIndex.from_path(CPath(tmp_path / "old")),
+                      PackIndex.from_path(CPath(tmp_path / "new.zip")))
+
+    assert diff['added_events'] == ["minecraft:block.door.close"]
+    assert diff['removed_events'] == ["minecraft:block.door.open"]
+    # A bare sound name and its dict form are the same sound
+    assert diff['modified_events'] == ["minecraft:entity.cow.ambient"]
+    assert diff['count_changes'] == {"minecraft:entity.cow.ambient": (2, 3)}
+    assert diff['added_files'] == ["minecraft/sounds/block/door/close.ogg"]
+    assert diff['removed_files'] == ["minecraft/sounds/block/door/open.ogg"]
+    assert diff['modified_files'] == ["minecraft/sounds/mob/pig/say1.ogg"]
+
+
+def test_diff_packs_should_find_no_differences_in_the_same_pack(tmp_path):
+
+    make_zip(tmp_path / "pack.zip", OLD_SOUNDS, {"mob/cow/say1.ogg": b"moo"})
+    index = PackIndex.from_path(CPath(tmp_path / "pack.zip"))
+
+    diff = diff_packs(index, index)
+
+    assert not any(len(v) > 0 for v in diff.values())
+
+
+def test_merge_sorted_should_pair_up_keys():
+
+    old = [("a", 1), ("b", 2), ("d", 4)]
+    new = [("b", 20), ("c", 30), ("d", 40), ("e", 50)]
+
+    assert list(merge_sorted(old, new)) == [
+        ("a", 1, None), ("b", 2, 20), ("c", None, 30),
+        ("d", 4, 40), ("e", None, 50)]
+
+
+def test_file_changed_should_only_read_files_when_the_mtime_differs(tmp_path):
+
+    before = tmp_path / "before.ogg"
+    after = tmp_path / "after.ogg"
+    before.write_bytes(b"abc")
+    after.write_bytes(b"abd")
+
+    def entry(path, mtime_ns: int) -> FileEntry:
+        return FileEntry(size=3, crc=None, mtime_ns=mtime_ns, path=str(path))
+
+    # Same size and mtime: taken as unchanged without reading
+    assert not file_changed(entry(before, 1), entry(after, 1))
+    assert file_changed(entry(before, 1), entry(after, 2))
+
+    os.remove(before)
+    assert file_changed(entry(before, 1), FileEntry(
+        size=4, crc=None, mtime_ns=1, path=str(after)))
@@ -0,0 +1,192 @@
+import zipfile
+
+import pytest
+
+from objects.pack_stack import Pack, PackStack
+
+
+def make_vanilla() -> Pack:
+    return Pack.from_json("vanilla", {"minecraft": {
+        "entity.cow.ambient": {"sounds": ["mob/cow/say1", "mob/cow/say2"]},
+        "entity.cow.hurt": {"sounds": ["mob/cow/hurt1"]}}})
+
+
+# --------------------------------------------------------------
+# merge semantics
+# --------------------------------------------------------------
+
+def test_pack_stack_should_append_sounds_when_replace_is_not_set():
+
+    stack = PackStack(make_vanilla())
+    stack.add_pack(Pack.from_json(
+        "pack1",
+        {"minecraft": {"entity.cow.ambient": {"sounds": ["mob/cow/moo"]}}},
+        {"minecraft/sounds/mob/cow/moo.ogg"}))
+
+    result = stack.get_effective_files("minecraft:entity.cow.ambient")
+
+    assert result == [
+        ("minecraft/sounds/mob/cow/moo.ogg", "pack1"),
+        ("minecraft/sounds/mob/cow/say1.ogg", "vanilla"),
+        ("minecraft/sounds/mob/cow/say2.ogg", "vanilla")]
+
+
+def test_pack_stack_should_discard_lower_sounds_when_replace_is_true():
+
+    stack = PackStack(make_vanilla())
+    stack.add_pack(Pack.from_json(
+        "pack1",
+        {"minecraft": {"entity.cow.ambient": {
+            "replace": True, "sounds": ["mob/cow/moo"]}}},
+        {"minecraft/sounds/mob/cow/moo.ogg"}))
+
+    result = stack.get_effective_files("minecraft:entity.cow.ambient")
+
+    assert result == [("minecraft/sounds/mob/cow/moo.ogg", "pack1")]
+    assert stack.event_sources["minecraft:entity.cow.ambient"] == ["pack1"]
+
+
+def test_pack_stack_should_keep_the_lower_subtitle_unless_replacing():
+
+    stack = PackStack(Pack.from_json("vanilla", {"minecraft": {
+        "entity.cow.ambient": {"sounds": ["mob/cow/say1"],
+                               "subtitle": "subtitles.entity.cow.ambient"}}}))
+    stack.add_pack(Pack.from_json("pack1", {"minecraft": {
+        "entity.cow.ambient": {"sounds": ["mob/cow/moo"],
+                               "subtitle": "subtitles.pack1.moo"}}}))
+
+    assert stack.events["minecraft:entity.cow.ambient"]["subtitle"] == (
+        "subtitles.entity.cow.ambient")
+
+    stack.add_pack(Pack.from_json("pack2", {"minecraft": {
+        "entity.cow.ambient": {"replace": True, "sounds": ["mob/cow/moo"],
+                               "subtitle": "subtitles.pack2.moo"}}}))
+
+    assert stack.events["minecraft:entity.cow.ambient"]["subtitle"] == (
+        "subtitles.pack2.moo")
+
+
+def test_pack_stack_should_credit_the_highest_pack_that_ships_a_file():
+
+    stack = PackStack(make_vanilla())
+    stack.add_pack(Pack.from_json(
+        "pack1", {}, {"minecraft/sounds/mob/cow/hurt1.ogg"}))
+    stack.add_pack(Pack.from_json(
+        "pack2", {}, {"minecraft/sounds/mob/cow/hurt1.ogg"}))
+
+    result = stack.get_effective_files("minecraft:entity.cow.hurt")
+
+    assert result == [("minecraft/sounds/mob/cow/hurt1.ogg", "pack2")]
+
+
+def test_pack_stack_should_report_empty_and_broken_events():
+
+    stack = PackStack(make_vanilla())
+    stack.add_pack(Pack.from_json(
+        "pack1",
+        {"minecraft": {
+            "entity.cow.hurt": {"replace": True, "sounds": []},
+            "entity.cow.ambient": {"sounds": ["mob/cow/missing"]}},
+         "custom": {
+            "custom.event": {"sounds": [
+                {"name": "no.such.event", "type": "event"}]}}},
+        set()))
+
+    assert stack.get_empty_events() == ["minecraft:entity.cow.hurt"]
+    assert stack.get_broken_events() == {
+        "custom:custom.event": ["no.such.event"],
+        "minecraft:entity.cow.ambient": ["minecraft/sounds/mob/cow/missing.ogg"]}
+
+
+# --------------------------------------------------------------
+# incremental updates
+# --------------------------------------------------------------
+
+def test_pack_stack_should_match_a_fresh_merge_after_reordering():
+
+    pack1 = Pack.from_json(
+        "pack1",
+        {"minecraft": {"entity.cow.ambient": {
+            "replace": True, "sounds": ["mob/cow/a"]}}},
+        {"minecraft/sounds/mob/cow/a.ogg"})
+
+    pack2 = Pack.from_json(
+        "pack2",
+        {"minecraft": {"entity.cow.ambient": {"sounds": ["mob/cow/b"]}}},
+        {"minecraft/sounds/mob/cow/a.ogg", "minecraft/sounds/mob/cow/b.ogg"})
+
+    stack = PackStack(make_vanilla())
+    stack.add_pack(pack1)
+    stack.add_pack(pack2)
+    stack.move_pack("pack2", 0)
+
+    fresh = PackStack(make_vanilla())
+    fresh.add_pack(pack2)
+    fresh.add_pack(pack1)
+
+    assert stack.get_pack_names() == ["pack2", "pack1"]
+    assert stack.events == fresh.events
+    assert stack.providers == fresh.providers
+    assert stack.get_effective_files("minecraft:entity.cow.ambient") == [
+        ("minecraft/sounds/mob/cow/a.ogg", "pack1")]
+
+
+def test_pack_stack_should_restore_vanilla_when_a_pack_is_removed():
+
+    stack = PackStack(make_vanilla())
+    before = dict(stack.events)
+
+    stack.add_pack(Pack.from_json(
+        "pack1",
+        {"minecraft": {"entity.cow.hurt": {"replace": True, "sounds": []}}},
+        {"minecraft/sounds/mob/cow/say1.ogg"}))
+    stack.remove_pack("pack1")
+
+    assert stack.events == before
+    assert stack.providers["minecraft/sounds/mob/cow/say1.ogg"] == "vanilla"
+
+
+def test_pack_stack_should_raise_value_error_when_a_pack_is_added_twice():
+
+    stack = PackStack()
+    stack.add_pack(Pack.from_json("pack1", {}, set()))
+
+    with pytest.raises(ValueError):
+        stack.add_pack(Pack.from_json("pack1", {}, set()))
+
+
+# --------------------------------------------------------------
+# loading
+# --------------------------------------------------------------
+
+def test_pack_from_path_should_read_a_zip_without_extracting(tmp_path):
+
+    zip_path = tmp_path / "pack.zip"
+    with zipfile.ZipFile(zip_path, "w") as archive:
+        archive.writestr("pack.mcmeta", "{}")
+        archive.writestr(
+            "assets/minecraft/sounds.json",
+            '{"entity.cow.ambient": {"sounds": ["mob/cow/moo"]}}')
+        archive.writestr("assets/minecraft/sounds/mob/cow/moo.ogg", "")
+
+    pack = Pack.from_path(zip_path)
+
+    assert pack.name == "pack.zip"
+    assert list(pack.events) == ["minecraft:entity.cow.ambient"]
+    assert pack.files == {"minecraft/sounds/mob/cow/moo.ogg"}
+
+
+def test_pack_from_path_should_leave_out_ignored_files(tmp_path):
+
+    sounds = tmp_path / "assets/minecraft/sounds"
+    (sounds / "drafts").mkdir(parents=True)
+    (tmp_path / "assets/minecraft/sounds.json").write_text(
+        '{"entity.cow.ambient": {"sounds": ["moo", "drafts/moo"]}}')
+    (sounds / "moo.ogg").write_text("")
+    (sounds / "old.ogg").write_text("")
+    (sounds / "drafts/moo.ogg").write_text("")
+    (tmp_path / ".spcheckignore").write_text("assets/minecraft/sounds/drafts/\n")
+
+    pack = Pack.from_path(tmp_path, ignore_patterns=["old.ogg"])
+
+    assert pack.files == {"minecraft/sounds/moo.ogg"}
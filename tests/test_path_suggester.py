@@ -0,0 +1,43 @@
+from objects.custom_path import CPath
+from objects.path_suggester import TrigramIndex, suggest_files
+
+
+def paths(*names: str) -> list[CPath]:
+    return [CPath("assets", n) for n in names]
+
+
+def test_trigram_index_should_rank_paths_by_shared_trigrams():
+
+    index = TrigramIndex(["mob/cow/say1", "mob/pig/say1", "ambient/cave1"])
+
+    assert index.get_candidates("mob/cow/sya1", limit=2) == [0, 1]
+
+
+def test_suggest_files_should_find_typos_and_moved_files():
+
+    files = paths(
+        "minecraft/sounds/mob/cow/say1.ogg",
+        "minecraft/sounds/entity/pig/oink.ogg",
+        "minecraft/sounds/ambient/cave1.ogg")
+
+    broken = paths(
+        "minecraft/sounds/mob/cow/sya1.ogg",
+        "minecraft/sounds/mob/pig/oink.ogg",
+        "minecraft/sounds/music/game/calm1.ogg")
+
+    assert suggest_files(broken, files, [], CPath("assets")) == {
+        broken[0]: files[0],
+        broken[1]: files[1]}
+
+
+def test_suggest_files_should_prefer_orphans():
+
+    files = paths(
+        "minecraft/sounds/mob/cow/moo1.ogg",
+        "minecraft/sounds/mob/cow/moo3.ogg")
+    broken = paths("minecraft/sounds/mob/cow/moo2.ogg")
+
+    assert suggest_files(broken, files, [], CPath("assets")) == {
+        broken[0]: files[0]}
+    assert suggest_files(broken, files, files[1:], CPath("assets")) == {
+        broken[0]: files[1]}
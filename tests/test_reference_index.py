@@ -0,0 +1,111 @@
+import json
+import os
+
+from objects.custom_path import CPath
+from objects.pack_checker import PackChecker, VanillaIndex
+from objects.reference_index import ReferenceIndex, get_event_key
+
+
+VANILLA = {"ambient.cave": {"sounds": ["ambient/cave/cave1"]}}
+
+SOUNDS = {
+    "cow": {"sounds": ["mob/cow/say1", "ambient/cave/cave1", "mob/cow/gone"]},
+    "pig": {"sounds": ["mob/pig/link"]},
+    "farm": {"sounds": [{"name": "cow", "type": "event"}]}}
+
+
+def make_pack(root) -> CPath:
+    sounds = root / "assets/minecraft/sounds"
+    (sounds / "mob/cow").mkdir(parents=True)
+    (sounds / "mob/pig").mkdir()
+    (root / "assets/minecraft/sounds.json").write_text(json.dumps(SOUNDS))
+    (sounds / "mob/cow/say1.ogg").write_text("")
+
+    # mob/pig/link.ogg -> mob/pig/hop.ogg -> mob/cow/say1.ogg
+    os.symlink("../cow/say1.ogg", sounds / "mob/pig/hop.ogg")
+    os.symlink("hop.ogg", sounds / "mob/pig/link.ogg")
+
+    return CPath(root / "assets/minecraft")
+
+
+def index_pack(tmp_path) -> tuple[ReferenceIndex, PackChecker, CPath]:
+    path = make_pack(tmp_path)
+    checker = PackChecker(VanillaIndex(VANILLA))
+    index = ReferenceIndex(str(tmp_path / "cache/references.sqlite"))
+    index.update(checker.check_path(path), checker.vanilla)
+    return index, checker, path
+
+
+def test_reference_index_should_find_the_events_playing_a_file(tmp_path):
+
+    index, _, path = index_pack(tmp_path)
+    pack, assets_folder = index.find_pack(path / "sounds/mob/cow/say1.ogg")
+
+    assert assets_folder == str(tmp_path / "assets")
+    assert index.get_events_playing(pack, "minecraft/sounds/mob/cow/say1.ogg") == [
+        ("cow", None),
+        ("farm", "cow"),
+        ("pig", "minecraft/sounds/mob/pig/link.ogg")]
+    assert index.get_events_playing(pack, "minecraft/sounds/x.ogg") == []
+
+
+def test_reference_index_should_find_the_files_an_event_plays(tmp_path):
+
+    index, _, path = index_pack(tmp_path)
+    pack, _ = index.find_pack(path / "sounds.json")
+
+    assert index.get_files_played(pack, "farm") == [
+        ("minecraft/sounds/ambient/cave/cave1.ogg", "vanilla"),
+        ("minecraft/sounds/mob/cow/gone.ogg", "missing"),
+        ("minecraft/sounds/mob/cow/say1.ogg", "pack")]
+    assert index.get_files_played(pack, "pig") == [
+        ("minecraft/sounds/mob/pig/link.ogg",
+         "symlink -> minecraft/sounds/mob/cow/say1.ogg")]
+
+
+def test_reference_index_should_only_rewrite_changed_events(tmp_path):
+
+    index, checker, path = index_pack(tmp_path)
+
+    update = index.update(checker.check_path(path), checker.vanilla)
+    assert update["events_updated"] == 0
+    assert not update["vanilla_updated"]
+
+    sounds = dict(SOUNDS, pig={"sounds": ["mob/cow/say1"]})
+    (path / "sounds.json").write_text(json.dumps(sounds))
+    os.utime(path / "sounds.json", ns=(1, 1))
+
+    update = index.update(checker.check_path(path), checker.vanilla)
+    pack, _ = index.find_pack(path / "sounds.json")
+
+    assert update["events_updated"] == 1
+    assert index.get_files_played(pack, "pig") == [
+        ("minecraft/sounds/mob/cow/say1.ogg", "pack")]
+
+
+def test_reference_index_should_follow_event_references_into_a_lone_namespace(tmp_path):
+
+    sounds = tmp_path / "assets/mymod/sounds"
+    sounds.mkdir(parents=True)
+    (tmp_path / "assets/mymod/sounds.json").write_text(json.dumps({
+        "moo": {"sounds": ["mymod:moo"]},
+        "farm": {"sounds": [{"name": "mymod:moo", "type": "event"}]}}))
+    (sounds / "moo.ogg").write_text("")
+
+    checker = PackChecker(VanillaIndex(VANILLA))
+    index = ReferenceIndex(str(tmp_path / "cache/references.sqlite"))
+    index.update(checker.check_path(CPath(tmp_path / "assets/mymod")),
+                 checker.vanilla)
+    pack, _ = index.find_pack(tmp_path / "assets/mymod/sounds.json")
+
+    assert index.get_files_played(pack, "farm") == [
+        ("mymod/sounds/moo.ogg", "pack")]
+
+
+def test_get_event_key_should_name_events_the_way_combine_does():
+
+    assert get_event_key("minecraft:cow") == "cow"
+    assert get_event_key("cow", ["mymod"]) == "cow"
+    assert get_event_key("mymod:moo", ["mymod"]) == "moo"
+    assert get_event_key("mymod:moo", ["minecraft", "mymod"]) == "mymod:moo"
+    assert get_event_key("other:moo", ["mymod"]) == "other:moo"
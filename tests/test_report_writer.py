@@ -0,0 +1,84 @@
+import io
+
+from objects.custom_path import CPath
+from objects.report_writer import ReportWriter
+
+
+def make_files(count: int, folder: str) -> list[CPath]:
+    return [CPath(f"assets/{folder}/file{i:02}.ogg") for i in range(count)]
+
+
+def test_report_writer_should_not_write_before_flush():
+
+    stream = io.StringIO()
+    writer = ReportWriter(stream)
+    writer.warnings("Test message", make_files(2, "a"), CPath("assets"))
+
+    assert stream.getvalue() == ""
+
+    writer.flush()
+
+    assert stream.getvalue() == ("\033[31m\nTest message\033[0m\n"
+                                 " .../a/file00.ogg\n"
+                                 " .../a/file01.ogg\n")
+
+
+def test_report_writer_should_collapse_long_lists_by_directory():
+
+    stream = io.StringIO()
+    writer = ReportWriter(stream, examples=2, collapse_above=5)
+
+    files = (make_files(4, "minecraft/sounds/mob/cow") +
+             make_files(3, "minecraft/sounds/mob/pig") +
+             [CPath("assets/minecraft/sounds/mob/loose.ogg")])
+
+    writer.warnings("Test message", files, CPath("assets"))
+    writer.flush()
+
+    assert stream.getvalue() == ("\033[31m\nTest message (8)\033[0m\n"
+                                 " .../minecraft/sounds/mob/ (8)\n"
+                                 "     loose.ogg\n"
+                                 "     .../cow/ (4)\n"
+                                 "         file00.ogg\n"
+                                 "         file01.ogg\n"
+                                 "         ... and 2 more\n"
+                                 "     .../pig/ (3)\n"
+                                 "         file00.ogg\n"
+                                 "         file01.ogg\n"
+                                 "         ... and 1 more\n")
+
+
+def test_report_writer_should_list_everything_when_full():
+
+    stream = io.StringIO()
+    writer = ReportWriter(stream, full=True, collapse_above=5)
+    writer.warnings("Test message", make_files(8, "a"), CPath("assets"))
+    writer.flush()
+
+    assert stream.getvalue().count(" .../a/file") == 8
+
+
+def test_report_writer_should_list_missing_keys_by_locale():
+
+    stream = io.StringIO()
+    writer = ReportWriter(stream, examples=1, collapse_above=2)
+    writer.missing_keys("Missing", {"de_de": ["a", "b"], "en_us": ["a"]})
+    writer.flush()
+
+    assert stream.getvalue() == ("\033[31m\nMissing\033[0m\n"
+                                 " de_de (2)\n"
+                                 "     a\n"
+                                 "     ... and 1 more\n"
+                                 " en_us (1)\n"
+                                 "     a\n")
+
+
+def test_report_writer_should_write_findings_out_at_once():
+
+    stream = io.StringIO()
+    writer = ReportWriter(stream)
+    writer.finding("Missing", "assets/minecraft/sounds/a.ogg",
+                   CPath("assets"))
+
+    assert stream.getvalue() == (
+        "\033[31mMissing:\033[0m .../minecraft/sounds/a.ogg\n")
@@ -0,0 +1,161 @@
+import json
+import os
+import zipfile
+
+from objects.check_cache import CheckCache
+from objects.custom_path import CPath
+from objects.pack_checker import PackChecker, VanillaIndex
+from objects.result_cache import ResultCache
+
+
+def make_pack(root) -> CPath:
+    (root / "minecraft/sounds/cow").mkdir(parents=True)
+    (root / "minecraft/sounds/cow/moo.ogg").write_text("")
+    (root / "minecraft/sounds/cow/stray.ogg").write_text("")
+    (root / "minecraft/sounds.json").write_text(
+        json.dumps({"entity.cow.ambient": {"sounds": ["cow/moo"]}}))
+    return CPath(root / "minecraft")
+
+
+def make_cache(tmp_path, vanilla: dict = None) -> ResultCache:
+    checker = PackChecker(VanillaIndex(vanilla or {}))
+    return ResultCache(checker, CheckCache(CPath(tmp_path / "cache")))
+
+
+def test_result_cache_should_replay_when_nothing_changed(tmp_path):
+
+    path = make_pack(tmp_path / "pack")
+    first = make_cache(tmp_path).check_path(path)
+
+    cache = make_cache(tmp_path)
+    second = cache.check_path(path)
+
+    assert cache.last_hit is True
+    assert second.findings == first.findings
+    assert second.sound_counts == first.sound_counts
+    assert second.sound_files == first.sound_files
+    assert second.file_sizes == first.file_sizes != {}
+    assert second.events is None
+
+
+def test_result_cache_should_fingerprint_a_jar_as_a_file(tmp_path):
+
+    path = tmp_path / "mod.jar"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("assets/minecraft/sounds.json",
+                         json.dumps({"cow": {"sounds": ["moo"]}}))
+        archive.writestr("assets/minecraft/sounds/moo.ogg", "")
+
+    first = make_cache(tmp_path).check_path(CPath(path))
+
+    cache = make_cache(tmp_path)
+    second = cache.check_path(CPath(path))
+
+    assert cache.last_hit is True
+    assert second.sound_counts == first.sound_counts == {"cow": 1}
+
+
+def test_result_cache_should_miss_when_the_tree_changes(tmp_path):
+
+    path = make_pack(tmp_path / "pack")
+    make_cache(tmp_path).check_path(path)
+
+    os.unlink(tmp_path / "pack/minecraft/sounds/cow/stray.ogg")
+
+    cache = make_cache(tmp_path)
+    result = cache.check_path(path)
+
+    assert cache.last_hit is False
+    assert result.findings["orphaned_files"] == []
+
+
+def test_result_cache_should_miss_when_sounds_json_changes(tmp_path):
+
+    path = make_pack(tmp_path / "pack")
+    make_cache(tmp_path).check_path(path)
+
+    (path / "sounds.json").write_text(json.dumps(
+        {"entity.cow.ambient": {"sounds": ["cow/moo", "cow/stray"]}}))
+
+    cache = make_cache(tmp_path)
+    cache.check_path(path)
+
+    assert cache.last_hit is False
+
+
+def test_result_cache_should_miss_when_vanilla_changes(tmp_path):
+
+    path = make_pack(tmp_path / "pack")
+    make_cache(tmp_path).check_path(path)
+
+    cache = make_cache(tmp_path, {"other.event": {"sounds": ["x"]}})
+    cache.check_path(path)
+
+    assert cache.last_hit is False
+
+
+def test_check_cache_should_evict_least_recently_used_entries(tmp_path):
+
+    cache = CheckCache(CPath(tmp_path), max_bytes=2500)
+
+    cache.store("kind", "a", b"x" * 1000)
+    cache.store("kind", "b", b"x" * 1000)
+    os.utime(cache._path("kind", "a"), ns=(1, 1))
+    os.utime(cache._path("kind", "b"), ns=(2, 2))
+
+    # Reading "a" makes it the most recently used
+    assert cache.load("kind", "a") is not None
+
+    cache.store("kind", "c", b"x" * 1000)
+
+    assert cache.load("kind", "b") is None
+    assert cache.load("kind", "a") is not None
+    assert cache.load("kind", "c") is not None
+
+
+def test_result_cache_should_miss_when_a_lang_file_is_edited(tmp_path):
+
+    path = make_pack(tmp_path)
+    (tmp_path / "minecraft/sounds.json").write_text(json.dumps(
+        {"entity.cow.ambient": {
+            "sounds": ["cow/moo"], "subtitle": "subtitles.cow"}}))
+    (tmp_path / "minecraft/lang").mkdir()
+    lang = tmp_path / "minecraft/lang/en_us.json"
+    lang.write_text("{}")
+
+    cache = make_cache(tmp_path)
+    assert cache.check_path(path).missing_subtitles == {
+        "en_us": ["subtitles.cow"]}
+
+    lang.write_text('{"subtitles.cow": "Moo"}')
+    os.utime(lang, ns=(1, 1))
+
+    result = cache.check_path(path)
+    assert cache.last_hit is False
+    assert result.missing_subtitles == {}
+
+
+def test_check_cache_should_carry_on_when_it_cannot_write(
+        tmp_path, monkeypatch):
+
+    (tmp_path / "file").write_text("")
+    path = make_pack(tmp_path / "pack")
+    checker = PackChecker(VanillaIndex({}))
+
+    # A cache directory inside a file can't even be created
+    cache = ResultCache(checker, CheckCache(CPath(tmp_path / "file/sub")))
+    assert cache.check_path(path).get_relative("orphaned_files") == [
+        "minecraft/sounds/cow/stray.ogg"]
+
+    # A failed write leaves no temporary file behind
+    store = CheckCache(CPath(tmp_path / "cache"))
+
+    def failing_replace(source, destination):
+        raise OSError(28, "No space left on device")
+
+    with monkeypatch.context() as m:
+        m.setattr(os, "replace", failing_replace)
+        store.store("kind", "a", b"x")
+
+    assert store.load("kind", "a") is None
+    assert not any(p.is_file() for p in (tmp_path / "cache").rglob("*"))
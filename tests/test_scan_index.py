@@ -0,0 +1,58 @@
+import os
+
+from objects.custom_path import CPath
+from objects.scan_index import ScanIndex
+
+
+def make_tree(root) -> CPath:
+    (root / "minecraft/sounds/mob").mkdir(parents=True)
+    (root / "minecraft/sounds.json").write_text("{}")
+    (root / "minecraft/sounds/mob/a.ogg").write_text("")
+    (root / "minecraft/sounds/mob/b.ogg").write_text("")
+    return CPath(root)
+
+
+def test_scan_index_should_find_the_same_files_as_a_full_scan(tmp_path):
+
+    assets_folder = make_tree(tmp_path)
+    os.symlink("a.ogg", tmp_path / "minecraft/sounds/mob/link.ogg")
+    os.symlink("missing.ogg", tmp_path / "minecraft/sounds/mob/broken.ogg")
+
+    index = ScanIndex(assets_folder)
+    index.refresh()
+
+    expected = [CPath(f) for f in assets_folder.rglob("*") if f.is_file()]
+
+    assert sorted(index.get_all_files()) == sorted(expected)
+
+
+def test_scan_index_should_only_relist_directories_that_changed(tmp_path):
+
+    assets_folder = make_tree(tmp_path)
+
+    index = ScanIndex(assets_folder)
+    assert index.refresh() == 4
+    assert index.refresh() == 0
+
+    (tmp_path / "minecraft/sounds/mob/c.ogg").write_text("")
+
+    assert index.refresh() == 1
+    assert CPath(tmp_path / "minecraft/sounds/mob/c.ogg") in (
+        index.get_all_files())
+
+
+def test_scan_index_should_forget_removed_directories(tmp_path):
+
+    assets_folder = make_tree(tmp_path)
+
+    index = ScanIndex(assets_folder)
+    index.refresh()
+
+    for f in (tmp_path / "minecraft/sounds/mob").iterdir():
+        f.unlink()
+    (tmp_path / "minecraft/sounds/mob").rmdir()
+
+    index.refresh()
+
+    assert index.get_all_files() == [
+        CPath(tmp_path / "minecraft/sounds.json")]
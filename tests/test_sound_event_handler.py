@@ -81,6 +81,46 @@ def test_get_event_dictionary_should_raise_value_error_when_sound_is_wrong_data_
     assert str(result.value) == "Expected dict | str got <class 'int'>: value 420"
 
 
+def test_get_event_dictionary_should_report_invalid_sound_attributes():
+
+    event1: str = "entity.villager.ambient"
+
+    events = SoundEventHandler(
+        root_folder=CPath("assets/"),
+        json_events={event1: {"sounds": [
+            {"name": "path/to/file01", "volume": 0.5, "pitch": 2,
+             "weight": 3, "stream": True, "attenuation_distance": 8,
+             "preload": False, "type": "file"},
+            "path/to/file02",
+            {"name": "path/to/file03", "volume": 1.5, "stream": 1},
+            {"name": "path/to/file04", "wieght": 2}]}})
+
+    assert events.invalid_sounds == [
+        {"event": event1, "index": 2, "problems": [
+            "'volume' must be a number from 0 to 1, got 1.5",
+            "'stream' must be true or false, got 1"]},
+        {"event": event1, "index": 3, "problems": [
+            "unknown attribute 'wieght'"]}]
+
+    # Invalid entries that still have a name are kept
+    assert len(events.get_sounds()) == 4
+
+
+def test_get_event_dictionary_should_leave_out_sounds_without_a_name():
+
+    event1: str = "entity.villager.ambient"
+
+    events = SoundEventHandler(
+        root_folder=CPath("assets/"),
+        json_events={event1: {"sounds": [
+            {"volume": 0.5}, {"name": 42}, "path/to/file01"]}})
+
+    assert [(i["index"], i["problems"]) for i in events.invalid_sounds] == [
+        (0, ["'name' is missing"]),
+        (1, ["'name' must be a non-empty string, got 42"])]
+    assert events.get_sounds() == ["path/to/file01"]
+
+
 # --------------------------------------------------------------
 # get_event_names
 # --------------------------------------------------------------
@@ -476,3 +516,30 @@ def test_get_sound_path_should_not_stomp_on_a_file_when_the_file_contains_a_dot(
     assert result == CPath(
         "storage/namespace/sounds/file/name.space.ogg")
 
+
+
+# --------------------------------------------------------------
+# combine
+# --------------------------------------------------------------
+
+def test_combine_should_prefix_events_outside_minecraft_namespace():
+
+    events = SoundEventHandler.combine(CPath("assets"), {
+        "minecraft": {"ambient": {"sounds": ["cow/moo"]}},
+        "farm": {"ambient": {"sounds": ["farm:pig/oink"]}}})
+
+    assert events.get_event_names() == ["ambient", "farm:ambient"]
+    assert events.get_namespace("farm:ambient") == "farm"
+    assert events.get_namespace("ambient") == "minecraft"
+    assert events.get_sound_files() == [
+        CPath("assets/farm/sounds/pig/oink.ogg"),
+        CPath("assets/minecraft/sounds/cow/moo.ogg")]
+
+
+def test_combine_should_keep_event_names_of_a_single_namespace():
+
+    events = SoundEventHandler.combine(CPath("assets"), {
+        "farm": {"ambient": {"sounds": ["farm:pig/oink"]}}})
+
+    assert events.get_event_names() == ["ambient"]
+    assert events.get_namespace("ambient") == "farm"
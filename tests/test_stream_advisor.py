@@ -0,0 +1,94 @@
+import json
+import struct
+
+from objects.custom_path import CPath
+from objects.pack_checker import PackChecker, VanillaIndex
+from objects.stream_advisor import PAGE_HEADER, advise_streaming, read_ogg_info
+
+
+def ogg_page(granule: int, payload: bytes, serial: int = 7) -> bytes:
+    return PAGE_HEADER.pack(b"OggS", 0, 0, granule, serial, 0, 0, 1) + (
+        bytes([len(payload)]) + payload)
+
+
+def write_vorbis(path, seconds: float, channels: int = 2,
+                 sample_rate: int = 44100, padding: int = 0):
+    """An Ogg Vorbis file with just the headers that give its length"""
+
+    identification: bytes = (
+        b"\x01vorbis" + struct.pack("<IBI", 0, channels, sample_rate)
+        + bytes(14))
+
+    path.write_bytes(
+        ogg_page(0, identification) + bytes(padding)
+        + ogg_page(int(seconds * sample_rate), b"audio")
+        # A page of another stream, which has to be skipped
+        + ogg_page(10 ** 9, b"other", serial=8))
+
+
+def test_read_ogg_info_should_read_the_length_from_page_headers(tmp_path):
+
+    path = tmp_path / "music.ogg"
+    write_vorbis(path, 90, channels=1, padding=100_000)
+
+    info = read_ogg_info(str(path), path.stat().st_size)
+
+    assert info == {"channels": 1, "sample_rate": 44100,
+                    "samples": 90 * 44100}
+
+
+def test_read_ogg_info_should_return_none_for_other_files(tmp_path):
+
+    path = tmp_path / "fake.ogg"
+    path.write_bytes(b"not an ogg file")
+
+    assert read_ogg_info(str(path), path.stat().st_size) is None
+
+
+def test_advise_streaming_should_flag_long_sounds_and_large_preloads(tmp_path):
+
+    sounds = tmp_path / "assets/minecraft/sounds"
+    sounds.mkdir(parents=True)
+    write_vorbis(sounds / "music.ogg", 120, padding=200_000)
+    write_vorbis(sounds / "streamed.ogg", 120, padding=200_000)
+    write_vorbis(sounds / "click.ogg", 0.5)
+    write_vorbis(sounds / "ambience.ogg", 8, padding=20_000)
+
+    (tmp_path / "assets/minecraft/sounds.json").write_text(json.dumps({
+        "music.game": {"sounds": [
+            "music",
+            {"name": "streamed", "stream": True}]},
+        "ui.click": {"sounds": [{"name": "click", "preload": True}]},
+        "ambient.cave": {"sounds": [
+            {"name": "ambience", "preload": True}]},
+        "ambient.cave.again": {"sounds": [
+            {"name": "ambience", "preload": True}]}}))
+
+    checker = PackChecker(VanillaIndex({}))
+    result = checker.check_path(CPath(tmp_path / "assets/minecraft"))
+    assert len(result.file_sizes) == 5
+
+    read: list[str] = []
+
+    def counting_read(path, size):
+        read.append(path)
+        return read_ogg_info(path, size)
+
+    report = advise_streaming(
+        result.events, result.file_sizes, read=counting_read)
+
+    assert [(a["event"], a["name"], a["seconds"])
+            for a in report["should_stream"]] == [
+        ("music.game", "music", 120.0)]
+
+    # 8 seconds of 44.1 kHz stereo is about 1.35 MiB decoded
+    assert [a["event"] for a in report["large_preloads"]] == [
+        "ambient.cave", "ambient.cave.again"]
+
+    # A file preloaded twice is loaded once
+    assert report["preload_memory"] == {
+        "minecraft": (8 * 44100 + 22050) * 2 * 2}
+
+    # The streamed file is never opened, the others once each
+    assert sorted(p.split("/")[-1] for p in read) == [
+        "ambience.ogg", "click.ogg", "music.ogg"]
@@ -0,0 +1,110 @@
+import json
+import os
+
+from objects.custom_path import CPath
+from objects.pack_checker import PackChecker, VanillaIndex
+from objects.streaming_checker import SortedSpool, StreamingChecker
+
+
+VANILLA = {"ambient.cave": {"sounds": ["ambient/cave/cave1"]}}
+
+
+def make_pack(root) -> CPath:
+    """A pack with a finding in every category, and a symlink chain"""
+
+    sounds = root / "minecraft/sounds"
+    (sounds / "mob/cow").mkdir(parents=True)
+    (sounds / "extra").mkdir()
+    (root / "minecraft/sounds.json").write_text(json.dumps({
+        "cow": {"sounds": ["mob/cow/say1", "mob/cow/Say2", "mob/cow/gone",
+                           "ambient/cave/cave1", "extra/link"]}}))
+
+    for name in ["mob/cow/say1.ogg", "mob/cow/Say2.ogg", "mob/cow/stray.ogg",
+                 "mob/cow/notes.txt", "extra/Target.ogg", "extra/Kept.ogg"]:
+        (sounds / name).write_text("")
+
+    # extra/link.ogg -> extra/hop.ogg -> extra/Target.ogg
+    os.symlink("Target.ogg", sounds / "extra/hop.ogg")
+    os.symlink("hop.ogg", sounds / "extra/link.ogg")
+
+    return CPath(root / "minecraft")
+
+
+def test_streaming_checker_should_find_what_check_path_finds(tmp_path):
+
+    path = make_pack(tmp_path)
+    checker = PackChecker(VanillaIndex(VANILLA))
+    expected = checker.check_path(path)
+
+    with StreamingChecker(checker).check_path(path) as result:
+        findings = {c: [CPath(p) for p in spool]
+                    for c, spool in result.findings.items()}
+
+        assert findings == expected.findings
+        assert result.sound_counts == expected.sound_counts
+        assert (result.get_found_categories()
+                == expected.get_found_categories())
+
+
+def test_streaming_checker_should_spill_to_stay_within_budget(tmp_path):
+
+    path = make_pack(tmp_path)
+    checker = PackChecker(VanillaIndex(VANILLA))
+    expected = checker.check_path(path)
+    confirmed: list[tuple[str, str]] = []
+
+    # A budget too small to hold a single path
+    with StreamingChecker(checker, memory_budget=1).check_path(
+            path, lambda c, p: confirmed.append((c, p))) as result:
+
+        assert all(len(s.buffer) == 0 for s in result.findings.values())
+        assert sorted(p for _, p in confirmed) == sorted(
+            str(p) for f in expected.findings.values() for p in f)
+        assert ([CPath(p) for p in result.findings["orphaned_files"]]
+                == expected.findings["orphaned_files"])
+
+        directory: str = result.directory
+
+    assert not os.path.exists(directory)
+
+
+def test_streaming_checker_should_report_a_broken_link_per_reference(tmp_path):
+
+    (tmp_path / "minecraft/sounds").mkdir(parents=True)
+    (tmp_path / "minecraft/sounds.json").write_text(json.dumps({
+        "cow": {"sounds": ["gone", "gone", "moo"]},
+        "pig": {"sounds": ["gone"]}}))
+    (tmp_path / "minecraft/sounds/moo.ogg").write_text("")
+
+    path = CPath(tmp_path / "minecraft")
+    checker = PackChecker(VanillaIndex(VANILLA))
+    expected = checker.check_path(path)
+
+    with StreamingChecker(checker).check_path(path) as result:
+        broken_links = [CPath(p) for p in result.findings["broken_links"]]
+
+    assert len(broken_links) == 3
+    assert broken_links == expected.findings["broken_links"]
+
+
+def test_sorted_spool_should_merge_its_runs(tmp_path):
+
+    spool = SortedSpool(200, str(tmp_path))
+    names: list[str] = [f"sound{n * 7919 % 500}.ogg" for n in range(500)]
+    for name in names:
+        spool.add(name)
+
+    assert len(spool.runs) > 1
+    assert len(spool) == 500
+    assert list(spool) == sorted(names)
+
+
+def test_streaming_checker_should_report_each_finding_as_it_goes(tmp_path):
+
+    path = make_pack(tmp_path)
+    reported: list[tuple[str, str]] = []
+
+    with StreamingChecker(PackChecker(VanillaIndex(VANILLA))).check_path(
+            path, on_finding=lambda c, p: reported.append((c, p))) as result:
+        assert sorted(reported) == sorted(
+            (c, p) for c, spool in result.findings.items() for p in spool)
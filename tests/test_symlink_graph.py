@@ -0,0 +1,80 @@
+import json
+import os
+
+from objects.check_cache import CheckCache
+from objects.custom_path import CPath
+from objects.incremental_checker import IncrementalChecker
+from objects.pack_checker import PackChecker, VanillaIndex
+from objects.symlink_graph import SymlinkGraph, list_symlinks
+
+
+def make_tree(root) -> CPath:
+    sounds = root / "assets/minecraft/sounds"
+    sounds.mkdir(parents=True)
+    (sounds / "real.ogg").write_text("")
+    (root / "outside.ogg").write_text("")
+
+    os.symlink("real.ogg", sounds / "one.ogg")
+    os.symlink("one.ogg", sounds / "two.ogg")
+    os.symlink("two.ogg", sounds / "three.ogg")
+    os.symlink("../../../outside.ogg", sounds / "escaping.ogg")
+    os.symlink("missing.ogg", sounds / "dangling.ogg")
+    os.symlink("loop_b.ogg", sounds / "loop_a.ogg")
+    os.symlink("loop_a.ogg", sounds / "loop_b.ogg")
+
+    return CPath(root / "assets")
+
+
+def test_symlink_graph_should_report_each_kind_of_problem(tmp_path):
+
+    assets_folder = make_tree(tmp_path)
+    graph = SymlinkGraph(assets_folder)
+
+    report = graph.analyze(list_symlinks(assets_folder), max_hops=2)
+    names = {k: [os.path.basename(p) for p in v] for k, v in report.items()}
+
+    assert names == {
+        "long_chains": ["three.ogg"],
+        "escaping": ["escaping.ogg"],
+        "cycles": ["loop_a.ogg", "loop_b.ogg"],
+        "dangling": ["dangling.ogg"]}
+
+
+def test_symlink_graph_should_read_each_link_once(tmp_path):
+
+    assets_folder = make_tree(tmp_path)
+    graph = SymlinkGraph(assets_folder)
+    sounds = str(assets_folder / "minecraft/sounds")
+
+    info = graph.resolve(os.path.join(sounds, "three.ogg"))
+    assert info == {"target": os.path.join(sounds, "real.ogg"), "hops": 3,
+                    "status": "ok", "escapes": False}
+
+    # Three links, plus the file the chain ends at
+    assert graph.readlinks == 4
+
+    # The rest of the chain is already known
+    assert graph.resolve(os.path.join(sounds, "two.ogg"))["hops"] == 2
+    graph.analyze(list_symlinks(assets_folder))
+
+    # The four other links, and the two files they end at
+    assert graph.readlinks == 4 + 4 + 2
+
+
+def test_orphans_should_not_include_links_in_the_middle_of_a_chain(tmp_path):
+
+    sounds = tmp_path / "assets/minecraft/sounds"
+    sounds.mkdir(parents=True)
+    (sounds / "real.ogg").write_text("")
+    os.symlink("real.ogg", sounds / "shared.ogg")
+    os.symlink("shared.ogg", sounds / "alias.ogg")
+    (tmp_path / "assets/minecraft/sounds.json").write_text(
+        json.dumps({"entity.cow.ambient": {"sounds": ["alias"]}}))
+
+    path = CPath(tmp_path / "assets/minecraft/sounds.json")
+    checker = PackChecker(VanillaIndex({}))
+    incremental = IncrementalChecker(
+        checker, CheckCache(CPath(tmp_path / "cache")))
+
+    for result in [checker.check_path(path), incremental.check_path(path)]:
+        assert result.findings["orphaned_files"] == []
@@ -0,0 +1,50 @@
+from objects.custom_path import CPath
+from objects.pack_checker import VanillaIndex
+from objects.sound_event_handler import SoundEventHandler
+from objects.vanilla_overrides import find_overrides
+
+
+VANILLA = VanillaIndex({
+    "entity.cow.ambient": {"sounds": ["mob/cow/say1", "mob/cow/say2"]},
+    "entity.pig.ambient": {"sounds": ["mob/pig/say1"]},
+    "music.game": {"sounds": [{"name": "music/calm1", "stream": True}]}})
+
+
+def test_find_overrides_should_compare_a_pack_with_vanilla():
+
+    events = SoundEventHandler.combine(CPath("assets"), {
+        "minecraft": {
+            "entity.cow.ambient": {"sounds": ["mob/cow/moo"]},
+            "entity.pig.ambient": {"replace": True, "sounds": ["mob/pig/say1"]},
+            "entity.custom": {"sounds": ["mob/cow/say2"]}},
+        "extra": {
+            "entity.cow.ambient": {"sounds": ["minecraft:music/calm1"]}}})
+
+    report = find_overrides(events, VANILLA.keys, [
+        "minecraft/sounds/mob/cow/moo.ogg",
+        "minecraft/sounds/mob/pig/say1.ogg"], "minecraft")
+
+    assert report == {
+        "overridden_files": ["minecraft/sounds/mob/pig/say1.ogg"],
+        "replaced_events": ["entity.pig.ambient"],
+        # extra's event of the same name is its own, not vanilla's
+        "extended_events": ["entity.cow.ambient"],
+        "vanilla_references": [
+            "minecraft/sounds/mob/cow/say2.ogg",
+            "minecraft/sounds/music/calm1.ogg"],
+        "totals": {
+            "extra": {"overridden_files": 0, "replaced_events": 0,
+                      "extended_events": 0, "vanilla_references": 1},
+            "minecraft": {"overridden_files": 1, "replaced_events": 1,
+                          "extended_events": 1, "vanilla_references": 1}}}
+
+
+def test_find_overrides_should_ignore_events_of_other_namespaces():
+
+    events = SoundEventHandler(CPath("assets"), {
+        "entity.cow.ambient": {"sounds": ["extra:mob/cow/say1"]}})
+
+    report = find_overrides(events, VANILLA.keys, [], "extra")
+
+    assert report["extended_events"] == []
+    assert report["vanilla_references"] == []
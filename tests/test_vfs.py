@@ -0,0 +1,124 @@
+import json
+import os
+import stat
+import zipfile
+
+from objects.custom_path import CPath
+from objects.pack_checker import PackChecker, VanillaIndex
+from objects.vfs import MemoryFS, RealFS, ZipFS
+
+
+EVENTS = {
+    "entity.cow.ambient": {"sounds": ["mob/cow/say1", "mob/cow/link"]},
+    "entity.cow.hurt": {"sounds": ["mob/cow/missing"]}}
+
+
+def make_checker() -> PackChecker:
+    return PackChecker(VanillaIndex({}))
+
+
+def findings(result) -> dict:
+    return {c: result.get_relative(c) for c in result.findings}
+
+
+def test_check_vfs_should_match_check_path_on_the_real_file_system(tmp_path):
+
+    sounds = tmp_path / "minecraft/sounds/mob/cow"
+    sounds.mkdir(parents=True)
+    (tmp_path / "minecraft/sounds.json").write_text(json.dumps(EVENTS))
+    (sounds / "say1.ogg").write_text("")
+    (sounds / "orphan.ogg").write_text("")
+    (sounds / "notes.txt").write_text("")
+    os.symlink("say1.ogg", sounds / "link.ogg")
+    os.symlink("gone.ogg", sounds / "dangling.ogg")
+
+    checker = make_checker()
+    expected = checker.check_path(CPath(tmp_path / "minecraft"))
+
+    fs = RealFS(tmp_path)
+    result = checker.check_vfs(fs, assets_folder=CPath(tmp_path))
+
+    assert findings(result) == findings(expected)
+    assert result.sound_counts == expected.sound_counts
+
+    # Every directory listed once, each link read once
+    assert fs.operations["list"] == 5
+    assert fs.operations["readlink"] == 2
+    assert fs.operations["open"] == 1
+
+
+def test_check_vfs_should_check_a_pack_held_in_memory():
+
+    fs = MemoryFS({
+        "assets/minecraft/sounds.json": json.dumps(EVENTS).encode(),
+        "assets/minecraft/sounds/mob/cow/say1.ogg": b"",
+        "assets/minecraft/sounds/shared/moo.ogg": b""},
+        symlinks={"assets/minecraft/sounds/mob/cow/link.ogg":
+                  "../../shared/moo.ogg"})
+
+    result = make_checker().check_vfs(fs, "assets")
+
+    assert result.get_relative("broken_links") == [
+        "minecraft/sounds/mob/cow/missing.ogg"]
+    assert result.get_relative("orphaned_files") == []
+    assert result.sound_counts == {"entity.cow.ambient": 2}
+    assert fs.operations["bytes"] == len(json.dumps(EVENTS))
+
+
+def test_check_vfs_should_leave_the_real_file_system_alone(monkeypatch):
+
+    fs = MemoryFS({
+        "assets/minecraft/sounds.json": json.dumps(EVENTS).encode(),
+        "assets/minecraft/sounds/mob/cow/say1.ogg": b"",
+        "assets/minecraft/sounds/shared/moo.ogg": b""},
+        symlinks={"assets/minecraft/sounds/mob/cow/link.ogg":
+                  "../../shared/moo.ogg"})
+
+    def refuse(*args, **kwargs):
+        raise AssertionError(f"the file system was asked about {args[0]}")
+
+    with monkeypatch.context() as m:
+        m.setattr(os, "stat", refuse)
+        m.setattr(os, "lstat", refuse)
+        result = make_checker().check_vfs(fs, "assets")
+
+    assert result.get_relative("orphaned_files") == []
+
+
+def test_check_vfs_should_keep_files_reached_through_a_symlink_chain():
+
+    fs = MemoryFS({
+        "assets/minecraft/sounds.json": json.dumps(EVENTS).encode(),
+        "assets/minecraft/sounds/mob/cow/say1.ogg": b"",
+        "assets/minecraft/sounds/shared/moo.ogg": b""},
+        symlinks={"assets/minecraft/sounds/mob/cow/link.ogg": "hop.ogg",
+                  "assets/minecraft/sounds/mob/cow/hop.ogg":
+                  "../../shared/moo.ogg"})
+
+    result = make_checker().check_vfs(fs, "assets")
+
+    assert result.get_relative("orphaned_files") == []
+    assert result.sound_counts == {"entity.cow.ambient": 2}
+
+
+def test_zip_fs_should_follow_links_stored_in_the_archive(tmp_path):
+
+    path = tmp_path / "pack.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("minecraft/sounds.json", json.dumps(EVENTS))
+        archive.writestr("minecraft/sounds/mob/cow/say1.ogg", "")
+
+        link = zipfile.ZipInfo("minecraft/sounds/mob/cow/link.ogg")
+        link.external_attr = (stat.S_IFLNK | 0o777) << 16
+        archive.writestr(link, "say1.ogg")
+
+    with zipfile.ZipFile(path) as archive:
+        fs = ZipFS(archive)
+        assert fs.resolve("minecraft/sounds/mob/cow/link.ogg") == (
+            "minecraft/sounds/mob/cow/say1.ogg")
+
+        result = make_checker().check_vfs(fs, assets_folder=CPath(path))
+
+    assert result.get_relative("broken_links") == [
+        "minecraft/sounds/mob/cow/missing.ogg"]
+    assert result.sound_counts == {"entity.cow.ambient": 2}